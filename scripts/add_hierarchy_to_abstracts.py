@@ -21,18 +21,18 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from pipeline_io import load_data, save_data
+
 
 def load_json_file(file_path: Path) -> Dict[str, Any]:
     """Charge un fichier JSON."""
     if not file_path.exists():
         raise FileNotFoundError(f"Fichier non trouvé : {file_path}")
     
-    with file_path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return load_data(file_path)
 
 
 def extract_sessions_from_pass2(pass2_path: Path) -> Dict[str, Dict[str, Any]]:
@@ -49,8 +49,7 @@ def extract_sessions_from_pass2(pass2_path: Path) -> Dict[str, Dict[str, Any]]:
         return {}
     
     print(f"  Lecture de {pass2_path} pour extraire les sessions...")
-    with pass2_path.open("r", encoding="utf-8") as f:
-        pass2_data = json.load(f)
+    pass2_data = load_data(pass2_path)
     
     elements = pass2_data.get("elements", [])
     
@@ -458,7 +457,8 @@ def add_hierarchy_to_abstract(
 def process_file(
     input_path: Path,
     output_path: Path,
-    pass2_path: Optional[Path] = None
+    pass2_path: Optional[Path] = None,
+    compact: bool = False
 ) -> None:
     """
     Traite le fichier et ajoute la hiérarchie aux abstracts.
@@ -466,6 +466,8 @@ def process_file(
     Args:
         input_path: Fichier enrichi d'entrée
         output_path: Fichier de sortie avec hiérarchie
+        pass2_path: Fichier pass2 pour le mapping précis des sessions (optionnel)
+        compact: JSON de sortie sans indentation
     """
     print(f"Chargement de {input_path}...")
     data = load_json_file(input_path)
@@ -591,9 +593,7 @@ def process_file(
     
     # Sauvegarder
     print(f"Sauvegarde dans {output_path}...")
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    save_data(output_path, output_data, compact=compact)
     
     print(f"\n[OK] Fichier avec hiérarchie genere : {output_path}")
     print(f"  Abstracts avec session : {matched_count}")
@@ -626,13 +626,18 @@ def main() -> None:
         "--pass2",
         help="Fichier pass2 (neutral_typed_pass2.json) pour mapping precis des sessions.",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="JSON de sortie sans indentation (plus petit, plus rapide).",
+    )
     
     args = parser.parse_args()
     input_path = Path(args.input)
     output_path = Path(args.output)
     pass2_path = Path(args.pass2) if args.pass2 else None
     
-    process_file(input_path, output_path, pass2_path)
+    process_file(input_path, output_path, pass2_path, compact=args.compact)
 
 
 if __name__ == "__main__":
@@ -5,23 +5,26 @@ Produit deux vues : par fréquence et par taille
 Export terminal + CSV
 """
 
-import json
 import csv
 from pathlib import Path
-from collections import defaultdict
 import argparse
 
+from pipeline_io import load_data
+from signature_catalog import SignatureAccumulator
+
 
 def load_neutral_json(json_path: str) -> dict:
     """Charge le fichier neutral.json"""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_data(json_path)
 
 
 def analyze_signatures(data: dict) -> dict:
     """
     Analyse les signatures du catalog
     
+    Un seul passage sur les éléments (SignatureAccumulator) collecte
+    pages, colonnes et hauteurs pour toutes les signatures.
+    
     Returns:
         dict avec signatures enrichies (+ stats position, colonnes...)
     """
@@ -29,17 +32,14 @@ def analyze_signatures(data: dict) -> dict:
     elements = data.get('elements', [])
     total_texts = data['metadata'].get('total_texts', len(elements))
     
+    # Stats de position de toutes les signatures en une passe
+    accumulator = SignatureAccumulator().add_all(elements)
+    
     # Enrichir avec stats de position
     enriched = {}
     
     for sig, details in catalog.items():
-        # Trouver tous les éléments avec cette signature
-        sig_elements = [e for e in elements if e.get('signature') == sig]
-        
-        # Stats position
-        pages = set(e['page'] for e in sig_elements)
-        left_count = sum(1 for e in sig_elements if e.get('line_position') == 'left')
-        right_count = sum(1 for e in sig_elements if e.get('line_position') == 'right')
+        position = accumulator.position_stats(sig)
         
         enriched[sig] = {
             'font': details['font'],
@@ -48,9 +48,10 @@ def analyze_signatures(data: dict) -> dict:
             'count': details['count'],
             'percentage': (details['count'] / total_texts * 100) if total_texts > 0 else 0,
             'examples': details['examples'],
-            'pages': sorted(pages),
-            'left_count': left_count,
-            'right_count': right_count
+            'pages': position['pages'],
+            'left_count': position['left_count'],
+            'right_count': position['right_count'],
+            'h_mean': position['h_mean']
         }
     
     return enriched
@@ -112,7 +113,8 @@ def print_size_view(signatures: dict):
         
         for sig, details in sorted_group:
             example = details['examples'][0][:40] if details['examples'] else ""
-            print(f"  {sig:<40} Size: {details['size']:>5.1f}pt  Count: {details['count']:>4} ({details['percentage']:>5.1f}%)")
+            h_mean = f"{details['h_mean']:.1f}px" if details.get('h_mean') is not None else "n/a"
+            print(f"  {sig:<40} Size: {details['size']:>5.1f}pt  Count: {details['count']:>4} ({details['percentage']:>5.1f}%)  Hauteur moy.: {h_mean}")
             print(f"    Exemple: {example}...")
             print()
 
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark : TextPage partagée vs requêtes texte indépendantes, page par page
+
+Reproduit le travail texte de neutral_extractor.py sur chaque page :
+    séparé   page.get_text("dict") puis page.get_text("text", clip=cellule) par
+             cellule de table (chaque appel réinterprète le contenu de la page)
+    partagé  une TextPage par page : get_text("dict", textpage=...), texte des
+             cellules lu dans les blocs déjà extraits (comme l'extracteur)
+
+La détection des tables (find_tables, qui construit sa propre liste de
+caractères) est faite une fois par page hors chronométrage : les deux
+variantes lisent les mêmes cellules. Sa durée est indiquée à part.
+
+Usage :
+    python benchmark_textpage.py -i document.pdf
+    python benchmark_textpage.py -i document.pdf -s 10 -e 60 --repeat 5 -o bench.json
+"""
+
+import json
+import logging
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+import fitz
+
+from neutral_extractor import NeutralExtractor
+
+logger = logging.getLogger(__name__)
+
+
+def _table_cells(page: fitz.Page) -> List[fitz.Rect]:
+    """Rectangles des cellules de toutes les tables de la page"""
+    cells = []
+    for table in page.find_tables(paths=page.get_drawings()):
+        for row in table.rows:
+            cells.extend(fitz.Rect(bbox) for bbox in row.cells if bbox is not None)
+    return cells
+
+
+def _run_separate(page: fitz.Page, cells: List[fitz.Rect]) -> int:
+    blocks = page.get_text("dict")["blocks"]
+    texts = [page.get_text("text", clip=rect) for rect in cells]
+    return len(blocks) + len(texts)
+
+
+def _run_shared(page: fitz.Page, cells: List[fitz.Rect]) -> int:
+    textpage = page.get_textpage(flags=fitz.TEXTFLAGS_DICT)
+    blocks = page.get_text("dict", textpage=textpage)["blocks"]
+    texts = [NeutralExtractor._text_in_rect(blocks, rect) for rect in cells]
+    return len(blocks) + len(texts)
+
+
+def _best_time(func, page: fitz.Page, cells: List[fitz.Rect], repeat: int) -> float:
+    """Meilleure durée sur `repeat` exécutions (secondes)"""
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        func(page, cells)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmark(pdf_path: str, start_page: int = 1, end_page: Optional[int] = None,
+                  repeat: int = 3) -> Dict[str, Any]:
+    """
+    Chronomètre les deux variantes sur chaque page
+
+    Args:
+        pdf_path: Chemin du PDF
+        start_page: Page de début (1-indexed)
+        end_page: Page de fin (1-indexed, None = jusqu'à la fin)
+        repeat: Nombre d'exécutions par page et variante (meilleure retenue)
+
+    Returns:
+        {"source", "pages", "repeat", "totals", "per_page": [...]}
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        start_idx = max(0, start_page - 1)
+        end_idx = min(end_page, len(doc)) if end_page else len(doc)
+
+        per_page = []
+        for page_index in range(start_idx, end_idx):
+            page = doc.load_page(page_index)
+
+            start = perf_counter()
+            cells = _table_cells(page)
+            tables_seconds = perf_counter() - start
+
+            separate = _best_time(_run_separate, page, cells, repeat)
+            shared = _best_time(_run_shared, page, cells, repeat)
+            per_page.append({
+                "page": page_index + 1,
+                "cells": len(cells),
+                "separate_ms": round(separate * 1000, 3),
+                "shared_ms": round(shared * 1000, 3),
+                "saved_ms": round((separate - shared) * 1000, 3),
+                "find_tables_ms": round(tables_seconds * 1000, 3)
+            })
+    finally:
+        doc.close()
+
+    totals = {
+        key: round(sum(p[key] for p in per_page), 3)
+        for key in ("separate_ms", "shared_ms", "saved_ms", "find_tables_ms")
+    }
+    totals["cells"] = sum(p["cells"] for p in per_page)
+
+    return {
+        "source": pdf_path,
+        "pages": f"{start_idx + 1}-{end_idx}",
+        "repeat": repeat,
+        "totals": totals,
+        "per_page": per_page
+    }
+
+
+def print_report(bench: Dict[str, Any], top: int = 10):
+    """Affiche le résumé et les pages où le partage fait gagner le plus"""
+    per_page = bench["per_page"]
+    totals = bench["totals"]
+    count = max(1, len(per_page))
+
+    print("\n" + "=" * 80)
+    print("⏱️  BENCHMARK TEXTPAGE PARTAGÉE")
+    print("=" * 80)
+    print(f"\n📄 Source : {bench['source']} (pages {bench['pages']}, meilleure de {bench['repeat']})")
+    print(f"   Cellules de tables : {totals['cells']}")
+
+    print(f"\n📊 Par page (moyenne) :")
+    print(f"   Séparé   : {totals['separate_ms'] / count:8.2f} ms")
+    print(f"   Partagé  : {totals['shared_ms'] / count:8.2f} ms")
+    saving = totals['saved_ms'] / totals['separate_ms'] * 100 if totals['separate_ms'] else 0.0
+    print(f"   Gain     : {totals['saved_ms'] / count:8.2f} ms ({saving:.1f}%)")
+    print(f"   find_tables (commun, non partageable) : {totals['find_tables_ms'] / count:.2f} ms")
+
+    ranked = sorted(per_page, key=lambda p: p["saved_ms"], reverse=True)[:top]
+    if ranked:
+        print(f"\n🏆 Pages au plus fort gain :")
+        print(f"   {'Page':>5} {'Cellules':>9} {'Séparé':>10} {'Partagé':>10} {'Gain':>10}")
+        for p in ranked:
+            print(f"   {p['page']:>5} {p['cells']:>9} {p['separate_ms']:>8.2f}ms "
+                  f"{p['shared_ms']:>8.2f}ms {p['saved_ms']:>8.2f}ms")
+    print("=" * 80 + "\n")
+
+
+def main():
+    """Point d'entrée CLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark de la TextPage partagée par page")
+    parser.add_argument('-i', '--input', required=True, help='Fichier PDF d\'entrée')
+    parser.add_argument('-o', '--output', help='Export JSON des mesures (optionnel)')
+    parser.add_argument('-s', '--start-page', type=int, default=1, help='Page de début (défaut: 1)')
+    parser.add_argument('-e', '--end-page', type=int, help='Page de fin (défaut: toutes)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Exécutions par page et variante, meilleure retenue (défaut: 3)')
+    parser.add_argument('--top', type=int, default=10, help='Pages affichées au classement (défaut: 10)')
+
+    args = parser.parse_args()
+
+    try:
+        bench = run_benchmark(args.input, args.start_page, args.end_page, max(1, args.repeat))
+    except Exception as e:
+        logger.error(f"Erreur : {e}")
+        return 1
+
+    print_report(bench, args.top)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(bench, f, ensure_ascii=False, indent=2)
+        print(f"✓ Mesures exportées : {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
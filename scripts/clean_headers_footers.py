@@ -13,24 +13,22 @@ Usage :
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
 from typing import Any, Dict, List
 
+from element_index import refresh_indexes
+from pipeline_io import load_data, save_data
+
 
 def load_json(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        raise FileNotFoundError(f"Fichier introuvable : {path}")
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_data(path)
     if not isinstance(data, dict):
         raise ValueError("Le JSON racine doit être un objet (dict).")
     return data
 
 
-def save_json(path: Path, data: Dict[str, Any]) -> None:
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def save_json(path: Path, data: Dict[str, Any], compact: bool = False) -> None:
+    save_data(path, data, compact=compact)
 
 
 def clean_elements(elements: List[Any]) -> List[Any]:
@@ -57,7 +55,7 @@ def clean_elements(elements: List[Any]) -> List[Any]:
     return cleaned
 
 
-def process_file(input_path: Path, output_path: Path) -> None:
+def process_file(input_path: Path, output_path: Path, compact: bool = False) -> None:
     data = load_json(input_path)
 
     elements = data.get("elements")
@@ -68,8 +66,10 @@ def process_file(input_path: Path, output_path: Path) -> None:
 
     cleaned_elements = clean_elements(elements)
     data["elements"] = cleaned_elements
+    # Éléments supprimés : offsets décalés
+    refresh_indexes(data)
 
-    save_json(output_path, data)
+    save_json(output_path, data, compact=compact)
     print(f"[clean_headers_footers] Fichier nettoyé écrit dans : {output_path}")
 
 
@@ -79,9 +79,10 @@ def main() -> None:
     )
     parser.add_argument("-i", "--input", required=True, help="Fichier JSON d'entrée (pass1).")
     parser.add_argument("-o", "--output", required=True, help="Fichier JSON de sortie (nettoyé).")
+    parser.add_argument("--compact", action="store_true", help="JSON de sortie sans indentation.")
     args = parser.parse_args()
 
-    process_file(Path(args.input), Path(args.output))
+    process_file(Path(args.input), Path(args.output), compact=args.compact)
 
 
 if __name__ == "__main__":
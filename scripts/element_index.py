@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Index d'offsets dans le tableau "elements" (neutral.json et sorties des passes)
+
+page_index : page → [début, fin) dans elements (les éléments d'une page
+sont consécutifs : ordre de l'extracteur, tri (page, ligne, x) de la passe 2)
+
+    "page_index": {"4": [120, 561], "5": [561, 1012]}
+
+code_abstract_index : un élément code_abstract par entrée, dans l'ordre
+des offsets (un abstract s'étend jusqu'au code suivant)
+
+    "code_abstract_index": [{"code": "1181", "offset": 532, "page": 12}]
+
+Écrits par neutral_extractor.py (page_index) et recalculés par chaque passe
+qui trie, filtre ou type les éléments (refresh_indexes). Les éléments de
+quelques pages se découpent par pages_slice au lieu de reparcourir le document.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class PageIndexBuilder:
+    """Construit page_index au fil des éléments (ordre final de l'extracteur)"""
+
+    def __init__(self):
+        self.index: Dict[str, List[int]] = {}
+        self._count = 0
+        self._page: Optional[int] = None
+        self.contiguous = True
+
+    def add(self, elem: Dict[str, Any]):
+        """Ajoute l'élément suivant (offset = nombre d'éléments déjà ajoutés)"""
+        page = elem.get("page")
+        if page != self._page:
+            key = str(page)
+            if key in self.index:
+                # Page revue après une autre : offsets inutilisables
+                self.contiguous = False
+            self.index[key] = [self._count, self._count]
+            self._page = page
+        self.index[str(page)][1] = self._count + 1
+        self._count += 1
+
+    def result(self) -> Optional[Dict[str, List[int]]]:
+        """page_index, ou None si les pages ne sont pas consécutives"""
+        return self.index if self.contiguous else None
+
+
+def build_page_index(elements: Iterable[Dict[str, Any]]) -> Optional[Dict[str, List[int]]]:
+    """
+    Construit page_index à partir des éléments dans leur ordre actuel
+
+    Returns:
+        page (str) → [début, fin), ou None si une page n'est pas d'un seul tenant
+    """
+    builder = PageIndexBuilder()
+    for elem in elements:
+        builder.add(elem)
+    return builder.result()
+
+
+def build_code_abstract_index(elements: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Offsets des éléments code_abstract, dans l'ordre des éléments
+
+    Returns:
+        Liste de {"code", "offset", "page"}
+    """
+    index = []
+    for offset, elem in enumerate(elements):
+        if isinstance(elem, dict) and elem.get("element_type") == "code_abstract":
+            index.append({
+                "code": (elem.get("text") or "").strip(),
+                "offset": offset,
+                "page": elem.get("page")
+            })
+    return index
+
+
+def refresh_indexes(data: Dict[str, Any]):
+    """
+    Recalcule page_index et code_abstract_index après un tri / filtrage
+
+    page_index est retiré si les pages ne sont plus consécutives ;
+    code_abstract_index n'est écrit qu'une fois les éléments typés (passe 1).
+    """
+    elements = data.get("elements", [])
+
+    page_index = build_page_index(elements)
+    if page_index is None:
+        data.pop("page_index", None)
+    else:
+        data["page_index"] = page_index
+
+    if any(isinstance(e, dict) and "element_type" in e for e in elements):
+        data["code_abstract_index"] = build_code_abstract_index(elements)
+
+
+def _valid_page_index(data: Dict[str, Any]) -> Optional[Dict[str, List[int]]]:
+    """page_index s'il couvre exactement les éléments actuels, sinon None"""
+    page_index = data.get("page_index")
+    if not page_index or max(end for _, end in page_index.values()) != len(data.get("elements", [])):
+        return None
+    return page_index
+
+
+def _checked_range(elements: Sequence[Dict[str, Any]], page_index: Dict[str, List[int]],
+                   page: int) -> Optional[Tuple[int, int]]:
+    bounds = page_index.get(str(page))
+    if bounds is None:
+        return (0, 0)
+    start, end = bounds
+    # Contrôle de cohérence : index d'une version antérieure des éléments
+    if elements[start].get("page") != page or elements[end - 1].get("page") != page:
+        return None
+    return start, end
+
+
+def pages_slice(data: Dict[str, Any], pages: Iterable[int]) -> List[Dict[str, Any]]:
+    """
+    Éléments de plusieurs pages, dans l'ordre des éléments
+
+    Découpage par page_index ; un seul parcours complet si l'index est
+    absent ou périmé.
+    """
+    elements = data.get("elements", [])
+    wanted = set(pages)
+
+    page_index = _valid_page_index(data)
+    ranges = []
+    if page_index is not None:
+        for page in wanted:
+            bounds = _checked_range(elements, page_index, page)
+            if bounds is None:
+                break
+            ranges.append(bounds)
+        else:
+            ranges.sort()
+            return [elements[i] for start, end in ranges for i in range(start, end)]
+
+    return [e for e in elements if e.get("page") in wanted]
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Schéma v2 des éléments (compact, champs typés) et conversion v1 ↔ v2
+
+Schéma v1 (sortie historique de neutral_extractor.py) :
+    {"id": 0, "type": "text", "page": 4, "text": "OP 01",
+     "signature": "MyriadPro-Bold_12.0_20",
+     "position": {"x": 51.0, "y": 54.0, "w": 29.5, "h": 12.0},
+     "line_id": "p4_L0", "line_num": 0, ...}
+
+Schéma v2 :
+    {"id": 0, "type": "text", "page": 4, "text": "OP 01",
+     "font_id": 3, "size": 12.0, "flags": 20,
+     "bbox": [51.0, 54.0, 29.5, 12.0],
+     "line": 0, "line_num": 0, ...}
+
+    - font_id : index dans la table "fonts" du document (noms de police internés)
+    - size / flags : valeurs numériques de la signature (plus de découpage de chaîne ;
+      une taille écrite sans décimale reste entière)
+    - bbox : [x, y, w, h] au lieu du dict "position" (idem pour "placements"
+      des images et le "bbox" des cellules de tables)
+    - line : entier (ordre de première apparition des lignes) au lieu de
+      "p{page}_L{n}" ; la table des lignes porte "line" au lieu de "line_id"
+      (les identifiants qui ne suivent pas ce format sont gardés dans "line_names")
+    - metadata.schema = 2
+
+Les autres champs (ajoutés par les passes : element_type, ...) sont conservés
+tels quels et à la même place. La conversion v2 → v1 est exacte :
+pipeline_io.load_data l'applique à la lecture, les passes lisent donc
+indifféremment les deux schémas.
+
+Usage :
+    python element_schema.py -i neutral.json -o neutral_v2.json
+    python element_schema.py -i neutral_v2.json -o neutral.json --to v1
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SCHEMA_VERSION = 2
+
+
+def split_signature(signature: str) -> Tuple[str, float, int]:
+    """
+    Décompose une signature "Font_Size_Flags" (le nom de police peut contenir "_")
+
+    Returns:
+        (police, taille, flags) ; taille entière si la signature l'écrit sans
+        décimale ("Font_0_0"), pour que join_signature la reproduise à l'identique
+    """
+    font, size, flags = signature.rsplit("_", 2)
+    value = float(size)
+    if value.is_integer() and size.lstrip("-").isdigit():
+        value = int(value)
+    return font, value, int(flags)
+
+
+def join_signature(font: str, size: float, flags: int) -> str:
+    """Signature "Font_Size_Flags", au format de NeutralExtractor.compute_signature"""
+    return f"{font}_{size}_{flags}"
+
+
+def schema_version(data: Any) -> int:
+    """Version du schéma d'un document (1 si non indiquée)"""
+    if isinstance(data, dict):
+        metadata = data.get("metadata")
+        if isinstance(metadata, dict):
+            return metadata.get("schema", 1)
+    return 1
+
+
+def _box_to_list(box: Optional[Dict[str, float]]) -> Optional[List[float]]:
+    if box is None:
+        return None
+    return [box["x"], box["y"], box["w"], box["h"]]
+
+
+def _list_to_box(box: Optional[List[float]]) -> Optional[Dict[str, float]]:
+    if box is None:
+        return None
+    x, y, w, h = box
+    return {"x": x, "y": y, "w": w, "h": h}
+
+
+class V2Encoder:
+    """
+    Conversion élément par élément vers le schéma v2
+
+    Les tables d'interning (polices, lignes) se remplissent au fil des
+    éléments : utilisable en flux (NDJSON), la table "fonts" étant écrite à la fin.
+    """
+
+    def __init__(self, signature_parts: Optional[Callable[[str], Tuple[str, Any, int]]] = None):
+        """
+        Args:
+            signature_parts: Découpage d'une signature en (police, taille, flags)
+                (SignatureRegistry.parts de l'extracteur) ; split_signature par défaut
+        """
+        self._signature_parts = signature_parts or split_signature
+        self.fonts: List[str] = []
+        self._font_ids: Dict[str, int] = {}
+        self._line_keys: Dict[str, int] = {}
+        # Lignes dont l'identifiant ne se déduit pas de (page, line_num)
+        self.line_names: Dict[int, str] = {}
+        # Signature → (font_id, taille, flags) : un découpage par signature
+        self._signatures: Dict[str, Tuple[int, Any, int]] = {}
+
+    def signature_fields(self, signature: str) -> Tuple[int, Any, int]:
+        """(font_id, taille, flags) d'une signature v1"""
+        fields = self._signatures.get(signature)
+        if fields is None:
+            font, size, flags = self._signature_parts(signature)
+            fields = self._signatures[signature] = (self.font_id(font), size, flags)
+        return fields
+
+    def font_id(self, font: str) -> int:
+        """Identifiant entier d'un nom de police"""
+        font_id = self._font_ids.get(font)
+        if font_id is None:
+            font_id = self._font_ids[font] = len(self.fonts)
+            self.fonts.append(font)
+        return font_id
+
+    def line_key(self, line_id: str, page: Any = None, line_num: Any = None) -> int:
+        """Clé entière d'une ligne "p{page}_L{n}" (ordre de première apparition)"""
+        key = self._line_keys.get(line_id)
+        if key is None:
+            key = self._line_keys[line_id] = len(self._line_keys)
+            if line_id != f"p{page}_L{line_num}":
+                self.line_names[key] = line_id
+        return key
+
+    def element(self, elem: Dict[str, Any]) -> Dict[str, Any]:
+        """Élément v1 → élément v2 (nouveau dict, ordre des clés conservé)"""
+        out: Dict[str, Any] = {}
+        for key, value in elem.items():
+            if key == "signature":
+                out["font_id"], out["size"], out["flags"] = self.signature_fields(value)
+            elif key == "position":
+                out["bbox"] = _box_to_list(value)
+            elif key == "line_id":
+                out["line"] = (self.line_key(value, elem.get("page"), elem.get("line_num"))
+                               if value is not None else None)
+            elif key == "placements":
+                out["placements"] = [_box_to_list(box) for box in value]
+            elif key == "cells" and elem.get("type") == "table":
+                out["cells"] = [[{**cell, "bbox": _box_to_list(cell.get("bbox"))} for cell in row]
+                                for row in value]
+            else:
+                out[key] = value
+        return out
+
+    def line_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Entrée de la table des lignes v1 → v2"""
+        out = {}
+        for key, value in row.items():
+            if key == "line_id":
+                out["line"] = self.line_key(value, row.get("page"), row.get("line_num"))
+            else:
+                out[key] = value
+        return out
+
+
+def element_to_v1(elem: Dict[str, Any], fonts: List[str], line_ids: Dict[int, str],
+                  signatures: Optional[Dict[Tuple[int, Any, bool, int], str]] = None) -> Dict[str, Any]:
+    """
+    Élément v2 → élément v1
+
+    Args:
+        elem: Élément v2
+        fonts: Table "fonts" du document
+        line_ids: Clé de ligne → line_id "p{page}_L{n}"
+        signatures: Cache (font_id, taille, taille entière ?, flags) → signature,
+            partagé entre les éléments d'un document (une chaîne par triplet ;
+            0 et 0.0 se confondent en clé de dict, d'où le type de la taille)
+    """
+    out: Dict[str, Any] = {}
+    for key, value in elem.items():
+        if key == "font_id":
+            fields = (value, elem["size"], isinstance(elem["size"], int), elem["flags"])
+            signature = signatures.get(fields) if signatures is not None else None
+            if signature is None:
+                signature = join_signature(fonts[value], elem["size"], elem["flags"])
+                if signatures is not None:
+                    signatures[fields] = signature
+            out["signature"] = signature
+        elif key in ("size", "flags") and "font_id" in elem:
+            continue
+        elif key == "bbox":
+            out["position"] = _list_to_box(value)
+        elif key == "line":
+            out["line_id"] = line_ids[value] if value is not None else None
+        elif key == "placements":
+            out["placements"] = [_list_to_box(box) for box in value]
+        elif key == "cells" and elem.get("type") == "table":
+            out["cells"] = [[{**cell, "bbox": _list_to_box(cell.get("bbox"))} for cell in row]
+                            for row in value]
+        else:
+            out[key] = value
+    return out
+
+
+def _line_ids_v2(data: Dict[str, Any]) -> Dict[int, str]:
+    """Clé de ligne → line_id, déduite de la page et du numéro de ligne"""
+    line_ids: Dict[int, str] = {int(key): name for key, name in (data.get("line_names") or {}).items()}
+    for row in data.get("line_table") or []:
+        if row["line"] not in line_ids:
+            line_ids[row["line"]] = f"p{row['page']}_L{row['line_num']}"
+    for elem in data.get("elements", []):
+        key = elem.get("line")
+        if key is not None and key not in line_ids:
+            line_ids[key] = f"p{elem['page']}_L{elem['line_num']}"
+    return line_ids
+
+
+def to_v2(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convertit un document v1 (sortie de l'extracteur ou d'une passe) en v2
+
+    Returns:
+        Nouveau document (metadata.schema = 2, table "fonts" ajoutée)
+    """
+    if schema_version(data) == SCHEMA_VERSION:
+        return data
+
+    encoder = V2Encoder()
+    elements = [encoder.element(elem) for elem in data.get("elements", [])]
+
+    converted: Dict[str, Any] = {}
+    for key, value in data.items():
+        if key == "metadata":
+            converted["metadata"] = {**value, "schema": SCHEMA_VERSION}
+        elif key == "elements":
+            converted["elements"] = elements
+        elif key == "line_table" and value is not None:
+            converted["line_table"] = [encoder.line_row(row) for row in value]
+        else:
+            converted[key] = value
+    converted.setdefault("metadata", {"schema": SCHEMA_VERSION})
+    converted["fonts"] = encoder.fonts
+    if encoder.line_names:
+        converted["line_names"] = {str(key): name for key, name in encoder.line_names.items()}
+    return converted
+
+
+def to_v1(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convertit un document v2 en v1 (sans effet sur un document v1)
+
+    Returns:
+        Nouveau document au schéma historique
+    """
+    if schema_version(data) != SCHEMA_VERSION:
+        return data
+
+    fonts = data.get("fonts", [])
+    line_ids = _line_ids_v2(data)
+    signatures: Dict[Tuple[int, Any, bool, int], str] = {}
+
+    converted: Dict[str, Any] = {}
+    for key, value in data.items():
+        if key in ("fonts", "line_names"):
+            continue
+        if key == "metadata":
+            metadata = dict(value)
+            metadata.pop("schema", None)
+            converted["metadata"] = metadata
+        elif key == "elements":
+            converted["elements"] = [element_to_v1(elem, fonts, line_ids, signatures) for elem in value]
+        elif key == "line_table" and value is not None:
+            converted["line_table"] = [
+                {("line_id" if k == "line" else k): (line_ids[v] if k == "line" else v)
+                 for k, v in row.items()}
+                for row in value
+            ]
+        else:
+            converted[key] = value
+    return converted
+
+
+def main():
+    """Point d'entrée CLI : conversion d'un fichier entre schémas"""
+    import argparse
+    from pathlib import Path
+
+    from pipeline_io import load_data, save_data
+
+    parser = argparse.ArgumentParser(description="Conversion du schéma des éléments (v1 ↔ v2)")
+    parser.add_argument('-i', '--input', required=True, help='Fichier d\'entrée (v1 ou v2)')
+    parser.add_argument('-o', '--output', required=True, help='Fichier de sortie')
+    parser.add_argument('--to', choices=['v1', 'v2'], default='v2', help='Schéma cible (défaut: v2)')
+    parser.add_argument('--compact', action='store_true', help='JSON de sortie sans indentation')
+
+    args = parser.parse_args()
+
+    try:
+        # load_data ramène tout document en v1
+        data = load_data(args.input)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.to == 'v2':
+        data = to_v2(data)
+    save_data(args.output, data, compact=args.compact)
+
+    in_size = Path(args.input).stat().st_size
+    out_size = Path(args.output).stat().st_size
+    print(f"✓ {len(data.get('elements', []))} éléments convertis en {args.to} : {args.output}")
+    print(f"   Taille : {in_size / 1e6:.2f} Mo → {out_size / 1e6:.2f} Mo")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
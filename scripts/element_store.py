@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Stockage colonnaire des éléments extraits (optionnel, NumPy requis)
+
+Au lieu d'un dict Python par span (+ un dict "position" imbriqué), les
+éléments texte sont rangés dans des tableaux NumPy :
+    page / x / y / w / h / size / flags  → colonnes numériques
+    signature / line_id                  → codes entiers (tables d'interning)
+    sig_id                               → colonne entière (identifiant du document)
+    text                                 → liste séparée
+Les éléments non texte (images, tables) restent des dicts.
+
+Les appelants existants manipulent des vues dict-like (ElementView) :
+    elem["position"]["x"], elem.get("line_id"), elem["element_type"] = ...
+"""
+
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from element_schema import split_signature
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+COLUMN_CODES = {"left": 0, "right": 1}
+COLUMN_NAMES = {code: name for name, code in COLUMN_CODES.items()}
+
+# Clés gérées par les colonnes (le reste va dans les "extras" de la ligne)
+CORE_KEYS = ("id", "type", "page", "text", "signature", "position", "_merged_count")
+LINE_KEYS = ("line_id", "line_num", "line_start", "line_position")
+# Clés attribuées à l'échelle du document, après les métadonnées de ligne
+DOCUMENT_KEYS = ("sig_id",)
+
+
+class _PositionView(MutableMapping):
+    """Vue dict-like de la position d'une ligne du store (lecture/écriture)"""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "ColumnarElementStore", row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, key: str) -> float:
+        if key not in ("x", "y", "w", "h"):
+            raise KeyError(key)
+        return float(getattr(self._store, key)[self._row])
+
+    def __setitem__(self, key: str, value: float):
+        if key not in ("x", "y", "w", "h"):
+            raise KeyError(key)
+        getattr(self._store, key)[self._row] = value
+
+    def __delitem__(self, key: str):
+        raise TypeError("Les coordonnées d'une position ne peuvent pas être supprimées")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("x", "y", "w", "h"))
+
+    def __len__(self) -> int:
+        return 4
+
+
+class ElementView(MutableMapping):
+    """Vue dict-like d'un élément texte stocké en colonnes"""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "ColumnarElementStore", row: int):
+        self._store = store
+        self._row = row
+
+    def _has(self, key: str) -> bool:
+        store, row = self._store, self._row
+        if key == "type":
+            return bool(store.typed[row])
+        if key == "_merged_count":
+            return store.merged_count[row] > 0
+        if key == "line_id":
+            return store.line[row] >= 0
+        if key == "line_num":
+            return store.line_num[row] >= 0
+        if key == "line_start":
+            return store.line_start[row] >= 0
+        if key == "line_position":
+            return store.column[row] >= 0
+        if key == "sig_id":
+            return store.sig_id[row] >= 0
+        return key in CORE_KEYS
+
+    def __getitem__(self, key: str) -> Any:
+        store, row = self._store, self._row
+        if key in CORE_KEYS or key in LINE_KEYS or key in DOCUMENT_KEYS:
+            if not self._has(key):
+                raise KeyError(key)
+            if key == "id":
+                return int(store.id[row])
+            if key == "type":
+                return "text"
+            if key == "page":
+                return int(store.page[row])
+            if key == "text":
+                return store.texts[row]
+            if key == "signature":
+                return store.signatures[store.sig[row]]
+            if key == "position":
+                return _PositionView(store, row)
+            if key == "_merged_count":
+                return int(store.merged_count[row])
+            if key == "line_id":
+                return store.line_ids[store.line[row]]
+            if key == "line_num":
+                return int(store.line_num[row])
+            if key == "line_start":
+                return bool(store.line_start[row])
+            if key == "sig_id":
+                return int(store.sig_id[row])
+            return COLUMN_NAMES[int(store.column[row])]
+
+        extras = store._extras.get(row)
+        if extras is None or key not in extras:
+            raise KeyError(key)
+        return extras[key]
+
+    def __setitem__(self, key: str, value: Any):
+        store, row = self._store, self._row
+        if key == "id":
+            store.id[row] = value
+        elif key == "type":
+            if value != "text":
+                raise ValueError(f"Type non texte dans le stockage colonnaire : {value}")
+            store.typed[row] = True
+        elif key == "page":
+            store.page[row] = value
+        elif key == "text":
+            store.texts[row] = value
+        elif key == "signature":
+            store._set_signature(row, value)
+        elif key == "position":
+            for coord in ("x", "y", "w", "h"):
+                getattr(store, coord)[row] = value[coord]
+        elif key == "_merged_count":
+            store.merged_count[row] = value
+        elif key == "line_id":
+            store.line[row] = store._intern_line(value)
+        elif key == "line_num":
+            store.line_num[row] = value
+        elif key == "line_start":
+            store.line_start[row] = 1 if value else 0
+        elif key == "line_position":
+            store.column[row] = COLUMN_CODES[value]
+        elif key == "sig_id":
+            store.sig_id[row] = value
+        else:
+            store._extras.setdefault(row, {})[key] = value
+
+    def __delitem__(self, key: str):
+        store, row = self._store, self._row
+        if key in CORE_KEYS and key not in ("type", "_merged_count"):
+            raise TypeError(f"Champ obligatoire : {key}")
+        if key in CORE_KEYS or key in LINE_KEYS or key in DOCUMENT_KEYS:
+            if not self._has(key):
+                raise KeyError(key)
+            if key == "type":
+                store.typed[row] = False
+            elif key == "_merged_count":
+                store.merged_count[row] = 0
+            elif key == "line_id":
+                store.line[row] = -1
+            elif key == "line_num":
+                store.line_num[row] = -1
+            elif key == "line_start":
+                store.line_start[row] = -1
+            elif key == "sig_id":
+                store.sig_id[row] = -1
+            else:
+                store.column[row] = -1
+            return
+
+        extras = store._extras.get(row)
+        if extras is None or key not in extras:
+            raise KeyError(key)
+        del extras[key]
+
+    def __iter__(self) -> Iterator[str]:
+        # Même ordre de clés que les dicts de l'extracteur
+        for key in CORE_KEYS:
+            if self._has(key):
+                yield key
+        yield from self._store._extras.get(self._row, {})
+        for key in LINE_KEYS + DOCUMENT_KEYS:
+            if self._has(key):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"ElementView({dict(self)!r})"
+
+
+class ColumnarElementStore:
+    """
+    Séquence d'éléments stockée en colonnes NumPy
+
+    S'utilise comme une liste d'éléments (len, index, itération) ;
+    chaque élément texte est une ElementView, les autres restent des dicts.
+    """
+
+    def __init__(self, capacity: int = 4096,
+                 signature_parts: Optional[Callable[[str], Tuple[str, Any, int]]] = None):
+        """
+        Args:
+            capacity: Capacité initiale (agrandie par doublement)
+            signature_parts: Découpage d'une signature en (police, taille, flags)
+                (SignatureRegistry.parts de l'extracteur) ; split_signature par défaut
+        """
+        if np is None:
+            raise ImportError("NumPy requis pour le stockage colonnaire : pip install numpy")
+
+        self._n = 0
+        self._capacity = 0
+
+        # Tables d'interning
+        self._signature_parts = signature_parts or split_signature
+        self.signatures: List[str] = []
+        self._signature_codes: Dict[str, int] = {}
+        self._signature_size: List[float] = []
+        self._signature_flags: List[int] = []
+        self.line_ids: List[str] = []
+        self._line_codes: Dict[str, int] = {}
+
+        # Données hors colonnes
+        self.texts: List[Optional[str]] = []
+        self._objects: Dict[int, Dict[str, Any]] = {}   # lignes non texte
+        self._extras: Dict[int, Dict[str, Any]] = {}    # clés additionnelles des textes
+
+        self._grow(max(1, capacity))
+
+    # === Colonnes ===
+
+    def _grow(self, capacity: int):
+        """Réalloue les colonnes à la capacité demandée"""
+        specs = {
+            "id": (np.int64, 0),
+            "page": (np.int32, 0),
+            "x": (np.float64, 0.0),
+            "y": (np.float64, 0.0),
+            "w": (np.float64, 0.0),
+            "h": (np.float64, 0.0),
+            "size": (np.float32, 0.0),
+            "flags": (np.int32, 0),
+            "sig": (np.int32, -1),
+            "sig_id": (np.int32, -1),
+            "line": (np.int32, -1),
+            "line_num": (np.int32, -1),
+            "line_start": (np.int8, -1),
+            "column": (np.int8, -1),
+            "merged_count": (np.int32, 0),
+            "typed": (np.bool_, False),
+        }
+        for name, (dtype, fill) in specs.items():
+            column = np.full(capacity, fill, dtype=dtype)
+            if self._n:
+                column[:self._n] = getattr(self, name)[:self._n]
+            setattr(self, name, column)
+        self._capacity = capacity
+
+    def columns(self) -> Dict[str, Any]:
+        """Colonnes NumPy restreintes aux lignes occupées (vues, sans copie)"""
+        names = ("id", "page", "x", "y", "w", "h", "size", "flags", "sig", "sig_id", "line",
+                 "line_num", "line_start", "column", "merged_count", "typed")
+        return {name: getattr(self, name)[:self._n] for name in names}
+
+    def memory_bytes(self) -> int:
+        """Taille des colonnes NumPy occupées (hors textes)"""
+        return sum(column.nbytes for column in self.columns().values())
+
+    # === Interning ===
+
+    def _set_signature(self, row: int, signature: str):
+        code = self._signature_codes.get(signature)
+        if code is None:
+            code = len(self.signatures)
+            self._signature_codes[signature] = code
+            self.signatures.append(signature)
+            try:
+                _, size, flags = self._signature_parts(signature)
+            except ValueError:
+                size, flags = 0.0, 0
+            self._signature_size.append(float(size))
+            self._signature_flags.append(flags)
+        self.sig[row] = code
+        self.size[row] = self._signature_size[code]
+        self.flags[row] = self._signature_flags[code]
+
+    def _intern_line(self, line_id: str) -> int:
+        code = self._line_codes.get(line_id)
+        if code is None:
+            code = len(self.line_ids)
+            self._line_codes[line_id] = code
+            self.line_ids.append(line_id)
+        return code
+
+    # === Ajout ===
+
+    def append(self, elem: Dict[str, Any]):
+        """Ajoute un élément (dict produit par l'extracteur)"""
+        if self._n == self._capacity:
+            self._grow(self._capacity * 2)
+
+        row = self._n
+        self._n += 1
+        position = elem.get("position")
+
+        self.id[row] = elem.get("id", row)
+        self.page[row] = elem.get("page", 0)
+        if position:
+            self.x[row] = position["x"]
+            self.y[row] = position["y"]
+            self.w[row] = position["w"]
+            self.h[row] = position["h"]
+
+        if "signature" not in elem or elem.get("type", "text") != "text":
+            # Image, table... : conservé tel quel
+            self.texts.append(None)
+            self._objects[row] = elem
+            return
+
+        self.texts.append(elem["text"])
+        view = ElementView(self, row)
+        for key, value in elem.items():
+            if key in ("id", "page", "position"):
+                continue
+            view[key] = value
+
+    def extend(self, elements: Iterable[Dict[str, Any]]):
+        """Ajoute une suite d'éléments"""
+        for elem in elements:
+            self.append(elem)
+
+    # === Accès séquence ===
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, index: int):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError(index)
+        obj = self._objects.get(index)
+        return obj if obj is not None else ElementView(self, index)
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in range(self._n):
+            yield self[row]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Matérialise tous les éléments en dicts (format JSON de l'extracteur)"""
+        return [json_default(elem) if isinstance(elem, ElementView) else elem for elem in self]
+
+
+def json_default(obj: Any) -> Any:
+    """Hook `default` de json.dump pour les objets du stockage colonnaire"""
+    if isinstance(obj, ColumnarElementStore):
+        return list(obj)
+    if isinstance(obj, Mapping):
+        return {key: (dict(value) if isinstance(value, _PositionView) else value)
+                for key, value in obj.items()}
+    raise TypeError(f"Objet non sérialisable en JSON : {type(obj).__name__}")
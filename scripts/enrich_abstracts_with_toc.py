@@ -19,10 +19,11 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
 from typing import Any, Dict, List
 
+from pipeline_io import load_data, save_data
+
 
 def load_json_file(file_path: Path) -> Dict[str, Any]:
     """
@@ -37,8 +38,7 @@ def load_json_file(file_path: Path) -> Dict[str, Any]:
     if not file_path.exists():
         raise FileNotFoundError(f"Fichier non trouvé : {file_path}")
     
-    with file_path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return load_data(file_path)
 
 
 def extract_table_of_contents(metadata_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -149,7 +149,8 @@ def enrich_abstracts_file(
 def process_files(
     metadata_path: Path,
     abstracts_path: Path,
-    output_path: Path
+    output_path: Path,
+    compact: bool = False
 ) -> None:
     """
     Traite les fichiers et génère le fichier enrichi.
@@ -158,6 +159,7 @@ def process_files(
         metadata_path: Chemin vers metadata.json
         abstracts_path: Chemin vers neutral_typed_pass3c.json
         output_path: Chemin vers le fichier de sortie enrichi
+        compact: JSON de sortie sans indentation
     """
     print(f"Chargement de {metadata_path}...")
     metadata_data = load_json_file(metadata_path)
@@ -187,9 +189,7 @@ def process_files(
     
     # Sauvegarder
     print(f"Sauvegarde dans {output_path}...")
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(enriched_data, f, ensure_ascii=False, indent=2)
+    save_data(output_path, enriched_data, compact=compact)
     
     # Statistiques
     num_abstracts = len(enriched_data.get("abstracts", []))
@@ -235,13 +235,18 @@ def main() -> None:
         required=True,
         help="Fichier JSON de sortie enrichi.",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="JSON de sortie sans indentation (plus petit, plus rapide).",
+    )
     
     args = parser.parse_args()
     metadata_path = Path(args.metadata)
     abstracts_path = Path(args.abstracts)
     output_path = Path(args.output)
     
-    process_files(metadata_path, abstracts_path, output_path)
+    process_files(metadata_path, abstracts_path, output_path, compact=args.compact)
 
 
 if __name__ == "__main__":
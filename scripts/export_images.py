@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Écrit les fichiers image d'une extraction faite en mode manifeste
+
+neutral_extractor.py --images manifest ne relève que la page, le xref, la
+position et la taille de chaque image : aucun contenu n'est décodé ni écrit.
+Ce script écrit ensuite les fichiers (mêmes noms et même dossier qu'une
+extraction avec export), pour tout le document, quelques pages, ou
+seulement les pages de certains abstracts.
+
+Le fichier d'entrée peut être la sortie de l'extracteur ou d'une passe du
+pipeline (les éléments image y sont conservés) ; il est mis à jour avec
+les chemins des fichiers écrits, au même schéma (v1 / v2) et sous la même
+forme (JSON indenté ou compact) que l'entrée.
+
+Usage :
+    python export_images.py -i neutral.json
+    python export_images.py -i neutral.json --pages 5,40-42 -o neutral.json
+    python export_images.py -i neutral_typed_pass2.json --abstracts abstracts.json --codes 1181,1182
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from element_schema import SCHEMA_VERSION, schema_version, to_v1, to_v2
+from neutral_extractor import NeutralExtractor, parse_page_list
+from pipeline_io import is_compact_json, load_data, save_data
+
+logger = logging.getLogger(__name__)
+
+
+def abstract_pages(abstracts_data: Dict[str, Any], codes: Optional[List[str]] = None) -> Set[int]:
+    """
+    Pages couvertes par des abstracts (page_start à page_end)
+
+    Args:
+        abstracts_data: Sortie de semantic_typing_pass_3.py (clé "abstracts")
+        codes: Codes d'abstracts à retenir (None = tous)
+
+    Returns:
+        Numéros de pages (1-indexed)
+    """
+    wanted = {c.strip() for c in codes} if codes else None
+    pages: Set[int] = set()
+    for abstract in abstracts_data.get("abstracts", []):
+        if wanted is not None and (abstract.get("abstract_code") or "").strip() not in wanted:
+            continue
+        start, end = abstract.get("page_start"), abstract.get("page_end")
+        if start is None:
+            continue
+        pages.update(range(start, (end or start) + 1))
+    return pages
+
+
+def main():
+    """Point d'entrée CLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export des fichiers image d'un manifeste d'extraction")
+    parser.add_argument('-i', '--input', required=True, help='Résultat d\'extraction (manifeste d\'images)')
+    parser.add_argument('-o', '--output', help='Fichier de sortie (défaut: mise à jour de l\'entrée)')
+    parser.add_argument('--pdf', help='PDF source (défaut: metadata.source)')
+    parser.add_argument('--pages', help='Pages à exporter, ex. "5,10-12" (défaut: toutes)')
+    parser.add_argument('--abstracts', help='Abstracts (pass 3) dont exporter les pages')
+    parser.add_argument('--codes', help='Codes d\'abstracts retenus avec --abstracts, ex. "1181,1182"')
+    parser.add_argument('--no-image-dedup', action='store_true',
+                        help='Un fichier par occurrence d\'image (comme l\'extraction --no-image-dedup)')
+    parser.add_argument('--image-writers', type=int, default=0,
+                        help='Threads d\'écriture des images en arrière-plan (défaut: 0 = synchrone)')
+    parser.add_argument('--compact', action='store_true',
+                        help='JSON de sortie sans indentation (défaut: comme l\'entrée)')
+
+    args = parser.parse_args()
+
+    try:
+        # Schéma et forme de l'entrée, conservés à l'écriture
+        data = load_data(args.input, keep_schema=True)
+        schema = schema_version(data)
+        compact = args.compact or is_compact_json(args.input)
+        data = to_v1(data)
+
+        pages: Optional[Set[int]] = None
+        if args.pages:
+            pages = set(parse_page_list(args.pages))
+        if args.abstracts:
+            codes = args.codes.split(",") if args.codes else None
+            selected = abstract_pages(load_data(args.abstracts), codes)
+            pages = selected if pages is None else pages & selected
+            if not pages:
+                print("❌ Aucune page retenue pour ces abstracts")
+                return 1
+
+        extractor = NeutralExtractor(dedup_images=not args.no_image_dedup,
+                                     image_writers=args.image_writers)
+        stats = extractor.export_images(data, args.pdf, sorted(pages) if pages is not None else None)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    output = args.output or args.input
+    save_data(output, to_v2(data) if schema == SCHEMA_VERSION else data, compact=compact)
+
+    writes = stats["image_writes"]
+    print(f"\n🖼️  EXPORT DES IMAGES")
+    print(f"   Pages : {'toutes' if pages is None else len(pages)}")
+    print(f"   Images exportées : {stats['exported']} ({writes.get('files', 0)} fichiers écrits, "
+          f"{writes.get('bytes', 0) / 1e6:.1f} Mo)")
+    if stats["failed"]:
+        print(f"   ⚠️  Non extractibles : {stats['failed']}")
+    print(f"   Restant au manifeste : {stats['remaining']}")
+    print(f"\n✓ Résultat mis à jour : {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
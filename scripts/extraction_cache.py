@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Cache persistant des résultats de neutral_extractor.py
+
+Clé = empreinte du contenu du PDF + version de l'extracteur + paramètres
+(merge_consecutive, y_tolerance, plage de pages, ...). Un résultat en cache
+est relu sans ouvrir le PDF.
+
+Chaque entrée occupe deux fichiers dans le dossier de cache :
+    <clé>.json.gz     résultat complet (JSON compressé)
+    <clé>.meta.json   source, paramètres, taille, dernier accès
+
+La taille totale est bornée : les entrées les moins récemment utilisées
+sont supprimées en premier (LRU).
+
+Usage (inspection / purge) :
+    python extraction_cache.py --cache-dir .neutral_cache list
+    python extraction_cache.py --cache-dir .neutral_cache purge --older-than 30
+    python extraction_cache.py --cache-dir .neutral_cache purge --all
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MB = 1024
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier (lecture par blocs)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Cache disque des résultats d'extraction, avec éviction LRU"""
+
+    def __init__(self, cache_dir: str, max_mb: float = DEFAULT_MAX_MB):
+        """
+        Args:
+            cache_dir: Dossier du cache (créé si nécessaire)
+            max_mb: Taille maximale du cache en Mo
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # === Clés ===
+
+    @staticmethod
+    def make_key(pdf_hash: str, params: Dict[str, Any]) -> str:
+        """
+        Calcule la clé d'une extraction
+
+        Args:
+            pdf_hash: Empreinte du contenu du PDF
+            params: Version de l'extracteur et paramètres influant sur le résultat
+
+        Returns:
+            Clé hexadécimale
+        """
+        payload = json.dumps({"pdf": pdf_hash, **params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def _data_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json.gz"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.meta.json"
+
+    # === Lecture / écriture ===
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Relit un résultat en cache et met à jour sa date de dernier accès
+
+        Returns:
+            Résultat désérialisé, ou None si absent / illisible
+        """
+        data_path = self._data_path(key)
+        meta = self._read_meta(key)
+        if meta is None or not data_path.exists():
+            return None
+
+        try:
+            with gzip.open(data_path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrée de cache illisible {key} : {e}")
+            self.remove(key)
+            return None
+
+        meta["last_access"] = time.time()
+        meta["hits"] = meta.get("hits", 0) + 1
+        self._write_json(self._meta_path(key), meta)
+        return data
+
+    def put(self, key: str, data: Dict[str, Any], info: Dict[str, Any], default=None):
+        """
+        Enregistre un résultat puis applique la limite de taille
+
+        Args:
+            key: Clé de l'extraction
+            data: Résultat à stocker
+            info: Informations descriptives (source, paramètres) pour l'inspection
+            default: Hook `default` de json.dump (objets non sérialisables)
+        """
+        data_path = self._data_path(key)
+        tmp_path = data_path.with_name(f".{data_path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(data, f, ensure_ascii=False, default=default)
+        os.replace(tmp_path, data_path)
+
+        now = time.time()
+        meta = {
+            "key": key,
+            **info,
+            "size": data_path.stat().st_size,
+            "created": now,
+            "last_access": now,
+            "hits": 0
+        }
+        self._write_json(self._meta_path(key), meta)
+
+        self.evict()
+
+    def remove(self, key: str):
+        """Supprime une entrée"""
+        for path in (self._data_path(key), self._meta_path(key)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    # === Inspection / maintenance ===
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Métadonnées de toutes les entrées, de la plus récemment utilisée à la plus ancienne"""
+        entries = []
+        for meta_path in self.cache_dir.glob("*.meta.json"):
+            meta = self._read_meta(meta_path.name[:-len(".meta.json")])
+            if meta is not None:
+                entries.append(meta)
+        entries.sort(key=lambda m: m.get("last_access", 0), reverse=True)
+        return entries
+
+    def total_bytes(self) -> int:
+        """Taille cumulée des résultats en cache"""
+        return sum(m.get("size", 0) for m in self.entries())
+
+    def evict(self) -> int:
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à respecter la limite
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        entries = self.entries()
+        total = sum(m.get("size", 0) for m in entries)
+        removed = 0
+        while entries and total > self.max_bytes:
+            oldest = entries.pop()
+            self.remove(oldest["key"])
+            total -= oldest.get("size", 0)
+            removed += 1
+            logger.info(f"Cache : entrée {oldest['key']} évincée ({oldest.get('source')})")
+        return removed
+
+    def purge(self, older_than_days: Optional[float] = None) -> int:
+        """
+        Vide le cache
+
+        Args:
+            older_than_days: Si fourni, ne supprime que les entrées non utilisées depuis ce nombre de jours
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        limit = time.time() - older_than_days * 86400 if older_than_days is not None else None
+        removed = 0
+        for meta in self.entries():
+            if limit is None or meta.get("last_access", 0) < limit:
+                self.remove(meta["key"])
+                removed += 1
+
+        # Fichiers temporaires orphelins (écriture interrompue)
+        if limit is None:
+            for tmp_path in self.cache_dir.glob(".*.tmp"):
+                tmp_path.unlink()
+        return removed
+
+    # === Utilitaires ===
+
+    def _read_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path: Path, obj: Dict[str, Any]):
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+def _format_date(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+
+def main():
+    """Point d'entrée CLI : inspection et purge du cache"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspection et purge du cache de neutral_extractor.py")
+    parser.add_argument('--cache-dir', required=True, help='Dossier du cache')
+    parser.add_argument('--max-mb', type=float, default=DEFAULT_MAX_MB,
+                        help=f'Taille maximale du cache en Mo (défaut: {DEFAULT_MAX_MB})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='Lister les entrées (plus récente d\'abord)')
+
+    purge_parser = subparsers.add_parser('purge', help='Supprimer des entrées')
+    group = purge_parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--all', action='store_true', help='Vider tout le cache')
+    group.add_argument('--older-than', type=float, metavar='JOURS',
+                       help='Supprimer les entrées non utilisées depuis N jours')
+    group.add_argument('--key', help='Supprimer une entrée précise')
+
+    subparsers.add_parser('evict', help='Appliquer la limite de taille (--max-mb)')
+
+    args = parser.parse_args()
+
+    if not Path(args.cache_dir).is_dir():
+        print(f"❌ Dossier de cache introuvable : {args.cache_dir}")
+        return 1
+
+    cache = ExtractionCache(args.cache_dir, args.max_mb)
+
+    if args.command == 'list':
+        entries = cache.entries()
+        total = sum(m.get("size", 0) for m in entries)
+        print(f"\n📦 CACHE : {args.cache_dir}")
+        print(f"   Entrées : {len(entries)}")
+        print(f"   Taille  : {total / 1e6:.1f} Mo (limite {args.max_mb:.0f} Mo)")
+        for meta in entries:
+            params = meta.get("params", {})
+            print(f"\n   🔑 {meta['key']}")
+            print(f"      Source       : {meta.get('source')}")
+            print(f"      Paramètres   : {', '.join(f'{k}={v}' for k, v in params.items())}")
+            print(f"      Taille       : {meta.get('size', 0) / 1e6:.2f} Mo")
+            print(f"      Créée        : {_format_date(meta.get('created', 0))}")
+            print(f"      Dernier accès: {_format_date(meta.get('last_access', 0))} ({meta.get('hits', 0)} hits)")
+
+    elif args.command == 'purge':
+        if args.key:
+            cache.remove(args.key)
+            print(f"✓ Entrée {args.key} supprimée")
+        else:
+            removed = cache.purge(None if args.all else args.older_than)
+            print(f"✓ {removed} entrées supprimées")
+
+    else:
+        removed = cache.evict()
+        print(f"✓ {removed} entrées évincées ({cache.total_bytes() / 1e6:.1f} Mo restants)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
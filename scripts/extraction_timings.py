@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Durées de l'extraction neutre : par étape, par page et au total
+
+Étapes mesurées pour chaque page (NeutralExtractor._extract_page) :
+    get_text     TextPage, get_text("dict") et construction des spans
+    images       _extract_images
+    tables       décision de détection + _extract_tables
+    span_cache   relecture des spans bruts depuis le cache
+    merge        fusion des consécutifs
+    scripts      rattachement des exposants / indices
+    lines        tri et métadonnées de ligne
+Étapes du document : clip_bands (échantillon des bandes), catalog.
+
+Format de metadata.timings :
+
+    "timings": {
+      "wall_seconds": 12.31,
+      "stages": {"get_text": 4.12, "images": 0.8, ..., "catalog": 0.05},
+      "pages": [{"page": 4, "seconds": 0.52, "images": 3, "tables": 1,
+                 "stages": {"get_text": 0.21, "tables": 0.24, ...}}]
+    }
+
+"seconds" couvre toute la page (chargement compris). Avec workers > 1, les
+durées des étapes s'additionnent sur tous les processus et peuvent dépasser
+wall_seconds.
+"""
+
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+
+PAGE_STAGES = ("get_text", "images", "tables", "span_cache", "merge", "scripts", "lines")
+DOCUMENT_STAGES = ("clip_bands", "catalog")
+
+# Arrondi des durées enregistrées (0,1 ms)
+DIGITS = 4
+
+
+@contextmanager
+def timed(timings: Optional[Dict[str, float]], stage: str) -> Iterator[None]:
+    """
+    Ajoute la durée du bloc à timings[stage] (sans effet si timings est None)
+
+    Args:
+        timings: Durées cumulées par étape (secondes)
+        stage: Nom de l'étape
+    """
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + perf_counter() - start
+
+
+class TimingsBuilder:
+    """Construit metadata.timings au fil des pages d'une extraction"""
+
+    def __init__(self):
+        self._start = perf_counter()
+        # Étapes du document (clip_bands, catalog), à passer à timed()
+        self.document: Dict[str, float] = {}
+        self.pages: List[Dict[str, Any]] = []
+
+    def add_page(self, page: int, timings: Dict[str, float], images: int = 0, tables: int = 0):
+        """
+        Enregistre les durées d'une page
+
+        Args:
+            page: Numéro de page (1-indexed)
+            timings: Durées de la page par étape, "total" pour la page entière
+            images: Nombre d'éléments image de la page
+            tables: Nombre d'éléments table de la page
+        """
+        self.pages.append({
+            "page": page,
+            "seconds": round(timings.get("total", 0.0), DIGITS),
+            "images": images,
+            "tables": tables,
+            "stages": {stage: round(timings[stage], DIGITS) for stage in PAGE_STAGES if stage in timings}
+        })
+
+    def result(self) -> Dict[str, Any]:
+        """metadata.timings (wall_seconds : depuis la création du builder)"""
+        stages: Dict[str, float] = {}
+        for entry in self.pages:
+            for stage, seconds in entry["stages"].items():
+                stages[stage] = stages.get(stage, 0.0) + seconds
+        stages.update(self.document)
+
+        ordered = [stage for stage in PAGE_STAGES + DOCUMENT_STAGES if stage in stages]
+        return {
+            "wall_seconds": round(perf_counter() - self._start, DIGITS),
+            "stages": {stage: round(stages[stage], DIGITS) for stage in ordered},
+            "pages": self.pages
+        }
+
+
+def slowest_pages(timings: Dict[str, Any], count: int = 5) -> List[Dict[str, Any]]:
+    """
+    Pages les plus lentes d'un metadata.timings
+
+    Returns:
+        Entrées "pages" triées par durée décroissante (au plus count)
+    """
+    return sorted(timings.get("pages", []), key=lambda entry: entry["seconds"], reverse=True)[:count]
@@ -10,10 +10,11 @@ scientifiques originaux.
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
 from typing import Any, Dict, List
 
+from pipeline_io import load_data
+
 
 # Mapping des noms de sections vers leurs titres formatés
 SECTION_TITLES = {
@@ -164,8 +165,7 @@ def process_file(
         raise FileNotFoundError(f"Fichier JSON introuvable : {input_path}")
     
     # Charger le JSON
-    with input_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_data(input_path)
     
     if not isinstance(data, dict) or "abstracts" not in data:
         raise ValueError("Le JSON doit contenir une clé 'abstracts' avec une liste d'abstracts.")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Stockage des images extraites avec déduplication
+
+Une même image (logo de la revue, figure réutilisée) apparaît souvent sur
+de nombreuses pages. Le store :
+- ne décode qu'une fois chaque xref (doc.extract_image)
+- nomme les fichiers par empreinte du contenu (img_<sha1>.<ext>)
+- n'écrit qu'une fois chaque contenu, même entre processus (fichier existant = déjà écrit)
+
+Les écritures passent par un ImageWriter : synchrone, ou pool de threads
+avec file d'attente bornée pour ne pas bloquer la boucle des pages.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ImageWriter:
+    """Écriture des fichiers image, synchrone ou en arrière-plan (pool de threads)"""
+
+    def __init__(self, threads: int = 0, max_pending: int = 64):
+        """
+        Args:
+            threads: Nombre de threads d'écriture (0 = écriture synchrone)
+            max_pending: Nombre maximal d'écritures en attente (borne la mémoire) ;
+                         submit() bloque quand la file est pleine
+        """
+        self.threads = max(0, threads)
+        self.max_pending = max(1, max_pending)
+        self._pool = None
+        self._slots = None
+        if self.threads > 0:
+            self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="image-writer")
+            self._slots = threading.BoundedSemaphore(self.max_pending)
+
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.files = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.errors = 0
+
+    def submit(self, path: Path, data: bytes):
+        """Écrit (ou planifie l'écriture de) data dans path"""
+        if self._pool is None:
+            self._write(path, data)
+            return
+
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(self._write, path, data)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+    def _write(self, path: Path, data: bytes):
+        """Écriture atomique (fichier temporaire puis renommage)"""
+        start = perf_counter()
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as img_file:
+                img_file.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Erreur écriture image {path}: {e}")
+            with self._lock:
+                self.errors += 1
+            return
+
+        elapsed = perf_counter() - start
+        with self._lock:
+            self.files += 1
+            self.bytes += len(data)
+            self.seconds += elapsed
+
+    def drain(self):
+        """Attend la fin de toutes les écritures en attente"""
+        if self._slots is None:
+            return
+        # Chaque écriture en cours détient un slot : les reprendre tous = file vide
+        for _ in range(self.max_pending):
+            self._slots.acquire()
+        for _ in range(self.max_pending):
+            self._slots.release()
+
+    def take_stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques d'écriture depuis le dernier appel, puis les remet à zéro"""
+        with self._lock:
+            stats = {
+                "files": self.files,
+                "bytes": self.bytes,
+                "write_seconds": self.seconds,
+                "errors": self.errors
+            }
+            self._reset_stats()
+        return stats
+
+    def close(self):
+        """Vide la file et arrête les threads"""
+        self.drain()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            self._slots = None
+
+
+class ImageStore:
+    """Images uniques d'une extraction, indexées par xref et par empreinte"""
+
+    def __init__(self, images_dir: Path, relative_dir: str, writer: Optional[ImageWriter] = None):
+        """
+        Args:
+            images_dir: Dossier où écrire les fichiers
+            relative_dir: Préfixe des chemins enregistrés dans les éléments
+            writer: ImageWriter utilisé pour les écritures (synchrone par défaut)
+        """
+        self.images_dir = Path(images_dir)
+        self.relative_dir = relative_dir
+        self.writer = writer if writer is not None else ImageWriter()
+        self._by_xref: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._by_hash: Dict[str, str] = {}
+
+        # Statistiques
+        self.occurrences = 0
+        self.xref_hits = 0
+        self.hash_hits = 0
+
+    def get(self, doc, xref: int) -> Optional[Dict[str, Any]]:
+        """
+        Retourne l'image d'un xref, en l'écrivant sur disque si son contenu est nouveau
+
+        Args:
+            doc: Document PyMuPDF
+            xref: Référence de l'image dans le PDF
+
+        Returns:
+            {"image_file", "image_hash", "format", "width", "height"} ou None si non extractible
+        """
+        self.occurrences += 1
+
+        if xref in self._by_xref:
+            self.xref_hits += 1
+            return self._by_xref[xref]
+
+        base_image = doc.extract_image(xref)
+        if not base_image:
+            self._by_xref[xref] = None
+            return None
+
+        image_bytes = base_image["image"]
+        image_ext = base_image["ext"]
+        digest = hashlib.sha1(image_bytes).hexdigest()
+
+        filename = self._by_hash.get(digest)
+        if filename is None:
+            filename = f"img_{digest[:16]}.{image_ext}"
+            path = self.images_dir / filename
+            # Fichier déjà présent : écrit par un autre processus (ou un run précédent)
+            if not path.exists():
+                self.writer.submit(path, image_bytes)
+            self._by_hash[digest] = filename
+        else:
+            self.hash_hits += 1
+
+        info = {
+            "image_file": f"{self.relative_dir}/{filename}",
+            "image_hash": digest,
+            "format": image_ext,
+            "width": base_image["width"],
+            "height": base_image["height"]
+        }
+        self._by_xref[xref] = info
+        return info
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Table des lignes (line table) produite par neutral_extractor.py
+
+Une entrée par ligne physique, dans l'ordre de lecture
+(page, colonne gauche puis droite, haut → bas) :
+
+    {"line_id": "p4_L0", "page": 4, "column": "left", "line_num": 0,
+     "y": 54.0, "ids": [0, 3, 5]}
+
+Les passes suivantes peuvent charger cette table au lieu de regrouper
+les éléments par line_id elles-mêmes.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class LineTableBuilder:
+    """Construit la table des lignes au fil des éléments (ordre final de l'extracteur)"""
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+
+    def add(self, elem: Dict[str, Any]):
+        """
+        Ajoute un élément à la table
+
+        Les éléments d'une même ligne sont consécutifs dans la sortie de
+        l'extracteur : une nouvelle entrée est ouverte à chaque changement de line_id.
+        """
+        line_id = elem.get("line_id")
+        if line_id is None:
+            return
+
+        y = elem["position"]["y"]
+        row = self._current
+        if row is None or row["line_id"] != line_id:
+            row = {
+                "line_id": line_id,
+                "page": elem["page"],
+                "column": elem.get("line_position"),
+                "line_num": elem.get("line_num"),
+                "y": y,
+                "ids": []
+            }
+            self.rows.append(row)
+            self._current = row
+        elif y < row["y"]:
+            row["y"] = y
+
+        row["ids"].append(elem["id"])
+
+
+def build_line_table(elements: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Construit la table des lignes à partir d'éléments annotés (line_id, line_num...)
+
+    Args:
+        elements: Éléments dans l'ordre de sortie de l'extracteur
+
+    Returns:
+        Liste d'entrées de ligne
+    """
+    builder = LineTableBuilder()
+    for elem in elements:
+        builder.add(elem)
+    return builder.rows
+
+
+def load_lines(data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Retourne les lignes du document : line_id → éléments (gauche → droite)
+
+    Utilise "line_table" si présente ; les ids absents (éléments supprimés
+    par une passe, ex. headers/footers) sont ignorés. Sans table, regroupe
+    par line_id dans l'ordre des éléments.
+
+    Args:
+        data: Document JSON (sortie de l'extracteur ou d'une passe)
+
+    Returns:
+        Dictionnaire line_id → liste d'éléments, dans l'ordre de lecture
+    """
+    elements = data.get("elements", [])
+    line_table = data.get("line_table")
+
+    lines: Dict[str, List[Dict[str, Any]]] = {}
+
+    if line_table is None:
+        for elem in elements:
+            if not isinstance(elem, dict) or elem.get("line_id") is None:
+                continue
+            lines.setdefault(elem["line_id"], []).append(elem)
+        return lines
+
+    by_id = {e["id"]: e for e in elements if isinstance(e, dict) and "id" in e}
+    for row in line_table:
+        members = [by_id[i] for i in row["ids"] if i in by_id]
+        if members:
+            # Une ligne peut occuper plusieurs entrées (éléments non consécutifs)
+            lines.setdefault(row["line_id"], []).extend(members)
+
+    return lines
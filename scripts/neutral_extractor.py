@@ -10,17 +10,58 @@ Version 1.5 : Détection Unicode subscripts/superscripts (₀₁₂ ⁰¹²) + a
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
-from collections import Counter
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from bisect import bisect_left, bisect_right
 import base64
 
+from line_table import LineTableBuilder, build_line_table
+from element_index import PageIndexBuilder, build_page_index, pages_slice
+from signature_catalog import SignatureAccumulator, SignatureRegistry
+from element_store import ColumnarElementStore, json_default
+from image_store import ImageStore, ImageWriter
+from extraction_cache import ExtractionCache, DEFAULT_MAX_MB, file_sha256
+from span_cache import SpanCache, SPAN_CACHE_FORMAT
+from pipeline_io import load_data, save_data, open_stream
+from element_schema import SCHEMA_VERSION, V2Encoder, to_v2
+from page_bands import count_band_spans, learn_bands, pick_sample_pages
+from vector_merge import MERGE_ENGINES, merge_runs, require_numpy
+from extraction_timings import TimingsBuilder, slowest_pages, timed
+
 try:
     import fitz  # PyMuPDF
 except ImportError:
     print("ERREUR: PyMuPDF requis. Installez avec: pip install PyMuPDF")
     exit(1)
 
+EXTRACTOR_VERSION = "1.6"
+
+# Seuils de fusion / groupement par ligne (valeurs par défaut, configurables)
+MERGE_X_GAP = 50.0        # Saut horizontal maximal entre deux spans fusionnés (espace entre mots)
+LINE_Y_TOLERANCE = 0.3    # Tolérance stricte pour grouper sur une même ligne
+X_THRESHOLD = 305.0       # Seuil colonne gauche / droite
+
+# Pages analysées pour apprendre / mesurer les bandes d'en-tête et de pied de page
+BAND_SAMPLE_PAGES = 12
+
+# Demi-hauteur de la fenêtre de recherche des scripts (±8px + marge d'arrondi)
+SCRIPT_Y_WINDOW = 8.5
+
+# Pré-filtre tables : mêmes seuils que find_tables (snap_tolerance, edge_min_length)
+TABLE_SNAP_TOLERANCE = 3.0
+TABLE_EDGE_MIN_LENGTH = 3.0
+
+# Analyse du texte sans les blocs image : leur contenu serait décodé puis ignoré
+TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+IMAGE_MODES = ("export", "manifest")
+
+# Pages les plus lentes listées dans le rapport (metadata.timings)
+SLOWEST_PAGES = 5
+
 # Configuration logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -28,20 +69,118 @@ logger = logging.getLogger(__name__)
 class NeutralExtractor:
     """Extracteur neutre réutilisable pour tous types de PDFs"""
     
-    def __init__(self, merge_consecutive: bool = True, y_tolerance: float = 3.0):
+    def __init__(self, merge_consecutive: bool = True, y_tolerance: float = 3.0, workers: int = 1,
+                 columnar: bool = False, dedup_images: bool = True, image_writers: int = 0,
+                 image_queue: int = 64, tables: str = "always", cache_dir: Optional[str] = None,
+                 cache_max_mb: float = DEFAULT_MAX_MB, span_cache_dir: Optional[str] = None,
+                 merge_gap: float = MERGE_X_GAP, line_y_tolerance: float = LINE_Y_TOLERANCE,
+                 x_threshold: float = X_THRESHOLD, clip_bands: Any = None, images: str = "export",
+                 merge_engine: str = "python"):
         """
         Initialise l'extracteur
         
         Args:
             merge_consecutive: Si True, fusionne les éléments consécutifs de même signature
             y_tolerance: Tolérance en pixels pour considérer deux éléments sur la même ligne
+            workers: Nombre de processus pour l'extraction des pages (1 = séquentiel)
+            columnar: Si True, extract_from_pdf range les éléments dans un
+                      ColumnarElementStore (NumPy) au lieu d'une liste de dicts
+            dedup_images: Si True, chaque image unique (xref / contenu) n'est écrite
+                          qu'une fois et les éléments pointent vers le fichier partagé
+            image_writers: Threads d'écriture des images en arrière-plan (0 = synchrone)
+            image_queue: Nombre maximal d'images en attente d'écriture (borne la mémoire)
+            tables: Détection des tables : "always" (toutes les pages), "never",
+                    ou "auto" (seulement les pages avec des traits de tableau)
+            cache_dir: Dossier du cache des résultats (None = pas de cache)
+            cache_max_mb: Taille maximale du cache en Mo (éviction LRU)
+            span_cache_dir: Dossier du cache des spans bruts par page (None = pas de cache) ;
+                            permet de rejouer fusion / lignes sans analyser le PDF
+            merge_gap: Saut horizontal maximal (px) entre deux spans fusionnés
+            line_y_tolerance: Tolérance Y (px) du groupement des éléments en lignes
+            x_threshold: Abscisse séparant colonne gauche et colonne droite
+            clip_bands: Bandes d'en-tête / pied de page exclues de l'extraction du texte :
+                        None (désactivé), "auto" (apprises sur un échantillon de pages)
+                        ou (hauteur en-tête, hauteur pied de page) en points
+            images: "export" (fichiers image écrits pendant l'extraction) ou "manifest"
+                    (page, xref, position, taille seulement ; fichiers écrits plus tard
+                    par export_images)
+            merge_engine: "python" (comparaison paire par paire) ou "numpy" (ruptures de
+                          groupe calculées en masques vectorisés, même résultat ; NumPy requis)
         """
+        if tables not in ("auto", "always", "never"):
+            raise ValueError(f"Mode tables inconnu : {tables}")
+        if images not in IMAGE_MODES:
+            raise ValueError(f"Mode images inconnu : {images}")
+        if merge_engine not in MERGE_ENGINES:
+            raise ValueError(f"Moteur de fusion inconnu : {merge_engine}")
+        if merge_engine == "numpy":
+            require_numpy()
+        if clip_bands is not None and clip_bands != "auto":
+            clip_bands = tuple(float(h) for h in clip_bands)
+            if len(clip_bands) != 2 or min(clip_bands) < 0:
+                raise ValueError(f"Bandes invalides (hauteur en-tête, hauteur pied de page) : {clip_bands}")
+        
         self.merge_consecutive = merge_consecutive
+        self.merge_engine = merge_engine
         self.y_tolerance = y_tolerance
+        self.merge_gap = merge_gap
+        self.line_y_tolerance = line_y_tolerance
+        self.x_threshold = x_threshold
+        self.workers = max(1, workers)
+        self.columnar = columnar
+        self.dedup_images = dedup_images
+        self.images = images
+        self.image_writers = max(0, image_writers)
+        self.image_queue = image_queue
+        self._image_stores: Dict[str, ImageStore] = {}
+        self._image_writer: Optional[ImageWriter] = None
+        self.tables = tables
+        self.cache = ExtractionCache(cache_dir, cache_max_mb) if cache_dir else None
+        self.span_cache = SpanCache(span_cache_dir) if span_cache_dir else None
+        self._span_key: Optional[str] = None
+        self.clip_bands = clip_bands
+        self._bands: Optional[Tuple[float, float]] = None  # Bandes actives pour l'extraction en cours
+        self._pdf_hashes: Dict[Tuple[str, int, int], str] = {}
+        # Signatures du document en cours (formatage mémoïsé, sig_id)
+        self._signatures = SignatureRegistry()
+        # Session ouverte par open() : document, bandes et pages déjà traitées
+        self._session: Optional[Dict[str, Any]] = None
+        # Durées par étape de la page en cours de traitement (extraction_timings)
+        self._page_timings: Optional[Dict[str, float]] = None
         
         logger.info(f"Extracteur neutre initialisé")
         logger.info(f"  Fusion consécutifs : {merge_consecutive}")
+        if merge_consecutive and merge_engine != "python":
+            logger.info(f"  Moteur de fusion : {merge_engine}")
         logger.info(f"  Tolérance Y : {y_tolerance}px")
+        if (merge_gap, line_y_tolerance, x_threshold) != (MERGE_X_GAP, LINE_Y_TOLERANCE, X_THRESHOLD):
+            logger.info(f"  Écart fusion : {merge_gap}px, tolérance ligne : {line_y_tolerance}px, "
+                        f"seuil colonnes : {x_threshold}")
+        logger.info(f"  Workers : {self.workers}")
+        if columnar:
+            logger.info(f"  Stockage colonnaire : activé")
+        if images == "manifest":
+            logger.info(f"  Images : manifeste seul (pas de fichiers)")
+        else:
+            logger.info(f"  Déduplication images : {dedup_images}")
+        if self.image_writers:
+            logger.info(f"  Écriture images : {self.image_writers} threads (file max {image_queue})")
+        logger.info(f"  Détection tables : {tables}")
+        if self.cache is not None:
+            logger.info(f"  Cache : {cache_dir} (max {cache_max_mb:.0f} Mo)")
+        if self.span_cache is not None:
+            logger.info(f"  Cache des spans : {span_cache_dir}")
+        if clip_bands is not None:
+            logger.info(f"  Bandes en-tête / pied de page : {clip_bands}")
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """État transmis aux workers : sans les ressources propres au processus"""
+        state = self.__dict__.copy()
+        state["_image_stores"] = {}
+        state["_image_writer"] = None
+        state["cache"] = None
+        state["_session"] = None
+        return state
     
     def compute_signature(self, span: Dict[str, Any]) -> str:
         """
@@ -53,13 +192,20 @@ class NeutralExtractor:
             span: Span PyMuPDF
             
         Returns:
-            Signature sous forme "FontName_Size_Flags"
+            Signature sous forme "FontName_Size_Flags" (taille arrondie à 1 décimale)
         """
-        font = span.get("font", "Unknown")
-        size = round(span.get("size", 0), 1)  # Arrondi à 1 décimale
-        flags = span.get("flags", 0)
-        
-        return f"{font}_{size}_{flags}"
+        # Quelques dizaines de triplets par document : chaîne formatée une fois par triplet
+        return self._signatures.format(span.get("font", "Unknown"), span.get("size", 0),
+                                       span.get("flags", 0))
+    
+    def _signature_parts(self, signature: str) -> Tuple[str, float, int]:
+        """
+        (police, taille, flags) d'une signature, via le registre du document en cours
+
+        Transmis au stockage colonnaire et à l'encodeur v2, créés avant que
+        iter_elements n'ouvre le registre du document.
+        """
+        return self._signatures.parts(signature)
     
     def _extract_images(self, doc: fitz.Document, page_num: int, page: fitz.Page, 
                        output_base: str, image_counter: Dict[str, int]) -> List[Dict[str, Any]]:
@@ -79,35 +225,36 @@ class NeutralExtractor:
         images = []
         image_list = page.get_images(full=True)
         
-        # Créer le dossier images
-        images_dir = Path(output_base).parent / f"{Path(output_base).stem}_images"
-        images_dir.mkdir(parents=True, exist_ok=True)
+        # Positions de toutes les images de la page en une seule analyse du contenu
+        placements = self._image_placements(page) if image_list else {}
+        manifest = self.images == "manifest"
         
         for img_index, img_info in enumerate(image_list):
             try:
                 xref = img_info[0]
-                base_image = doc.extract_image(xref)
-                
-                if not base_image:
-                    continue
                 
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                
-                # Générer ID et nom de fichier
+                # Générer ID
                 if page_num not in image_counter:
                     image_counter[page_num] = 0
                 
                 image_id = f"p{page_num}_img{image_counter[page_num]}"
-                image_filename = f"{image_id}.{image_ext}"
-                image_path = images_dir / image_filename
                 
-                # Sauvegarder l'image
-                with open(image_path, "wb") as img_file:
-                    img_file.write(image_bytes)
+                if manifest:
+                    # Dimensions lues dans la liste des images : rien n'est décodé ni écrit
+                    stored = {"image_file": None, "format": None,
+                              "width": img_info[2], "height": img_info[3]}
+                else:
+                    # Sauvegarder l'image (une fois par contenu si déduplication)
+                    stored = self._store_image(doc, xref, image_id, output_base)
+                
+                if not stored:
+                    continue
                 
                 # Récupérer position sur la page
-                img_rects = page.get_image_rects(xref)
+                img_rects = placements.get(xref)
+                if img_rects is None:
+                    # Image non rattachée à son xref par get_image_info (ex. Form XObject)
+                    img_rects = page.get_image_rects(xref)
                 if img_rects:
                     rect = img_rects[0]  # Première occurrence
                     bbox = [rect.x0, rect.y0, rect.x1, rect.y1]
@@ -118,7 +265,7 @@ class NeutralExtractor:
                 image_elem = {
                     "type": "image",
                     "image_id": image_id,
-                    "image_file": f"{Path(output_base).stem}_images/{image_filename}",
+                    "image_file": stored["image_file"],
                     "page": page_num,
                     "position": {
                         "x": round(bbox[0], 2),
@@ -126,13 +273,26 @@ class NeutralExtractor:
                         "w": round(bbox[2] - bbox[0], 2),
                         "h": round(bbox[3] - bbox[1], 2)
                     },
-                    "format": image_ext,
+                    "format": stored["format"],
                     "size": {
-                        "width": base_image["width"],
-                        "height": base_image["height"]
+                        "width": stored["width"],
+                        "height": stored["height"]
                     },
                     "xref": xref
                 }
+                if "image_hash" in stored:
+                    image_elem["image_hash"] = stored["image_hash"]
+                if len(img_rects) > 1:
+                    # Image placée plusieurs fois sur la page : toutes les occurrences
+                    image_elem["placements"] = [
+                        {
+                            "x": round(r.x0, 2),
+                            "y": round(r.y0, 2),
+                            "w": round(r.x1 - r.x0, 2),
+                            "h": round(r.y1 - r.y0, 2)
+                        }
+                        for r in img_rects
+                    ]
                 
                 images.append(image_elem)
                 image_counter[page_num] += 1
@@ -142,7 +302,152 @@ class NeutralExtractor:
         
         return images
     
-    def _extract_tables(self, page: fitz.Page, page_num: int, table_counter: Dict[str, int]) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _image_placements(page: fitz.Page) -> Dict[int, List[fitz.Rect]]:
+        """
+        Positions de chaque image de la page, indexées par xref
+        
+        page.get_image_rects(xref) décode l'image (empreinte MD5) puis réanalyse
+        tout le contenu de la page à chaque appel ; get_image_info(xrefs=True)
+        relève toutes les occurrences en une passe.
+        
+        Returns:
+            {xref: [Rect, ...]} dans l'ordre du contenu de la page (images inline exclues)
+        """
+        placements: Dict[int, List[fitz.Rect]] = {}
+        for info in page.get_image_info(xrefs=True):
+            xref = info.get("xref", 0)
+            if xref:
+                placements.setdefault(xref, []).append(fitz.Rect(info["bbox"]))
+        return placements
+    
+    def _get_image_writer(self) -> ImageWriter:
+        """Writer d'images du processus courant (créé à la demande)"""
+        if self._image_writer is None:
+            self._image_writer = ImageWriter(self.image_writers, self.image_queue)
+        return self._image_writer
+    
+    def _close_image_writer(self) -> Dict[str, Any]:
+        """Vide la file d'écriture des images et retourne ses statistiques"""
+        if self._image_writer is None:
+            return {}
+        self._image_writer.close()
+        stats = self._image_writer.take_stats()
+        self._image_writer = None
+        # Les stores gardaient ce writer : les recréer avec le suivant
+        self._image_stores = {}
+        return stats
+    
+    def _flush_image_writer(self) -> Dict[str, Any]:
+        """Attend les écritures en attente sans fermer le writer ; retourne leurs statistiques"""
+        if self._image_writer is None:
+            return {}
+        self._image_writer.drain()
+        return self._image_writer.take_stats()
+    
+    def _store_image(self, doc: fitz.Document, xref: int, image_id: str,
+                     output_base: str) -> Optional[Dict[str, Any]]:
+        """
+        Écrit le fichier d'une image (une fois par contenu si déduplication)
+        
+        Returns:
+            {"image_file", "format", "width", "height"[, "image_hash"]} ou None si non extractible
+        """
+        if self.dedup_images:
+            return self._get_image_store(output_base).get(doc, xref)
+        
+        images_dir = Path(output_base).parent / f"{Path(output_base).stem}_images"
+        images_dir.mkdir(parents=True, exist_ok=True)
+        return self._save_image_occurrence(doc, xref, image_id, images_dir, Path(output_base).stem)
+    
+    def _get_image_store(self, output_base: str) -> ImageStore:
+        """Store d'images dédupliquées associé à un dossier de sortie"""
+        store = self._image_stores.get(output_base)
+        if store is None:
+            images_dir = Path(output_base).parent / f"{Path(output_base).stem}_images"
+            images_dir.mkdir(parents=True, exist_ok=True)
+            store = ImageStore(images_dir, f"{Path(output_base).stem}_images", self._get_image_writer())
+            self._image_stores[output_base] = store
+        return store
+    
+    def _save_image_occurrence(self, doc: fitz.Document, xref: int, image_id: str,
+                               images_dir: Path, stem: str) -> Optional[Dict[str, Any]]:
+        """
+        Sauvegarde une occurrence d'image sans déduplication (un fichier par occurrence)
+        
+        Returns:
+            {"image_file", "format", "width", "height"} ou None si non extractible
+        """
+        base_image = doc.extract_image(xref)
+        
+        if not base_image:
+            return None
+        
+        image_ext = base_image["ext"]
+        image_filename = f"{image_id}.{image_ext}"
+        
+        self._get_image_writer().submit(images_dir / image_filename, base_image["image"])
+        
+        return {
+            "image_file": f"{stem}_images/{image_filename}",
+            "format": image_ext,
+            "width": base_image["width"],
+            "height": base_image["height"]
+        }
+    
+    def _table_detection_decision(self, page: fitz.Page, page_num: int) -> Tuple[Dict[str, Any], Optional[list]]:
+        """
+        Décide si page.find_tables() vaut la peine d'être lancé sur la page
+        
+        Mode "auto" : find_tables (stratégie "lines") construit les cellules à
+        partir des traits vectoriels ; sans au moins 2 traits horizontaux et
+        2 verticaux, aucune table ne peut être trouvée. On compte donc les
+        segments horizontaux / verticaux des dessins (lignes, rectangles).
+        
+        Args:
+            page: Page PyMuPDF
+            page_num: Numéro de page (1-indexed)
+            
+        Returns:
+            (décision {"page", "run", ...}, dessins de la page réutilisables par find_tables ou None)
+        """
+        if self.tables == "always":
+            return {"page": page_num, "run": True}, None
+        if self.tables == "never":
+            return {"page": page_num, "run": False}, None
+        
+        drawings = page.get_drawings()
+        h_rulings = 0
+        v_rulings = 0
+        
+        for path in drawings:
+            for item in path["items"]:
+                kind = item[0]
+                if kind == "l":
+                    (x0, y0), (x1, y1) = item[1], item[2]
+                    if abs(y1 - y0) <= TABLE_SNAP_TOLERANCE and abs(x1 - x0) >= TABLE_EDGE_MIN_LENGTH:
+                        h_rulings += 1
+                    elif abs(x1 - x0) <= TABLE_SNAP_TOLERANCE and abs(y1 - y0) >= TABLE_EDGE_MIN_LENGTH:
+                        v_rulings += 1
+                elif kind in ("re", "qu"):
+                    # Un rectangle fournit 2 bords horizontaux et 2 verticaux
+                    rect = item[1].rect if kind == "qu" else item[1]
+                    if abs(rect[2] - rect[0]) >= TABLE_EDGE_MIN_LENGTH:
+                        h_rulings += 2
+                    if abs(rect[3] - rect[1]) >= TABLE_EDGE_MIN_LENGTH:
+                        v_rulings += 2
+        
+        decision = {
+            "page": page_num,
+            "run": h_rulings >= 2 and v_rulings >= 2,
+            "h_rulings": h_rulings,
+            "v_rulings": v_rulings
+        }
+        return decision, drawings
+    
+    def _extract_tables(self, page: fitz.Page, page_num: int, table_counter: Dict[str, int],
+                        paths: Optional[list] = None,
+                        text_blocks: Optional[list] = None) -> List[Dict[str, Any]]:
         """
         Extrait les tables d'une page avec structure matricielle
         
@@ -150,6 +455,9 @@ class NeutralExtractor:
             page: Page PyMuPDF
             page_num: Numéro de page (1-indexed)
             table_counter: Compteur global de tables par page
+            paths: Dessins de la page déjà extraits (page.get_drawings()), évite une seconde extraction
+            text_blocks: Blocs "dict" de la TextPage partagée de la page : texte des
+                cellules lu sans réinterpréter la page (sinon une requête par cellule)
             
         Returns:
             Liste d'éléments table avec structure matricielle
@@ -158,7 +466,14 @@ class NeutralExtractor:
         
         try:
             # Détection automatique des tables
-            found_tables = page.find_tables()
+            if paths is not None:
+                try:
+                    found_tables = page.find_tables(paths=paths)
+                except TypeError:
+                    # PyMuPDF sans paramètre paths
+                    found_tables = page.find_tables()
+            else:
+                found_tables = page.find_tables()
             
             if page_num not in table_counter:
                 table_counter[page_num] = 0
@@ -175,24 +490,28 @@ class NeutralExtractor:
                     rows_count = table.row_count
                     cols_count = table.col_count
                     
-                    # Structure matricielle
+                    # Structure matricielle (bbox None : cellule fusionnée avec une voisine)
                     cells_matrix = []
                     for row_idx in range(rows_count):
                         row_cells = []
+                        row_bboxes = table.rows[row_idx].cells
                         for col_idx in range(cols_count):
-                            cell = table.cell(row_idx, col_idx)
-                            cell_text = " ".join(cell) if isinstance(cell, list) else str(cell) if cell else ""
+                            cell_bbox = row_bboxes[col_idx] if col_idx < len(row_bboxes) else None
                             
-                            # Récupérer bbox de la cellule si possible
-                            try:
-                                cell_bbox = table.cell_bbox(row_idx, col_idx)
+                            if cell_bbox is not None:
+                                cell_rect = fitz.Rect(cell_bbox)
+                                if text_blocks is not None:
+                                    cell_text = self._text_in_rect(text_blocks, cell_rect)
+                                else:
+                                    cell_text = page.get_text("text", clip=cell_rect)
                                 cell_position = {
                                     "x": round(cell_bbox[0], 2),
                                     "y": round(cell_bbox[1], 2),
                                     "w": round(cell_bbox[2] - cell_bbox[0], 2),
                                     "h": round(cell_bbox[3] - cell_bbox[1], 2)
                                 }
-                            except:
+                            else:
+                                cell_text = ""
                                 cell_position = None
                             
                             cell_data = {
@@ -230,48 +549,33 @@ class NeutralExtractor:
         
         return tables
     
-    def extract_from_pdf(self, pdf_path: str, start_page: int = 1, end_page: Optional[int] = None) -> Dict[str, Any]:
+    def _extract_page_raw(self, doc: fitz.Document, page_index: int, output_base: str,
+                          page_stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
-        Extrait tous les éléments d'un PDF avec annotations de signature
+        Extrait les éléments bruts (texte, images, tables) d'une seule page
+        
+        Les ids ne sont pas attribués ici : ils dépendent des pages précédentes
+        et sont posés par l'appelant, dans l'ordre des pages.
         
         Args:
-            pdf_path: Chemin du PDF
-            start_page: Page de début (1-indexed)
-            end_page: Page de fin (1-indexed, None = jusqu'à la fin)
+            doc: Document PyMuPDF
+            page_index: Index de la page (0-indexed)
+            output_base: Chemin de base pour les images extraites
+            page_stats: Statistiques de la page (complétées : décision tables)
             
         Returns:
-            Dictionnaire avec éléments séquentiels et catalogue de signatures
+            Liste d'éléments bruts de la page, dans l'ordre d'extraction
         """
-        if not Path(pdf_path).exists():
-            raise FileNotFoundError(f"PDF non trouvé : {pdf_path}")
+        page = doc.load_page(page_index)
+        page_num_1indexed = page_index + 1
+        page_elements = []
         
-        logger.info(f"Ouverture du PDF : {pdf_path}")
-        
-        doc = fitz.open(pdf_path)
-        total_pages = len(doc)
-        
-        # Ajustement des limites
-        start_idx = start_page - 1  # PyMuPDF est 0-indexed
-        end_idx = (end_page if end_page else total_pages)
-        
-        logger.info(f"Extraction pages {start_page} à {end_idx} (sur {total_pages})")
-        
-        # Conteneurs
-        raw_elements = []
-        element_id = 0
-        image_counter = {}
-        table_counter = {}
-        
-        # Base du nom de fichier pour les images
-        output_base = pdf_path.replace('.pdf', '')
-        
-        # Extraction
-        for page_num in range(start_idx, end_idx):
-            page = doc.load_page(page_num)
-            page_num_1indexed = page_num + 1
+        with timed(self._page_timings, "get_text"):
+            # Une seule analyse du texte de la page, partagée par les spans et les cellules de tables
+            textpage, clip = self._page_textpage(page)
             
             # === EXTRACTION TEXTE ===
-            blocks = page.get_text("dict")["blocks"]
+            blocks = page.get_text("dict", textpage=textpage, clip=clip)["blocks"]
             
             for block in blocks:
                 if "lines" not in block:
@@ -290,7 +594,7 @@ class NeutralExtractor:
                         bbox = span["bbox"]
                         
                         element = {
-                            "id": element_id,
+                            "id": None,  # Attribué par l'appelant
                             "type": "text",
                             "page": page_num_1indexed,
                             "text": text,
@@ -303,78 +607,1102 @@ class NeutralExtractor:
                             }
                         }
                         
-                        raw_elements.append(element)
-                        element_id += 1
+                        page_elements.append(element)
+        
+        # === EXTRACTION IMAGES ===
+        with timed(self._page_timings, "images"):
+            page_elements.extend(self._extract_images(doc, page_num_1indexed, page, output_base, {}))
+        
+        # === EXTRACTION TABLES ===
+        with timed(self._page_timings, "tables"):
+            decision, drawings = self._table_detection_decision(page, page_num_1indexed)
+            if page_stats is not None:
+                page_stats["table_detection"] = decision
+            if decision["run"]:
+                page_elements.extend(self._extract_tables(page, page_num_1indexed, {}, paths=drawings,
+                                                          text_blocks=blocks))
+        
+        return page_elements
+    
+    def _page_textpage(self, page: fitz.Page) -> Tuple[fitz.TextPage, Optional[fitz.Rect]]:
+        """
+        Construit la TextPage de la page, réutilisée par toutes les requêtes texte
+        
+        La TextPage porte le découpage des bandes : un clip passé ensuite à
+        get_text(textpage=...) est ignoré par PyMuPDF. find_tables() construit
+        sa propre liste de caractères (boîtes de glyphes précises, autres options)
+        et ne peut pas la réutiliser.
+        
+        Returns:
+            (TextPage, zone de découpage ou None)
+        """
+        clip = None
+        if self._bands is not None:
+            # Les spans des bandes d'en-tête / pied de page ne sont jamais extraits
+            header, footer = self._bands
+            rect = page.rect
+            clip = fitz.Rect(rect.x0, rect.y0 + header, rect.x1, rect.y1 - footer)
+        return page.get_textpage(clip=clip, flags=TEXT_FLAGS), clip
+    
+    @staticmethod
+    def _text_in_rect(blocks: list, rect: fitz.Rect) -> str:
+        """
+        Texte des spans d'une zone, lu dans les blocs "dict" déjà extraits
+        
+        Un span appartient à la zone si le centre de sa boîte y est (même règle
+        que le découpage de MuPDF, au span près) ; lignes séparées par "\n".
+        """
+        lines = []
+        for block in blocks:
+            if "lines" not in block or not rect.intersects(block["bbox"]):
+                continue
+            for line in block["lines"]:
+                parts = []
+                for span in line["spans"]:
+                    x0, y0, x1, y1 = span["bbox"]
+                    if rect.contains(fitz.Point((x0 + x1) / 2, (y0 + y1) / 2)):
+                        parts.append(span["text"])
+                if parts:
+                    lines.append("".join(parts))
+        return "\n".join(lines)
+    
+    def _extract_page(self, doc: fitz.Document, page_index: int,
+                      output_base: str) -> Tuple[int, List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Extrait et post-traite une page complète (fusion, scripts, lignes)
+        
+        Toutes ces étapes sont locales à la page : une page peut donc être
+        traitée indépendamment des autres (worker, streaming).
+        
+        Args:
+            doc: Document PyMuPDF
+            page_index: Index de la page (0-indexed)
+            output_base: Chemin de base pour les images extraites
             
-            # === EXTRACTION IMAGES ===
-            images = self._extract_images(doc, page_num_1indexed, page, output_base, image_counter)
-            for img in images:
-                img["id"] = element_id
-                raw_elements.append(img)
-                element_id += 1
+        Returns:
+            (nombre d'éléments bruts, éléments finaux avec ids locaux à la page,
+             statistiques de la page, dont "timings" : durées par étape et "total")
+        """
+        page_stats = {"timings": {}}
+        self._page_timings = page_stats["timings"]
+        start = perf_counter()
+        try:
+            raw_elements = self._get_page_raw(doc, page_index, output_base, page_stats)
+            raw_count, elements = self.process_raw_page(raw_elements)
+        finally:
+            self._page_timings = None
+        page_stats["timings"]["total"] = perf_counter() - start
+        return raw_count, elements, page_stats
+    
+    def _prepare_bands(self, doc: fitz.Document, start_idx: int, end_idx: int) -> Optional[Dict[str, Any]]:
+        """
+        Fixe les bandes d'en-tête / pied de page de l'extraction en cours
+        
+        Un échantillon de pages est analysé en entier : en mode "auto" pour
+        apprendre les bandes, dans tous les cas pour compter les spans exclus
+        (le découpage lui-même ne les matérialise jamais).
+        
+        Args:
+            doc: Document PyMuPDF
+            start_idx: Première page (0-indexed, incluse)
+            end_idx: Dernière page (0-indexed, exclue)
             
-            # === EXTRACTION TABLES ===
-            tables = self._extract_tables(page, page_num_1indexed, table_counter)
-            for tbl in tables:
-                tbl["id"] = element_id
-                raw_elements.append(tbl)
-                element_id += 1
+        Returns:
+            Rapport pour metadata.clip_bands, ou None si désactivé
+        """
+        self._bands = None
+        if self.clip_bands is None or end_idx <= start_idx:
+            return None
         
-        doc.close()
+        sample_indices = pick_sample_pages(start_idx, end_idx, BAND_SAMPLE_PAGES)
+        samples = [self._sample_page_spans(doc.load_page(i)) for i in sample_indices]
+        
+        if self.clip_bands == "auto":
+            learned = learn_bands(samples)
+            header, footer = learned["header"], learned["footer"]
+        else:
+            header, footer = self.clip_bands
+        
+        if header or footer:
+            self._bands = (header, footer)
+        
+        dropped = count_band_spans(samples, header, footer)
+        sampled_total = dropped["header"] + dropped["footer"]
+        report = {
+            "mode": "auto" if self.clip_bands == "auto" else "config",
+            "header": header,
+            "footer": footer,
+            "sample_pages": [i + 1 for i in sample_indices],
+            "dropped_sample": dropped,
+            "dropped_estimate": round(sampled_total / len(samples) * (end_idx - start_idx))
+        }
+        
+        logger.info(f"Bandes exclues : en-tête {header}pt, pied de page {footer}pt "
+                    f"({dropped['header']} + {dropped['footer']} spans sur {len(samples)} pages échantillon, "
+                    f"~{report['dropped_estimate']} au total)")
+        return report
+    
+    def _sample_page_spans(self, page: fitz.Page) -> Tuple[float, List[Tuple[str, str, float, float]]]:
+        """Spans d'une page d'échantillon : (hauteur de page, [(signature, texte, y0, y1)])"""
+        spans = []
+        for block in page.get_text("dict", flags=TEXT_FLAGS)["blocks"]:
+            for line in block.get("lines", []):
+                for span in line["spans"]:
+                    if span["text"].strip():
+                        spans.append((self.compute_signature(span), span["text"],
+                                      span["bbox"][1] - page.rect.y0, span["bbox"][3] - page.rect.y0))
+        return page.rect.height, spans
+    
+    def _get_page_raw(self, doc: fitz.Document, page_index: int, output_base: str,
+                      page_stats: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Éléments bruts d'une page : depuis le cache des spans si possible, sinon depuis le PDF
         
-        total_texts = sum(1 for e in raw_elements if e.get("type") == "text")
-        total_images = sum(1 for e in raw_elements if e.get("type") == "image")
-        total_tables = sum(1 for e in raw_elements if e.get("type") == "table")
+        Args:
+            doc: Document PyMuPDF
+            page_index: Index de la page (0-indexed)
+            output_base: Chemin de base pour les images extraites
+            page_stats: Statistiques de la page (complétées)
+            
+        Returns:
+            Éléments bruts de la page, dans l'ordre d'extraction
+        """
+        raw_elements = None
+        
+        if self._span_key is not None:
+            with timed(self._page_timings, "span_cache"):
+                raw_elements = self._load_cached_page(page_index, output_base, page_stats)
+        
+        if raw_elements is None:
+            raw_elements = self._extract_page_raw(doc, page_index, output_base, page_stats)
+            if self._span_key is not None:
+                # Avant attribution des ids et post-traitement (qui modifient les éléments) ;
+                # les durées de ce run ne sont pas rejouées
+                cached_stats = {key: value for key, value in page_stats.items() if key != "timings"}
+                self.span_cache.store(self._span_key, page_index, raw_elements, cached_stats)
+                page_stats["span_cache"] = "miss"
+        
+        return raw_elements
+    
+    def process_raw_page(self, raw_elements: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Attribue les ids locaux puis post-traite les éléments bruts d'une page
         
-        logger.info(f"✓ {total_texts} éléments texte extraits")
-        logger.info(f"✓ {total_images} images extraites")
-        logger.info(f"✓ {total_tables} tables extraites")
+        Les éléments sont modifiés sur place : passer une copie pour rejouer
+        plusieurs fois les mêmes éléments bruts (ex. balayage de paramètres).
         
-        # Fusion optionnelle (seulement pour les textes)
-        if self.merge_consecutive:
-            text_elements = [e for e in raw_elements if e.get("type") == "text"]
-            non_text_elements = [e for e in raw_elements if e.get("type") != "text"]
+        Args:
+            raw_elements: Éléments bruts d'une seule page (ordre d'extraction)
             
-            merged_texts = self._merge_consecutive_elements(text_elements)
-            logger.info(f"✓ {len(merged_texts)} éléments texte après fusion")
+        Returns:
+            (nombre d'éléments bruts, éléments finaux avec ids locaux à la page)
+        """
+        # Ids locaux (0..n-1) : décalés ensuite par l'appelant pour devenir globaux
+        for local_id, elem in enumerate(raw_elements):
+            elem["id"] = local_id
+        
+        return len(raw_elements), self._process_page_elements(raw_elements)
+    
+    def iter_raw_pages(self, pdf_path: str, start_page: int = 1,
+                       end_page: Optional[int] = None) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Produit les éléments bruts de chaque page, avant tout post-traitement
+        
+        Utilise le cache des spans s'il est configuré (et l'alimente).
+        
+        Args:
+            pdf_path: Chemin du PDF
+            start_page: Page de début (1-indexed)
+            end_page: Page de fin (1-indexed, None = jusqu'à la fin)
+            
+        Yields:
+            (index de page 0-indexed, éléments bruts)
+        """
+        if not Path(pdf_path).exists():
+            raise FileNotFoundError(f"PDF non trouvé : {pdf_path}")
+        
+        doc = fitz.open(pdf_path)
+        output_base = pdf_path.replace('.pdf', '')
+        end_idx = end_page if end_page else len(doc)
+        
+        try:
+            self._prepare_bands(doc, start_page - 1, end_idx)
+            if self.span_cache is not None:
+                self._span_key = self._span_cache_key(pdf_path)
+            
+            for page_index in range(start_page - 1, end_idx):
+                yield page_index, self._get_page_raw(doc, page_index, output_base, {})
+        finally:
+            doc.close()
+            self._span_key = None
+            self._bands = None
+            self._close_image_writer()
+    
+    def _load_cached_page(self, page_index: int, output_base: str,
+                          page_stats: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Relit les éléments bruts d'une page depuis le cache des spans
+        
+        Args:
+            page_index: Index de la page (0-indexed)
+            output_base: Chemin de base des images extraites
+            page_stats: Statistiques de la page (complétées avec celles du cache)
+            
+        Returns:
+            Éléments bruts, ou None si la page doit être extraite du PDF
+        """
+        cached = self.span_cache.load(self._span_key, page_index)
+        if cached is None:
+            return None
+        
+        # Les fichiers image référencés doivent toujours exister
+        output_dir = Path(output_base).parent
+        for elem in cached["elements"]:
+            if (elem.get("type") == "image" and elem["image_file"] is not None
+                    and not (output_dir / elem["image_file"]).exists()):
+                return None
+        
+        page_stats.update(cached["page_stats"])
+        page_stats["span_cache"] = "hit"
+        return cached["elements"]
+    
+    def _process_page_elements(self, raw_elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Post-traitement des éléments bruts d'une page
+        
+        Args:
+            raw_elements: Éléments bruts d'une seule page
             
-            # Recombiner
-            elements = merged_texts + non_text_elements
+        Returns:
+            Éléments fusionnés, triés et annotés (métadonnées de ligne)
+        """
+        # Fusion optionnelle (seulement pour les textes)
+        if self.merge_consecutive:
+            with timed(self._page_timings, "merge"):
+                text_elements = [e for e in raw_elements if e.get("type") == "text"]
+                non_text_elements = [e for e in raw_elements if e.get("type") != "text"]
+                
+                # Recombiner
+                elements = self._merge_consecutive_elements(text_elements) + non_text_elements
         else:
             elements = raw_elements
         
-        # Tri par page puis position Y pour respecter l'ordre de lecture
-        elements.sort(key=lambda e: (e["page"], e["position"]["y"]))
+        with timed(self._page_timings, "lines"):
+            # Tri par position Y pour respecter l'ordre de lecture
+            elements.sort(key=lambda e: e["position"]["y"])
+        
+        # Rattacher les scripts (super et subscripts) à leur ligne AVANT le groupement
+        with timed(self._page_timings, "scripts"):
+            elements = self._attach_scripts_to_lines(elements)
         
         # Ajout métadonnées de ligne
-        elements = self._add_line_metadata(elements)
-        logger.info(f"✓ Métadonnées de ligne ajoutées")
+        with timed(self._page_timings, "lines"):
+            return self._add_line_metadata(elements)
+    
+    def _iter_pages(self, doc: fitz.Document, pdf_path: str, start_idx: int, end_idx: int,
+                    output_base: str) -> Iterator[Tuple[int, List[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Produit les pages extraites et post-traitées, dans l'ordre des pages
         
-        # Génération du catalogue (seulement pour textes)
-        text_elements_final = [e for e in elements if e.get("type") == "text"]
-        catalog = self._build_signature_catalog(text_elements_final)
+        Avec workers > 1, les pages sont réparties sur un pool de processus ;
+        chaque worker ouvre son propre fitz.Document.
         
-        # Structure finale
-        result = {
-            "metadata": {
+        Args:
+            doc: Document PyMuPDF déjà ouvert (mode séquentiel)
+            pdf_path: Chemin du PDF (réouvert par chaque worker)
+            start_idx: Première page (0-indexed, incluse)
+            end_idx: Dernière page (0-indexed, exclue)
+            output_base: Chemin de base pour les images extraites
+            
+        Yields:
+            (nombre d'éléments bruts, éléments finaux de la page, statistiques de la page)
+        """
+        page_indices = range(start_idx, end_idx)
+        
+        if self.workers <= 1 or len(page_indices) <= 1:
+            for page_index in page_indices:
+                yield self._extract_page(doc, page_index, output_base)
+            return
+        
+        # Plusieurs petits lots par worker pour équilibrer la charge
+        chunksize = max(1, len(page_indices) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_init_page_worker,
+                                 initargs=(self, pdf_path)) as pool:
+            # map() restitue les résultats dans l'ordre des pages
+            yield from pool.map(_extract_page_in_worker, page_indices,
+                                repeat(output_base), chunksize=chunksize)
+    
+    # === Session (document ouvert, pages mémoïsées) ===
+    
+    def open(self, pdf_path: str) -> "NeutralExtractor":
+        """
+        Ouvre une session sur un PDF : document gardé ouvert, pages mémoïsées
+        
+        Chaque page n'est extraite et post-traitée qu'une fois (extract_page,
+        iter_pages) ; extract_from_pdf, iter_elements et extract_to_ndjson
+        réutilisent les pages déjà traitées de ce PDF. Les bandes d'en-tête /
+        pied de page sont fixées à l'ouverture, sur tout le document.
+        Les pages mémoïsées correspondent aux paramètres courants de
+        l'extracteur : rouvrir la session après les avoir modifiés.
+        
+        Usage :
+            with NeutralExtractor().open("document.pdf") as extractor:
+                elements = extractor.extract_page(12)
+        
+        Args:
+            pdf_path: Chemin du PDF
+            
+        Returns:
+            L'extracteur lui-même (gestionnaire de contexte)
+        """
+        if not Path(pdf_path).exists():
+            raise FileNotFoundError(f"PDF non trouvé : {pdf_path}")
+        
+        self.close()
+        doc = fitz.open(pdf_path)
+        try:
+            bands_report = self._prepare_bands(doc, 0, len(doc))
+            bands = self._bands
+            # Clé calculée avec les bandes de la session (les spans découpés en dépendent)
+            span_key = self._span_cache_key(pdf_path) if self.span_cache is not None else None
+        except Exception:
+            doc.close()
+            raise
+        finally:
+            self._bands = None
+        
+        self._session = {
+            "pdf_path": pdf_path,
+            "resolved": Path(pdf_path).resolve(),
+            "doc": doc,
+            "output_base": pdf_path.replace('.pdf', ''),
+            "bands": bands,
+            "bands_report": bands_report,
+            "span_key": span_key,
+            # index de page (0-indexed) → (nombre d'éléments bruts, éléments, statistiques)
+            "pages": {},
+            # Écritures d'images de toutes les pages calculées dans la session
+            "image_writes": {"files": 0, "bytes": 0, "write_seconds": 0.0, "errors": 0}
+        }
+        self._image_stores = {}
+        logger.info(f"Session ouverte : {pdf_path} ({len(doc)} pages)")
+        return self
+    
+    def close(self):
+        """Ferme la session : document fermé, pages mémoïsées libérées"""
+        if self._session is None:
+            return
+        self._session["doc"].close()
+        self._session = None
+        self._close_image_writer()
+    
+    def __enter__(self) -> "NeutralExtractor":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def extract_page(self, page: int) -> List[Dict[str, Any]]:
+        """
+        Éléments finaux d'une page de la session (calculés au premier appel)
+        
+        Les ids sont locaux à la page (rang du span brut dans la page) et les
+        éléments n'ont pas de sig_id (attribués par document). La liste
+        renvoyée est celle de la mémoïsation : la copier avant de la modifier.
+        
+        Args:
+            page: Numéro de page (1-indexed)
+            
+        Returns:
+            Éléments fusionnés, triés, avec métadonnées de ligne
+        """
+        session = self._require_session()
+        total_pages = len(session["doc"])
+        if not 1 <= page <= total_pages:
+            raise ValueError(f"Page hors du document ({total_pages} pages) : {page}")
+        
+        if page - 1 not in session["pages"]:
+            self._compute_session_pages(page - 1, page)
+        return session["pages"][page - 1][1]
+    
+    def iter_pages(self, start_page: int = 1,
+                   end_page: Optional[int] = None) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Parcourt les pages de la session, chacune calculée à la demande
+        
+        Args:
+            start_page: Page de début (1-indexed)
+            end_page: Page de fin (1-indexed, None = jusqu'à la fin)
+            
+        Yields:
+            (numéro de page 1-indexed, éléments de extract_page)
+        """
+        session = self._require_session()
+        end_page = end_page if end_page else len(session["doc"])
+        for page in range(start_page, end_page + 1):
+            yield page, self.extract_page(page)
+    
+    def _require_session(self) -> Dict[str, Any]:
+        if self._session is None:
+            raise RuntimeError("Aucune session ouverte : utiliser extractor.open(pdf_path)")
+        return self._session
+    
+    def _session_for(self, pdf_path: str) -> Optional[Dict[str, Any]]:
+        """Session ouverte sur ce PDF, ou None"""
+        if self._session is not None and Path(pdf_path).resolve() == self._session["resolved"]:
+            return self._session
+        return None
+    
+    def _session_results(self, start_idx: int,
+                         end_idx: int) -> Iterator[Tuple[int, List[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Résultats de pages de la session (comme _iter_pages), calculés si absents
+        
+        Chaque plage de pages manquantes est traitée d'un bloc par _iter_pages
+        (réparti sur les workers si configuré).
+        
+        Args:
+            start_idx: Première page (0-indexed, incluse)
+            end_idx: Dernière page (0-indexed, exclue)
+        """
+        pages = self._session["pages"]
+        for page_index in range(start_idx, end_idx):
+            if page_index not in pages:
+                stop = page_index + 1
+                while stop < end_idx and stop not in pages:
+                    stop += 1
+                self._compute_session_pages(page_index, stop)
+            yield pages[page_index]
+    
+    def _compute_session_pages(self, start_idx: int, end_idx: int):
+        """
+        Extrait et mémoïse une plage de pages de la session
+        
+        Le writer d'images reste ouvert jusqu'à close() (les stores dédupliqués
+        en dépendent) : ses écritures sont seulement attendues, et cumulées
+        dans session["image_writes"].
+        """
+        session = self._session
+        image_writes = session["image_writes"]
+        self._bands = session["bands"]
+        self._span_key = session["span_key"]
+        try:
+            results = self._iter_pages(session["doc"], session["pdf_path"], start_idx, end_idx,
+                                       session["output_base"])
+            for page_index, result in zip(range(start_idx, end_idx), results):
+                # Écritures comptées une seule fois, pas à chaque relecture de la page
+                self._add_write_stats(image_writes, result[2].pop("image_writes", {}))
+                session["pages"][page_index] = result
+        finally:
+            self._bands = None
+            self._span_key = None
+            self._add_write_stats(image_writes, self._flush_image_writer())
+    
+    def iter_elements(self, pdf_path: str, start_page: int = 1, end_page: Optional[int] = None,
+                      summary: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Extrait les éléments d'un PDF page par page (générateur)
+        
+        Les éléments sont produits dans l'ordre final, dès qu'une page est
+        traitée : la mémoire reste bornée à environ une page. Dans une session
+        ouverte sur ce PDF (open), les pages déjà traitées sont réutilisées
+        (copies des éléments mémoïsés).
+        
+        Args:
+            pdf_path: Chemin du PDF
+            start_page: Page de début (1-indexed)
+            end_page: Page de fin (1-indexed, None = jusqu'à la fin)
+            summary: Dictionnaire optionnel rempli avec "metadata" (dès l'ouverture,
+                     complété en fin d'extraction), "signature_catalog", "signature_table",
+                     "line_table" et "page_index"
+            
+        Yields:
+            Éléments finaux (ids globaux, métadonnées de ligne)
+        """
+        if not Path(pdf_path).exists():
+            raise FileNotFoundError(f"PDF non trouvé : {pdf_path}")
+        
+        session = self._session_for(pdf_path)
+        if session is None:
+            logger.info(f"Ouverture du PDF : {pdf_path}")
+            doc = fitz.open(pdf_path)
+        else:
+            doc = session["doc"]
+        total_pages = len(doc)
+        
+        # Ajustement des limites
+        start_idx = start_page - 1  # PyMuPDF est 0-indexed
+        end_idx = (end_page if end_page else total_pages)
+        
+        logger.info(f"Extraction pages {start_page} à {end_idx} (sur {total_pages})")
+        if self.workers > 1:
+            logger.info(f"  Répartition sur {self.workers} processus")
+        
+        extraction_date = datetime.now().isoformat()
+        if summary is not None:
+            # Métadonnées connues avant extraction (en-tête NDJSON)
+            summary["metadata"] = {
+                "source": pdf_path,
+                "extraction_date": extraction_date,
+                "extractor": "neutral_extractor",
+                "version": EXTRACTOR_VERSION,
+                "pages_extracted": f"{start_page}-{end_idx}",
+                "merge_consecutive": self.merge_consecutive,
+                "line_metadata": True
+            }
+        
+        # Compteurs
+        element_id = 0
+        total_elements = 0
+        total_raw_texts = 0
+        total_merged_texts = 0
+        total_texts = 0
+        total_images = 0
+        total_tables = 0
+        superscript_adjusted = 0
+        subscript_adjusted = 0
+        signatures = SignatureAccumulator()
+        self._signatures = SignatureRegistry()
+        line_table = LineTableBuilder()
+        page_index = PageIndexBuilder()
+        image_files = set()
+        image_writes = {"files": 0, "bytes": 0, "write_seconds": 0.0, "errors": 0}
+        table_decisions = []
+        timings = TimingsBuilder()
+        page_number = start_idx
+        if session is None:
+            self._image_stores = {}
+        
+        # Base du nom de fichier pour les images
+        output_base = pdf_path.replace('.pdf', '')
+        
+        span_cache_hits = 0
+        span_cache_misses = 0
+        
+        try:
+            if session is None:
+                with timed(timings.document if self.clip_bands is not None else None, "clip_bands"):
+                    bands_report = self._prepare_bands(doc, start_idx, end_idx)
+                if self.span_cache is not None:
+                    self._span_key = self._span_cache_key(pdf_path)
+                page_results = self._iter_pages(doc, pdf_path, start_idx, end_idx, output_base)
+            else:
+                bands_report = session["bands_report"]
+                page_results = self._session_results(start_idx, end_idx)
+            
+            for raw_count, page_elements, page_stats in page_results:
+                self._add_write_stats(image_writes, page_stats.get("image_writes", {}))
+                if "table_detection" in page_stats:
+                    table_decisions.append(page_stats["table_detection"])
+                if page_stats.get("span_cache") == "hit":
+                    span_cache_hits += 1
+                elif page_stats.get("span_cache") == "miss":
+                    span_cache_misses += 1
+                page_number += 1
+                
+                # Catalogue (seulement pour textes)
+                with timed(timings.document, "catalog"):
+                    for elem in page_elements:
+                        if elem.get("type") == "text":
+                            signatures.add(elem)
+                
+                page_images = 0
+                page_tables = 0
+                for elem in page_elements:
+                    if session is not None:
+                        # Les éléments mémoïsés gardent leurs ids locaux
+                        elem = dict(elem)
+                    
+                    # Ids locaux à la page → ids globaux
+                    elem["id"] += element_id
+                    
+                    elem_type = elem.get("type")
+                    if elem_type == "image":
+                        total_images += 1
+                        page_images += 1
+                        if elem["image_file"] is not None:
+                            image_files.add(elem["image_file"])
+                    elif elem_type == "table":
+                        total_tables += 1
+                        page_tables += 1
+                    else:
+                        total_raw_texts += elem.get("_merged_count", 1)
+                        total_merged_texts += 1
+                        superscript_adjusted += 1 if elem.get("_superscript_adjusted") else 0
+                        subscript_adjusted += 1 if elem.get("_subscript_adjusted") else 0
+                    
+                    if elem_type == "text":
+                        total_texts += 1
+                    self._signatures.assign(elem)
+                    
+                    line_table.add(elem)
+                    page_index.add(elem)
+                    total_elements += 1
+                    yield elem
+                
+                element_id += raw_count
+                timings.add_page(page_number, page_stats.get("timings", {}), page_images, page_tables)
+        finally:
+            if session is None:
+                doc.close()
+            self._span_key = None
+            self._bands = None
+            if session is None:
+                # Les images en attente sont écrites avant de rendre la main
+                self._add_write_stats(image_writes, self._close_image_writer())
+            else:
+                # Session : écritures déjà attendues, totaux de la session
+                image_writes = dict(session["image_writes"])
+        
+        logger.info(f"✓ {total_raw_texts} éléments texte extraits")
+        if self.images == "manifest":
+            logger.info(f"✓ {total_images} images relevées (manifeste, aucun fichier écrit)")
+        else:
+            logger.info(f"✓ {total_images} images extraites ({len(image_files)} fichiers)")
+        image_writes["write_seconds"] = round(image_writes["write_seconds"], 3)
+        image_writes["mb_per_s"] = (round(image_writes["bytes"] / 1e6 / image_writes["write_seconds"], 1)
+                                    if image_writes["write_seconds"] > 0 else None)
+        image_writes["writers"] = self.image_writers
+        if image_writes["files"]:
+            # Débit indisponible (None) si la durée d'écriture arrondie est nulle
+            rate = image_writes["mb_per_s"]
+            logger.info(f"✓ {image_writes['files']} fichiers image écrits "
+                        f"({image_writes['bytes'] / 1e6:.1f} Mo, "
+                        f"{'n/a' if rate is None else rate} Mo/s)")
+        pages_scanned = sum(1 for d in table_decisions if d["run"])
+        logger.info(f"✓ {total_tables} tables extraites "
+                    f"(détection sur {pages_scanned}/{len(table_decisions)} pages, mode {self.tables})")
+        if self.merge_consecutive:
+            logger.info(f"✓ {total_merged_texts} éléments texte après fusion")
+        if superscript_adjusted > 0:
+            logger.info(f"✓ {superscript_adjusted} exposants (superscripts) rattachés à leur ligne")
+        if subscript_adjusted > 0:
+            logger.info(f"✓ {subscript_adjusted} indices (subscripts) rattachés à leur ligne")
+        logger.info(f"✓ Métadonnées de ligne ajoutées")
+        if self.span_cache is not None:
+            logger.info(f"✓ Cache des spans : {span_cache_hits} pages rejouées, "
+                        f"{span_cache_misses} pages analysées")
+        
+        if summary is not None:
+            summary["metadata"] = {
                 "source": pdf_path,
-                "extraction_date": datetime.now().isoformat(),
+                "extraction_date": extraction_date,
                 "extractor": "neutral_extractor",
-                "version": "1.5",
-                "total_elements": len(elements),
-                "total_texts": len(text_elements_final),
+                "version": EXTRACTOR_VERSION,
+                "total_elements": total_elements,
+                "total_texts": total_texts,
                 "total_images": total_images,
                 "total_tables": total_tables,
                 "pages_extracted": f"{start_page}-{end_idx}",
                 "merge_consecutive": self.merge_consecutive,
-                "line_metadata": True
-            },
-            "signature_catalog": catalog,
-            "elements": elements
+                "line_metadata": True,
+                "image_dedup": self.dedup_images,
+                "total_image_files": len(image_files),
+                "image_writes": image_writes,
+                "table_detection": {
+                    "mode": self.tables,
+                    "pages_scanned": pages_scanned,
+                    "pages_skipped": len(table_decisions) - pages_scanned,
+                    "pages": table_decisions
+                }
+            }
+            if self.span_cache is not None:
+                summary["metadata"]["span_cache"] = {"hits": span_cache_hits, "misses": span_cache_misses}
+            if bands_report is not None:
+                summary["metadata"]["clip_bands"] = bands_report
+            if self.images == "manifest":
+                summary["metadata"]["images"] = "manifest"
+            with timed(timings.document, "catalog"):
+                summary["signature_catalog"] = signatures.catalog()
+            summary["metadata"]["timings"] = timings.result()
+            summary["signature_table"] = self._signatures.table()
+            summary["line_table"] = line_table.rows
+            summary["page_index"] = page_index.result()
+    
+    @staticmethod
+    def _add_write_stats(total: Dict[str, Any], stats: Dict[str, Any]):
+        """Cumule des statistiques d'écriture d'images"""
+        for key in ("files", "bytes", "write_seconds", "errors"):
+            total[key] += stats.get(key, 0)
+    
+    def extract_from_pdf(self, pdf_path: str, start_page: int = 1, end_page: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Extrait tous les éléments d'un PDF avec annotations de signature
+        
+        Args:
+            pdf_path: Chemin du PDF
+            start_page: Page de début (1-indexed)
+            end_page: Page de fin (1-indexed, None = jusqu'à la fin)
+            
+        Returns:
+            Dictionnaire avec éléments séquentiels et catalogue de signatures
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key, cache_info = self._cache_key(pdf_path, start_page, end_page)
+            cached = self._load_cached_result(cache_key, pdf_path)
+            if cached is not None:
+                return cached
+        
+        summary = {}
+        if self.columnar:
+            elements = ColumnarElementStore(signature_parts=self._signature_parts)
+            elements.extend(self.iter_elements(pdf_path, start_page, end_page, summary))
+            logger.info(f"✓ Stockage colonnaire : {elements.memory_bytes() / 1e6:.1f} Mo de colonnes "
+                        f"({len(elements.signatures)} signatures, {len(elements.line_ids)} lignes)")
+        else:
+            elements = list(self.iter_elements(pdf_path, start_page, end_page, summary))
+        
+        # Structure finale
+        result = {
+            "metadata": summary["metadata"],
+            "signature_catalog": summary["signature_catalog"],
+            "signature_table": summary["signature_table"],
+            "elements": elements,
+            "line_table": summary["line_table"],
+            "page_index": summary["page_index"]
         }
         
+        if cache_key is not None:
+            self.cache.put(cache_key, result, cache_info, default=json_default)
+            logger.info(f"✓ Résultat mis en cache ({cache_key})")
+        
         return result
     
+    def update_pages(self, data: Dict[str, Any], pdf_path: str, pages: List[int]) -> Dict[str, Any]:
+        """
+        Ré-extrait quelques pages et les insère dans un résultat existant
+        
+        Les éléments des pages indiquées sont remplacés ; les ids des pages
+        suivantes sont décalés pour rester identiques à ceux d'une extraction
+        complète (id = rang du span brut dans le document). Le catalogue des
+        signatures, la table des lignes et les totaux sont recalculés ;
+        metadata.timings décrit cette mise à jour (pages ré-extraites).
+        
+        Décalage par page : base = plus petit id de la page, nombre d'éléments
+        bruts = max(id + _merged_count) - base (un élément fusionné couvre
+        _merged_count ids consécutifs).
+        
+        Args:
+            data: Résultat existant (extract_from_pdf ou neutral.json relu)
+            pdf_path: Chemin du PDF (corrigé)
+            pages: Numéros des pages à ré-extraire (1-indexed)
+            
+        Returns:
+            Nouveau résultat complet
+        """
+        if not Path(pdf_path).exists():
+            raise FileNotFoundError(f"PDF non trouvé : {pdf_path}")
+        
+        pages = sorted(set(pages))
+        logger.info(f"Mise à jour de {len(pages)} pages : {_format_page_list(pages)}")
+        
+        # === Éléments existants, par page ===
+        old_pages: Dict[int, List[Dict[str, Any]]] = {}
+        for elem in data["elements"]:
+            old_pages.setdefault(elem["page"], []).append(elem)
+        
+        old_ranges = {}  # page → (base, nombre d'éléments bruts)
+        for page, page_elements in old_pages.items():
+            base = min(e["id"] for e in page_elements)
+            end = max(e["id"] + e.get("_merged_count", 1) for e in page_elements)
+            old_ranges[page] = (base, end - base)
+        
+        # === Ré-extraction des pages demandées (ids locaux) ===
+        doc = fitz.open(pdf_path)
+        total_pages = len(doc)
+        invalid = [p for p in pages if not 1 <= p <= total_pages]
+        if invalid:
+            doc.close()
+            raise ValueError(f"Pages hors du document ({total_pages} pages) : {invalid}")
+        
+        output_base = pdf_path.replace('.pdf', '')
+        self._image_stores = {}
+        timings = TimingsBuilder()
+        
+        new_pages: Dict[int, Tuple[int, List[Dict[str, Any]], Dict[str, Any]]] = {}
+        try:
+            # Mêmes bandes que l'extraction d'origine
+            previous_bands = data["metadata"].get("clip_bands")
+            if previous_bands is not None:
+                self._bands = (previous_bands["header"], previous_bands["footer"])
+                if not any(self._bands):
+                    self._bands = None
+            elif self.clip_bands is not None:
+                logger.warning("Résultat existant extrait sans bandes : --clip-bands ignoré pour la mise à jour")
+            if self.span_cache is not None:
+                self._span_key = self._span_cache_key(pdf_path)
+            
+            for first, last in _page_runs(pages):
+                page_results = self._iter_pages(doc, pdf_path, first - 1, last, output_base)
+                for page, result in zip(range(first, last + 1), page_results):
+                    new_pages[page] = result
+        finally:
+            doc.close()
+            self._span_key = None
+            self._bands = None
+            self._close_image_writer()
+        
+        # === Assemblage, ids renumérotés ===
+        elements = []
+        next_id = min((base for base, _ in old_ranges.values()), default=0)
+        for page in sorted(set(old_pages) | set(new_pages)):
+            if page in new_pages:
+                raw_count, page_elements, _ = new_pages[page]
+                shift = next_id
+            else:
+                page_elements = old_pages[page]
+                base, raw_count = old_ranges[page]
+                shift = next_id - base
+            
+            for elem in page_elements:
+                elem["id"] += shift
+                elements.append(elem)
+            next_id += raw_count
+        
+        # === Catalogue, table des signatures et des lignes, totaux ===
+        signatures = SignatureAccumulator()
+        # sig_id réattribués : une page ré-extraite peut introduire une signature
+        registry = SignatureRegistry()
+        total_texts = 0
+        total_images = 0
+        total_tables = 0
+        image_files = set()
+        with timed(timings.document, "catalog"):
+            for elem in elements:
+                elem_type = elem.get("type")
+                registry.assign(elem)
+                if elem_type == "text":
+                    total_texts += 1
+                    signatures.add(elem)
+                elif elem_type == "image":
+                    total_images += 1
+                    if elem["image_file"] is not None:
+                        image_files.add(elem["image_file"])
+                elif elem_type == "table":
+                    total_tables += 1
+            catalog = signatures.catalog()
+        
+        for page, (_, page_elements, page_stats) in sorted(new_pages.items()):
+            timings.add_page(page, page_stats.get("timings", {}),
+                             sum(1 for e in page_elements if e.get("type") == "image"),
+                             sum(1 for e in page_elements if e.get("type") == "table"))
+        
+        metadata = dict(data["metadata"])
+        all_pages = sorted(set(old_pages) | set(new_pages))
+        metadata.update({
+            "source": pdf_path,
+            "total_elements": len(elements),
+            "total_texts": total_texts,
+            "total_images": total_images,
+            "total_tables": total_tables,
+            "total_image_files": len(image_files)
+        })
+        if all_pages:
+            metadata["pages_extracted"] = f"{all_pages[0]}-{all_pages[-1]}"
+        
+        detection = metadata.get("table_detection")
+        if detection is not None:
+            decisions = {d["page"]: d for d in detection["pages"]}
+            for page, (_, _, page_stats) in new_pages.items():
+                if "table_detection" in page_stats:
+                    decisions[page] = page_stats["table_detection"]
+            scanned = sum(1 for d in decisions.values() if d["run"])
+            metadata["table_detection"] = {
+                **detection,
+                "pages_scanned": scanned,
+                "pages_skipped": len(decisions) - scanned,
+                "pages": [decisions[p] for p in sorted(decisions)]
+            }
+        
+        metadata["updates"] = metadata.get("updates", []) + [{
+            "date": datetime.now().isoformat(),
+            "pages": _format_page_list(pages)
+        }]
+        metadata["timings"] = timings.result()
+        
+        logger.info(f"✓ {len(new_pages)} pages ré-extraites, {len(elements)} éléments au total")
+        
+        if self.columnar:
+            store = ColumnarElementStore(signature_parts=registry.parts)
+            store.extend(elements)
+            elements = store
+        
+        return {
+            "metadata": metadata,
+            "signature_catalog": catalog,
+            "signature_table": registry.table(),
+            "elements": elements,
+            "line_table": build_line_table(elements),
+            "page_index": build_page_index(elements)
+        }
+    
+    def export_images(self, data: Dict[str, Any], pdf_path: Optional[str] = None,
+                      pages: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Écrit les fichiers des images d'un manifeste (extraction avec images="manifest")
+        
+        Les éléments image sans fichier (image_file à None) des pages demandées
+        sont complétés sur place : image_file, format (et image_hash avec
+        déduplication), exactement comme lors d'une extraction avec export.
+        
+        Args:
+            data: Résultat d'extraction (ou sortie d'une passe du pipeline)
+            pdf_path: Chemin du PDF (défaut : metadata.source)
+            pages: Numéros des pages à traiter (1-indexed, None = toutes)
+        
+        Returns:
+            {"exported", "failed", "remaining", "image_writes"}
+        """
+        pdf_path = pdf_path or data.get("metadata", {}).get("source")
+        if not pdf_path or not Path(pdf_path).exists():
+            raise FileNotFoundError(f"PDF non trouvé : {pdf_path}")
+        
+        # Pages demandées : découpage par page_index plutôt que parcours complet
+        candidates = pages_slice(data, pages) if pages else data["elements"]
+        pending = [
+            elem for elem in candidates
+            if elem.get("type") == "image" and elem.get("image_file") is None
+        ]
+        
+        output_base = pdf_path.replace('.pdf', '')
+        self._image_stores = {}
+        exported = 0
+        failed = 0
+        
+        doc = fitz.open(pdf_path)
+        try:
+            for elem in pending:
+                try:
+                    stored = self._store_image(doc, elem["xref"], elem["image_id"], output_base)
+                except Exception as e:
+                    logger.warning(f"Erreur export image {elem['image_id']} : {e}")
+                    stored = None
+                if not stored:
+                    failed += 1
+                    continue
+                elem["image_file"] = stored["image_file"]
+                elem["format"] = stored["format"]
+                if "image_hash" in stored:
+                    elem["image_hash"] = stored["image_hash"]
+                exported += 1
+        finally:
+            doc.close()
+            image_writes = self._close_image_writer()
+        
+        remaining = sum(1 for e in data["elements"]
+                        if e.get("type") == "image" and e.get("image_file") is None)
+        
+        metadata = data.get("metadata")
+        if metadata is not None:
+            metadata["total_image_files"] = len({e["image_file"] for e in data["elements"]
+                                                 if e.get("type") == "image" and e.get("image_file")})
+            if remaining:
+                metadata["images"] = "manifest"
+            else:
+                metadata.pop("images", None)
+        
+        logger.info(f"✓ {exported} images exportées ({image_writes.get('files', 0)} fichiers écrits), "
+                    f"{remaining} restent au manifeste")
+        return {
+            "exported": exported,
+            "failed": failed,
+            "remaining": remaining,
+            "image_writes": image_writes
+        }
+
+    def _cache_key(self, pdf_path: str, start_page: int,
+                   end_page: Optional[int]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Clé de cache d'une extraction : contenu du PDF + paramètres influant sur le résultat
+        
+        Returns:
+            (clé, informations descriptives de l'entrée)
+        """
+        if not Path(pdf_path).exists():
+            raise FileNotFoundError(f"PDF non trouvé : {pdf_path}")
+        
+        params = {
+            "version": EXTRACTOR_VERSION,
+            "merge_consecutive": self.merge_consecutive,
+            "y_tolerance": self.y_tolerance,
+            "merge_gap": self.merge_gap,
+            "line_y_tolerance": self.line_y_tolerance,
+            "x_threshold": self.x_threshold,
+            "clip_bands": list(self.clip_bands) if isinstance(self.clip_bands, tuple) else self.clip_bands,
+            "start_page": start_page,
+            "end_page": end_page,
+            "tables": self.tables,
+            "dedup_images": self.dedup_images,
+            "images": self.images,
+            # Les chemins d'images enregistrés dépendent du nom du PDF
+            "images_dir": f"{Path(pdf_path.replace('.pdf', '')).stem}_images"
+        }
+        key = ExtractionCache.make_key(self._pdf_hash(pdf_path), params)
+        return key, {"source": pdf_path, "params": params}
+    
+    def _span_cache_key(self, pdf_path: str) -> str:
+        """
+        Clé du cache des spans : contenu du PDF + paramètres de l'extraction brute
+        
+        La fusion, la tolérance Y et la plage de pages n'en font pas partie :
+        elles n'agissent qu'après l'extraction brute de chaque page.
+        """
+        params = {
+            "span_cache_format": SPAN_CACHE_FORMAT,
+            "version": EXTRACTOR_VERSION,
+            "bands": list(self._bands) if self._bands else None,
+            "tables": self.tables,
+            "dedup_images": self.dedup_images,
+            "images": self.images,
+            "images_dir": f"{Path(pdf_path.replace('.pdf', '')).stem}_images"
+        }
+        key = ExtractionCache.make_key(self._pdf_hash(pdf_path), params)
+        self.span_cache.register(key, {"source": pdf_path, "params": params})
+        return key
+    
+    def _pdf_hash(self, pdf_path: str) -> str:
+        """Empreinte du contenu d'un PDF (mémorisée tant que le fichier ne change pas)"""
+        stat = Path(pdf_path).stat()
+        memo_key = (str(Path(pdf_path).resolve()), stat.st_size, stat.st_mtime_ns)
+        digest = self._pdf_hashes.get(memo_key)
+        if digest is None:
+            digest = self._pdf_hashes[memo_key] = file_sha256(pdf_path)
+        return digest
+    
+    def _load_cached_result(self, cache_key: str, pdf_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Relit un résultat en cache (sans ouvrir le PDF)
+        
+        Returns:
+            Résultat au format de extract_from_pdf, ou None si absent ou
+            si des fichiers image référencés ont disparu
+        """
+        data = self.cache.get(cache_key)
+        if data is None:
+            logger.info(f"Cache : pas d'entrée pour {pdf_path}")
+            return None
+        
+        # Les images sont écrites à côté du PDF : toutes doivent encore exister
+        pdf_dir = Path(pdf_path).parent
+        for elem in data["elements"]:
+            if (elem.get("type") == "image" and elem["image_file"] is not None
+                    and not (pdf_dir / elem["image_file"]).exists()):
+                logger.info(f"Cache : image manquante ({elem['image_file']}), nouvelle extraction")
+                return None
+        
+        data["metadata"]["source"] = pdf_path
+        logger.info(f"✓ Résultat relu depuis le cache ({cache_key}) : "
+                    f"{data['metadata']['total_elements']} éléments")
+        
+        if self.columnar:
+            elements = ColumnarElementStore()
+            elements.extend(data["elements"])
+            data["elements"] = elements
+        
+        return data
+    
     def _merge_consecutive_elements(self, elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Fusionne les éléments consécutifs de même signature
@@ -394,6 +1722,13 @@ class NeutralExtractor:
         if not elements:
             return elements
         
+        if self.merge_engine == "numpy":
+            # Mêmes critères évalués en masques NumPy (vector_merge.py) ; dicts construits ici
+            runs = merge_runs(elements, self.y_tolerance, self.merge_gap)
+            if len(runs) == len(elements):
+                return list(elements)
+            return [self._create_merged_element(elements[start:end]) for start, end in runs]
+        
         merged = []
         current_group = [elements[0]]
         
@@ -448,8 +1783,8 @@ class NeutralExtractor:
         x2_start = elem2["position"]["x"]
         gap = x2_start - x1_end
         
-        # Tolérance : jusqu'à ~50px (espace entre mots/colonnes)
-        if gap > 50:
+        # Tolérance : jusqu'à ~50px par défaut (espace entre mots/colonnes)
+        if gap > self.merge_gap:
             return False
         
         return True
@@ -513,9 +1848,8 @@ class NeutralExtractor:
         text = elem.get("text", "")
         h = elem["position"]["h"]
         
-        # Parse size from signature
-        sig_parts = elem.get("signature", "_0_").split("_")
-        size = float(sig_parts[1]) if len(sig_parts) > 1 else 0
+        # Taille de la signature (découpée une fois par signature du document)
+        size = self._signatures.parts(elem["signature"])[1] if "signature" in elem else 0
         
         # Unicode subscripts (₀₁₂₃₄₅₆₇₈₉₊₋₌₍₎ₐₑₒₓ etc.)
         SUBSCRIPT_CHARS = (
@@ -565,6 +1899,9 @@ class NeutralExtractor:
         - Caractères Unicode subscript/superscript (₀₁₂ ou ⁰¹²)
         - Hauteur < 9px OU taille de police < 7.0
         
+        Recherche des lignes candidates : index Y trié par page (bisect),
+        seuls les textes dans la fenêtre ±SCRIPT_Y_WINDOW sont examinés.
+        
         Args:
             elements: Liste d'éléments
             
@@ -610,6 +1947,11 @@ class NeutralExtractor:
                 else:
                     normal_text.append(elem)
             
+            # Index spatial de la page : textes normaux triés par Y
+            # (leur Y n'est jamais modifié ici, l'index reste valide)
+            text_order = sorted(range(len(normal_text)), key=lambda i: normal_text[i]["position"]["y"])
+            text_ys = [normal_text[i]["position"]["y"] for i in text_order]
+            
             # Rattacher chaque script à sa ligne de texte
             for small in small_elements:
                 small_y = small["position"]["y"]
@@ -623,7 +1965,13 @@ class NeutralExtractor:
                 min_distance = float('inf')
                 script_type = type_hint  # Utiliser le hint si déjà connu
                 
-                for text_elem in normal_text:
+                # Candidats : fenêtre Y couvrant tous les cas (±8px Unicode, +2/-6px classique)
+                lo = bisect_left(text_ys, small_y - SCRIPT_Y_WINDOW)
+                hi = bisect_right(text_ys, small_y + SCRIPT_Y_WINDOW)
+                
+                # Parcours dans l'ordre d'origine : départage des égalités inchangé
+                for text_idx in sorted(text_order[lo:hi]):
+                    text_elem = normal_text[text_idx]
                     text_y = text_elem["position"]["y"]
                     text_x = text_elem["position"]["x"]
                     
@@ -684,9 +2032,9 @@ class NeutralExtractor:
             result.extend(non_text)
         
         if superscript_adjusted > 0:
-            logger.info(f"✓ {superscript_adjusted} exposants (superscripts) rattachés à leur ligne")
+            logger.debug(f"✓ {superscript_adjusted} exposants (superscripts) rattachés à leur ligne")
         if subscript_adjusted > 0:
-            logger.info(f"✓ {subscript_adjusted} indices (subscripts) rattachés à leur ligne")
+            logger.debug(f"✓ {subscript_adjusted} indices (subscripts) rattachés à leur ligne")
         
         return result
     
@@ -695,12 +2043,13 @@ class NeutralExtractor:
         Ajoute les métadonnées de ligne à chaque élément
         
         Ordre de lecture : Colonne GAUCHE d'abord (haut→bas), puis Colonne DROITE (haut→bas)
+        Les scripts doivent déjà être rattachés à leur ligne (_attach_scripts_to_lines).
         
         Métadonnées ajoutées :
         - line_id: Format "p{page}_L{num}" (ex: "p4_L0")
         - line_num: Compteur global par page (0, 1, 2...)
         - line_start: True si premier élément de la ligne
-        - line_position: "left" (X < 305) ou "right" (X >= 305)
+        - line_position: "left" (X < x_threshold, 305 par défaut) ou "right"
         
         Args:
             elements: Liste d'éléments
@@ -708,11 +2057,8 @@ class NeutralExtractor:
         Returns:
             Liste d'éléments avec métadonnées de ligne (ordre : gauche puis droite)
         """
-        # ÉTAPE 0 : Rattacher les scripts (super et subscripts) à leur ligne AVANT le groupement
-        elements = self._attach_scripts_to_lines(elements)
-        
-        LINE_Y_TOLERANCE = 0.3  # Tolérance stricte pour grouper sur même ligne
-        X_THRESHOLD = 305       # Seuil gauche/droite
+        line_y_tolerance = self.line_y_tolerance  # Tolérance stricte pour grouper sur même ligne
+        x_threshold = self.x_threshold            # Seuil gauche/droite
         
         # Grouper par page
         by_page = {}
@@ -728,13 +2074,13 @@ class NeutralExtractor:
             page_elements = by_page[page]
             
             # ÉTAPE 1 : Séparer par colonne
-            left_elements = [e for e in page_elements if e["position"]["x"] < X_THRESHOLD]
-            right_elements = [e for e in page_elements if e["position"]["x"] >= X_THRESHOLD]
+            left_elements = [e for e in page_elements if e["position"]["x"] < x_threshold]
+            right_elements = [e for e in page_elements if e["position"]["x"] >= x_threshold]
             
             line_counter = 0  # Compteur global pour la page
             
             # ÉTAPE 2 : Traiter COLONNE GAUCHE d'abord
-            left_lines = self._group_by_line(left_elements, LINE_Y_TOLERANCE)
+            left_lines = self._group_by_line(left_elements, line_y_tolerance)
             for line in left_lines:
                 # Trier éléments par X (gauche → droite)
                 line.sort(key=lambda e: e["position"]["x"])
@@ -750,7 +2096,7 @@ class NeutralExtractor:
                 line_counter += 1
             
             # ÉTAPE 3 : Traiter COLONNE DROITE ensuite (compteur continue)
-            right_lines = self._group_by_line(right_elements, LINE_Y_TOLERANCE)
+            right_lines = self._group_by_line(right_elements, line_y_tolerance)
             for line in right_lines:
                 # Trier éléments par X (gauche → droite)
                 line.sort(key=lambda e: e["position"]["x"])
@@ -771,6 +2117,11 @@ class NeutralExtractor:
         """
         Groupe les éléments par ligne (Y similaire)
         
+        Chaque élément rejoint la première ligne créée dont le Y de référence
+        (Y du premier élément de la ligne) est à ±y_tolerance. Les Y de référence
+        sont tenus triés : la recherche est un bisect sur la fenêtre de tolérance
+        au lieu d'un parcours de toutes les lignes déjà ouvertes.
+        
         Args:
             elements: Liste d'éléments
             y_tolerance: Tolérance Y pour considérer même ligne
@@ -779,20 +2130,30 @@ class NeutralExtractor:
             Liste de lignes (chaque ligne = liste d'éléments), triée par Y
         """
         lines = []
+        anchor_ys = []      # Y de référence des lignes, triés
+        anchor_lines = []   # Index (ordre de création) de la ligne correspondante
+        
+        # Fenêtre de bisect légèrement élargie ; le test exact reste abs(dy) <= tolérance
+        window = y_tolerance + 1e-6
         
         for elem in elements:
             y = elem["position"]["y"]
             
-            # Trouver ligne existante
-            found = False
-            for line in lines:
-                line_y = line[0]["position"]["y"]
-                if abs(y - line_y) <= y_tolerance:
-                    line.append(elem)
-                    found = True
-                    break
+            # Trouver la ligne existante créée en premier parmi les candidates
+            lo = bisect_left(anchor_ys, y - window)
+            hi = bisect_right(anchor_ys, y + window)
+            target = None
+            for k in range(lo, hi):
+                if abs(y - anchor_ys[k]) <= y_tolerance:
+                    if target is None or anchor_lines[k] < target:
+                        target = anchor_lines[k]
             
-            if not found:
+            if target is not None:
+                lines[target].append(elem)
+            else:
+                pos = bisect_right(anchor_ys, y)
+                anchor_ys.insert(pos, y)
+                anchor_lines.insert(pos, len(lines))
                 lines.append([elem])
         
         # Trier lignes par Y (haut → bas)
@@ -800,71 +2161,99 @@ class NeutralExtractor:
         
         return lines
     
-    def _build_signature_catalog(self, elements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def save_to_json(self, data: Dict[str, Any], output_path: str, compact: bool = False,
+                     schema: int = 1, slowest: int = SLOWEST_PAGES):
         """
-        Construit le catalogue des signatures utilisées
+        Sauvegarde les données (JSON, ou MessagePack / NDJSON selon l'extension)
         
         Args:
-            elements: Liste d'éléments
-            
-        Returns:
-            Dictionnaire signature → détails
-        """
-        # Comptage
-        signature_counts = Counter(elem["signature"] for elem in elements)
-        
-        # Analyse de chaque signature
-        catalog = {}
-        
-        for signature in signature_counts:
-            # Parse signature
-            parts = signature.split("_")
-            font = parts[0] if len(parts) > 0 else "Unknown"
-            size = float(parts[1]) if len(parts) > 1 else 0
-            flags = int(parts[2]) if len(parts) > 2 else 0
-            
-            # Récupération exemples
-            examples = [
-                elem["text"][:50] for elem in elements 
-                if elem["signature"] == signature
-            ][:3]  # 3 premiers exemples
-            
-            catalog[signature] = {
-                "font": font,
-                "size": size,
-                "flags": flags,
-                "count": signature_counts[signature],
-                "examples": examples
-            }
+            data: Données à sauvegarder
+            output_path: Chemin de sortie
+            compact: JSON sans indentation
+            schema: Schéma des éléments écrits (1 historique, 2 compact : element_schema.py)
+            slowest: Nombre de pages les plus lentes listées dans le rapport
+        """
+        output = to_v2(data) if schema == SCHEMA_VERSION else data
+        # default : sérialisation des vues du stockage colonnaire
+        save_data(output_path, output, compact=compact, default=json_default)
         
-        # Tri par fréquence décroissante
-        catalog = dict(sorted(catalog.items(), key=lambda x: x[1]["count"], reverse=True))
+        logger.info(f"✓ Données sauvegardées : {output_path}")
         
-        return catalog
+        # Rapport
+        self._print_report(data, slowest)
     
-    def save_to_json(self, data: Dict[str, Any], output_path: str):
+    def extract_to_ndjson(self, pdf_path: str, output_path: str, start_page: int = 1,
+                          end_page: Optional[int] = None, schema: int = 1) -> Dict[str, Any]:
         """
-        Sauvegarde les données en JSON
+        Extrait un PDF et écrit les éléments en NDJSON au fil de l'eau
+        
+        Format (une ligne JSON par enregistrement) :
+        - 1re ligne : {"record": "metadata", "metadata": {...}}
+        - puis un élément par ligne, page par page
+        - dernière ligne : {"record": "summary", "metadata": {...}, "signature_catalog": {...},
+          "signature_table": [...], "line_table": [...], "page_index": {...}} (+ "fonts" au schéma 2)
         
         Args:
-            data: Données à sauvegarder
-            output_path: Chemin de sortie
+            pdf_path: Chemin du PDF
+            output_path: Chemin de sortie (.ndjson, .ndjson.gz, .ndjson.zst)
+            start_page: Page de début (1-indexed)
+            end_page: Page de fin (1-indexed, None = jusqu'à la fin)
+            schema: Schéma des éléments écrits (1 historique, 2 compact, converti à la volée)
+            
+        Returns:
+            Résumé {"metadata", "signature_catalog", "signature_table", "line_table", "page_index"}
+            (sans les éléments)
         """
         # Création du dossier si nécessaire
         output_dir = Path(output_path).parent
         if output_dir != Path('.'):
             output_dir.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        summary = {}
+        elements = self.iter_elements(pdf_path, start_page, end_page, summary)
+        # Schéma 2 : polices et lignes internées au fil des éléments
+        encoder = V2Encoder(self._signature_parts) if schema == SCHEMA_VERSION else None
+        
+        def metadata_record() -> Dict[str, Any]:
+            if encoder is None:
+                return summary["metadata"]
+            return {**summary["metadata"], "schema": SCHEMA_VERSION}
+        
+        # .ndjson.gz / .ndjson.zst : compression à la volée
+        with open_stream(output_path, 'wt') as f:
+            # La première page ouvre le PDF et remplit les métadonnées d'en-tête
+            first = next(elements, None)
+            header = {"record": "metadata", "metadata": metadata_record()}
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            
+            if first is not None:
+                for elem in chain([first], elements):
+                    if encoder is not None:
+                        elem = encoder.element(elem)
+                    f.write(json.dumps(elem, ensure_ascii=False) + "\n")
+            
+            footer = {
+                "record": "summary",
+                "metadata": metadata_record(),
+                "signature_catalog": summary["signature_catalog"],
+                "signature_table": summary["signature_table"],
+                "line_table": summary["line_table"],
+                "page_index": summary["page_index"]
+            }
+            if encoder is not None:
+                if footer["line_table"] is not None:
+                    footer["line_table"] = [encoder.line_row(row) for row in footer["line_table"]]
+                footer["fonts"] = encoder.fonts
+                if encoder.line_names:
+                    footer["line_names"] = {str(key): name for key, name in encoder.line_names.items()}
+            f.write(json.dumps(footer, ensure_ascii=False) + "\n")
         
         logger.info(f"✓ Données sauvegardées : {output_path}")
         
-        # Rapport
-        self._print_report(data)
+        return summary
     
-    def _print_report(self, data: Dict[str, Any]):
-        """Affiche un rapport d'extraction"""
+    def _print_report(self, data: Dict[str, Any], slowest: int = SLOWEST_PAGES):
+        """Affiche un rapport d'extraction (slowest : pages les plus lentes listées)"""
         metadata = data["metadata"]
         catalog = data["signature_catalog"]
         elements = data["elements"]
@@ -881,6 +2270,13 @@ class NeutralExtractor:
         print(f"📑 Pages extraites : {metadata['pages_extracted']}")
         print(f"🔀 Fusion activée : {metadata['merge_consecutive']}")
         print(f"📏 Métadonnées ligne : {metadata.get('line_metadata', False)}")
+        bands = metadata.get('clip_bands')
+        if bands:
+            dropped = bands['dropped_sample']
+            print(f"✂️  Bandes exclues ({bands['mode']}) : en-tête {bands['header']}pt, "
+                  f"pied de page {bands['footer']}pt")
+            print(f"   Spans exclus : {dropped['header']} en-tête + {dropped['footer']} pied de page "
+                  f"sur {len(bands['sample_pages'])} pages échantillon (~{bands['dropped_estimate']} au total)")
         
         print(f"\n🔤 SIGNATURES TYPOGRAPHIQUES DÉTECTÉES : {len(catalog)}")
         print(f"\n   Top 10 par fréquence :")
@@ -889,8 +2285,8 @@ class NeutralExtractor:
             print(f"   {i:2}. {sig}")
             print(f"       Count: {details['count']:4} ({percentage:5.1f}%) | Exemples: {details['examples'][0][:40]}...")
         
-        # Stats de ligne
-        if metadata.get('line_metadata'):
+        # Stats de ligne (indisponibles en mode NDJSON : éléments non conservés)
+        if metadata.get('line_metadata') and elements:
             left_count = sum(1 for e in elements if e.get('line_position') == 'left')
             right_count = sum(1 for e in elements if e.get('line_position') == 'right')
             line_starts = sum(1 for e in elements if e.get('line_start'))
@@ -911,15 +2307,122 @@ class NeutralExtractor:
             print(f"\n🖼️  IMAGES :")
             print(f"   Dossier : {images_dir}")
             print(f"   Nombre : {metadata['total_images']}")
+            if 'total_image_files' in metadata:
+                print(f"   Fichiers uniques : {metadata['total_image_files']}")
+            if metadata.get('images') == 'manifest':
+                print(f"   Manifeste seul : fichiers à écrire avec export_images.py")
+            writes = metadata.get('image_writes')
+            if writes and writes.get('files'):
+                rate = writes.get('mb_per_s')
+                print(f"   Écrits : {writes['files']} fichiers, {writes['bytes'] / 1e6:.1f} Mo "
+                      f"({'n/a' if rate is None else rate} Mo/s, {writes['writers']} threads)")
         
         # Stats tables
-        if metadata.get('total_tables', 0) > 0:
+        detection = metadata.get('table_detection')
+        if metadata.get('total_tables', 0) > 0 or (detection and detection['mode'] == 'auto'):
             print(f"\n📋 TABLES :")
             print(f"   Nombre : {metadata['total_tables']}")
+            if detection:
+                print(f"   Détection ({detection['mode']}) : {detection['pages_scanned']} pages analysées, "
+                      f"{detection['pages_skipped']} ignorées")
+        
+        # Durées par étape et pages les plus lentes
+        timings = metadata.get('timings')
+        if timings:
+            stages = timings['stages']
+            staged = sum(stages.values()) or 1
+            print(f"\n⏱️  DURÉES : {timings['wall_seconds']:.2f}s au total")
+            for stage, seconds in stages.items():
+                print(f"   {stage:<10} : {seconds:7.3f}s ({seconds / staged * 100:5.1f}%)")
+            
+            pages = slowest_pages(timings, slowest)
+            if pages:
+                print(f"\n   Pages les plus lentes :")
+                for entry in pages:
+                    page_stages = entry['stages']
+                    main_stage = max(page_stages, key=page_stages.get) if page_stages else None
+                    detail = f" | {main_stage} {page_stages[main_stage]:.3f}s" if main_stage else ""
+                    print(f"   p{entry['page']:<4} {entry['seconds']:7.3f}s | "
+                          f"{entry['images']} images, {entry['tables']} tables{detail}")
         
         print("\n" + "="*70)
 
 
+def parse_page_list(text: str) -> List[int]:
+    """
+    Convertit une liste de pages "5,10-12" en numéros de pages
+    
+    Returns:
+        Numéros de pages triés, sans doublon
+    """
+    pages = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            pages.update(range(int(first), int(last) + 1))
+        else:
+            pages.add(int(part))
+    return sorted(pages)
+
+
+def _parse_clip_bands(text: Optional[str]) -> Any:
+    """Option --clip-bands : None, "auto" ou (hauteur en-tête, hauteur pied de page)"""
+    if not text:
+        return None
+    if text == "auto":
+        return "auto"
+    parts = text.split(",")
+    if len(parts) != 2:
+        raise ValueError(f"--clip-bands attend \"auto\" ou \"HAUT,BAS\" : {text}")
+    return float(parts[0]), float(parts[1])
+
+
+def _page_runs(pages: List[int]) -> List[Tuple[int, int]]:
+    """Regroupe des numéros de pages triés en plages contiguës (première, dernière)"""
+    runs = []
+    for page in pages:
+        if runs and page == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+
+def _format_page_list(pages: List[int]) -> str:
+    """Forme compacte d'une liste de pages : "5,10-12" """
+    return ",".join(str(first) if first == last else f"{first}-{last}" for first, last in _page_runs(pages))
+
+
+# === WORKERS (extraction parallèle) ===
+# État propre à chaque processus du pool : extracteur + document ouvert une seule fois
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_page_worker(extractor: NeutralExtractor, pdf_path: str):
+    """Initialise un worker : ouvre son propre fitz.Document"""
+    logger.setLevel(logging.WARNING)
+    _worker_state["extractor"] = extractor
+    _worker_state["doc"] = fitz.open(pdf_path)
+
+
+def _extract_page_in_worker(page_index: int,
+                            output_base: str) -> Tuple[int, List[Dict[str, Any]], Dict[str, Any]]:
+    """Extrait et post-traite une page dans un worker du pool"""
+    extractor = _worker_state["extractor"]
+    raw_count, elements, page_stats = extractor._extract_page(_worker_state["doc"], page_index, output_base)
+    
+    # Le processus worker peut s'arrêter sans attendre ses threads :
+    # les images de la page sont écrites avant de rendre le résultat
+    if extractor._image_writer is not None:
+        extractor._image_writer.drain()
+        page_stats["image_writes"] = extractor._image_writer.take_stats()
+    
+    return raw_count, elements, page_stats
+
+
 def main():
     """Point d'entrée CLI"""
     import argparse
@@ -933,22 +2436,108 @@ def main():
     parser.add_argument('-e', '--end-page', type=int, help='Page de fin (défaut: toutes)')
     parser.add_argument('--no-merge', action='store_true', help='Désactiver la fusion des consécutifs')
     parser.add_argument('--y-tolerance', type=float, default=3.0, help='Tolérance Y pour fusion (défaut: 3.0)')
+    parser.add_argument('--merge-engine', choices=list(MERGE_ENGINES), default='python',
+                        help='Moteur de fusion : python (paire par paire) ou numpy (masques vectorisés, '
+                             'même résultat) (défaut: python)')
+    parser.add_argument('--merge-gap', type=float, default=MERGE_X_GAP,
+                        help=f'Saut horizontal maximal entre spans fusionnés (défaut: {MERGE_X_GAP:g})')
+    parser.add_argument('--line-y-tolerance', type=float, default=LINE_Y_TOLERANCE,
+                        help=f'Tolérance Y du groupement en lignes (défaut: {LINE_Y_TOLERANCE:g})')
+    parser.add_argument('--x-threshold', type=float, default=X_THRESHOLD,
+                        help=f'Seuil colonne gauche/droite (défaut: {X_THRESHOLD:g})')
+    parser.add_argument('--workers', type=int, default=1, help='Nombre de processus pour l\'extraction des pages (défaut: 1)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='Stockage colonnaire des éléments en mémoire (NumPy requis)')
+    parser.add_argument('--no-image-dedup', action='store_true',
+                        help='Écrire un fichier par occurrence d\'image (pas de déduplication)')
+    parser.add_argument('--images', choices=list(IMAGE_MODES), default='export',
+                        help='Images : export (fichiers écrits) ou manifest (positions seules, '
+                             'fichiers écrits plus tard par export_images.py) (défaut: export)')
+    parser.add_argument('--image-writers', type=int, default=0,
+                        help='Threads d\'écriture des images en arrière-plan (défaut: 0 = synchrone)')
+    parser.add_argument('--image-queue', type=int, default=64,
+                        help='Nombre maximal d\'images en attente d\'écriture (défaut: 64)')
+    parser.add_argument('--tables', choices=['auto', 'always', 'never'], default='always',
+                        help='Détection des tables : auto (pages avec traits de tableau), always, never (défaut: always)')
+    parser.add_argument('--cache-dir', help='Dossier du cache des résultats (défaut: pas de cache)')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_MB,
+                        help=f'Taille maximale du cache en Mo (défaut: {DEFAULT_MAX_MB})')
+    parser.add_argument('--span-cache-dir',
+                        help='Dossier du cache des spans bruts (rejoue fusion/lignes sans analyser le PDF)')
+    parser.add_argument('--update', metavar='EXISTANT',
+                        help='Résultat existant (JSON) dans lequel insérer les pages ré-extraites')
+    parser.add_argument('--pages', help='Pages à ré-extraire avec --update, ex. "5,10-12" (défaut: -s/-e)')
+    parser.add_argument('--clip-bands', metavar='auto|HAUT,BAS',
+                        help='Exclure les bandes d\'en-tête / pied de page : "auto" (apprises) '
+                             'ou hauteurs en points, ex. "40,36" (défaut: désactivé)')
+    parser.add_argument('--compact', action='store_true',
+                        help='JSON de sortie sans indentation (plus petit, plus rapide à relire)')
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json',
+                        help='Format de sortie : json (document complet) ou ndjson (flux page par page)')
+    parser.add_argument('--schema', choices=['v1', 'v2'], default='v1',
+                        help='Schéma des éléments : v1 (historique) ou v2 (compact : polices internées, '
+                             'bbox [x,y,w,h], lignes entières ; relu par toutes les passes) (défaut: v1)')
+    
+    parser.add_argument('--slowest-pages', type=int, default=SLOWEST_PAGES,
+                        help=f'Pages les plus lentes listées dans le rapport (défaut: {SLOWEST_PAGES})')
     
     args = parser.parse_args()
+    schema = int(args.schema[1:])
     
     try:
         extractor = NeutralExtractor(
             merge_consecutive=not args.no_merge,
-            y_tolerance=args.y_tolerance
+            y_tolerance=args.y_tolerance,
+            merge_gap=args.merge_gap,
+            line_y_tolerance=args.line_y_tolerance,
+            x_threshold=args.x_threshold,
+            workers=args.workers,
+            columnar=args.columnar,
+            dedup_images=not args.no_image_dedup,
+            images=args.images,
+            image_writers=args.image_writers,
+            image_queue=args.image_queue,
+            tables=args.tables,
+            cache_dir=args.cache_dir,
+            cache_max_mb=args.cache_max_mb,
+            span_cache_dir=args.span_cache_dir,
+            clip_bands=_parse_clip_bands(args.clip_bands),
+            merge_engine=args.merge_engine
         )
         
+        if args.update:
+            existing = load_data(args.update)
+            if args.pages:
+                pages = parse_page_list(args.pages)
+            elif args.end_page:
+                pages = list(range(args.start_page, args.end_page + 1))
+            else:
+                parser.error("--update nécessite --pages ou -s/-e")
+            
+            data = extractor.update_pages(existing, args.input, pages)
+            extractor.save_to_json(data, args.output, compact=args.compact, schema=schema,
+                                   slowest=args.slowest_pages)
+            return 0
+        
+        if args.format == 'ndjson':
+            summary = extractor.extract_to_ndjson(
+                pdf_path=args.input,
+                output_path=args.output,
+                start_page=args.start_page,
+                end_page=args.end_page,
+                schema=schema
+            )
+            extractor._print_report({**summary, "elements": []}, args.slowest_pages)
+            return 0
+        
         data = extractor.extract_from_pdf(
             pdf_path=args.input,
             start_page=args.start_page,
             end_page=args.end_page
         )
         
-        extractor.save_to_json(data, args.output)
+        extractor.save_to_json(data, args.output, compact=args.compact, schema=schema,
+                               slowest=args.slowest_pages)
         
         return 0
         
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Bandes d'en-tête / pied de page, apprises sur un échantillon de pages
+
+Un en-tête (ou pied de page) courant se répète d'une page à l'autre :
+même signature, même position Y, même texte aux numéros près
+("Diabetologia (2025) 68 (Suppl 1):S12" → "... S#", un numéro de page seul
+"12" → "#"). Les spans répétés
+dans le haut (resp. le bas) de la page définissent la bande ; la limite
+est placée juste après la bande (BAND_MARGIN), jamais au-delà de la
+mi-distance avec le premier texte de contenu. Seules les pages de
+l'échantillon sont examinées : la limite suit donc la bande au plus près,
+le contenu d'une autre page peut descendre (ou monter) jusqu'à elle.
+
+Aucune bande n'est retenue si un texte non répété la chevauche sur une
+des pages de l'échantillon : le découpage ne doit jamais retirer de contenu.
+"""
+
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Part de la hauteur de page où chercher en-têtes / pieds de page
+BAND_ZONE = 0.15
+# Part minimale des pages de l'échantillon où un span doit se répéter
+BAND_MIN_SHARE = 0.5
+# Marge (pt) entre le bord de la bande et la limite de découpage
+BAND_MARGIN = 2.0
+
+# Span d'échantillon : (signature, texte, y0, y1)
+SampleSpan = Tuple[str, str, float, float]
+
+_DIGITS = re.compile(r"\d+")
+
+
+def _span_key(signature: str, text: str, y: float) -> Tuple[str, int, str]:
+    """
+    Clé de répétition : signature, Y arrondi, texte sans les nombres
+
+    Les nombres seuls (numéro de page en pied de page) gardent une clé : s'ils
+    se répètent aussi dans le contenu, sur une grille de lignes régulière, le
+    contrôle par page de learn_bands les y laisse (contenu avant le bord).
+    """
+    return signature, round(y), _DIGITS.sub("#", text.strip())
+
+
+def pick_sample_pages(start_idx: int, end_idx: int, count: int) -> List[int]:
+    """
+    Index de pages répartis uniformément sur la plage
+
+    Args:
+        start_idx: Première page (0-indexed, incluse)
+        end_idx: Dernière page (0-indexed, exclue)
+        count: Nombre maximal de pages
+
+    Returns:
+        Index de pages triés, sans doublon
+    """
+    total = end_idx - start_idx
+    if total <= count:
+        return list(range(start_idx, end_idx))
+    step = total / count
+    return sorted({start_idx + int(i * step) for i in range(count)})
+
+
+def learn_bands(samples: List[Tuple[float, List[SampleSpan]]]) -> Dict[str, float]:
+    """
+    Déduit les hauteurs des bandes d'en-tête et de pied de page
+
+    Args:
+        samples: Pour chaque page de l'échantillon : (hauteur de page, spans)
+
+    Returns:
+        {"header": hauteur depuis le haut, "footer": hauteur depuis le bas} (0 = pas de bande)
+    """
+    if not samples:
+        return {"header": 0.0, "footer": 0.0}
+
+    min_pages = max(2, math.ceil(BAND_MIN_SHARE * len(samples)))
+
+    # Comptage des clés répétées (une fois par page)
+    top_counts: Dict[Tuple, int] = {}
+    bottom_counts: Dict[Tuple, int] = {}
+    for height, spans in samples:
+        top_keys = set()
+        bottom_keys = set()
+        for signature, text, y0, y1 in spans:
+            if y1 <= height * BAND_ZONE:
+                top_keys.add(_span_key(signature, text, y0))
+            elif height - y0 <= height * BAND_ZONE:
+                bottom_keys.add(_span_key(signature, text, height - y1))
+        for key in top_keys:
+            top_counts[key] = top_counts.get(key, 0) + 1
+        for key in bottom_keys:
+            bottom_counts[key] = bottom_counts.get(key, 0) + 1
+
+    top_repeated = {key for key, count in top_counts.items() if count >= min_pages}
+    bottom_repeated = {key for key, count in bottom_counts.items() if count >= min_pages}
+
+    # Par page : un span répété n'appartient à une bande que s'il se trouve entre
+    # le bord et le premier texte non répété (les mots courants du contenu
+    # peuvent eux aussi se répéter à la même position sur une grille régulière)
+    header_end: Optional[float] = None
+    content_top: Optional[float] = None
+    footer_start: Optional[float] = None
+    content_bottom: Optional[float] = None
+
+    for height, spans in samples:
+        top_spans, bottom_spans = [], []
+        page_top: Optional[float] = None
+        page_bottom: Optional[float] = None
+        for signature, text, y0, y1 in spans:
+            if y1 <= height * BAND_ZONE and _span_key(signature, text, y0) in top_repeated:
+                top_spans.append((y0, y1))
+            elif (height - y0 <= height * BAND_ZONE
+                  and _span_key(signature, text, height - y1) in bottom_repeated):
+                bottom_spans.append((y0, y1))
+            else:
+                page_top = y0 if page_top is None else min(page_top, y0)
+                page_bottom = y1 if page_bottom is None else max(page_bottom, y1)
+
+        for y0, y1 in top_spans:
+            if page_top is None or y1 <= page_top:
+                header_end = y1 if header_end is None else max(header_end, y1)
+            else:
+                page_top = min(page_top, y0)
+        for y0, y1 in bottom_spans:
+            if page_bottom is None or y0 >= page_bottom:
+                start = height - y0
+                footer_start = start if footer_start is None else max(footer_start, start)
+            else:
+                page_bottom = max(page_bottom, y1)
+
+        # Distances au bord de page du premier / dernier contenu
+        if page_top is not None:
+            content_top = page_top if content_top is None else min(content_top, page_top)
+            bottom = height - page_bottom
+            content_bottom = bottom if content_bottom is None else min(content_bottom, bottom)
+
+    header = 0.0
+    if header_end is not None and (content_top is None or content_top > header_end):
+        header = header_end + BAND_MARGIN
+        if content_top is not None:
+            header = min(header, (header_end + content_top) / 2)
+
+    footer = 0.0
+    if footer_start is not None and (content_bottom is None or content_bottom > footer_start):
+        footer = footer_start + BAND_MARGIN
+        if content_bottom is not None:
+            footer = min(footer, (footer_start + content_bottom) / 2)
+
+    return {"header": round(header, 2), "footer": round(footer, 2)}
+
+
+def count_band_spans(samples: List[Tuple[float, List[SampleSpan]]],
+                     header: float, footer: float) -> Dict[str, int]:
+    """
+    Nombre de spans de l'échantillon situés dans les bandes (donc non extraits)
+
+    MuPDF ne garde un caractère que si le centre de sa boîte est dans la zone
+    découpée : le span est compté d'après son centre vertical.
+
+    Returns:
+        {"header": n, "footer": m}
+    """
+    dropped = {"header": 0, "footer": 0}
+    for height, spans in samples:
+        for _, _, y0, y1 in spans:
+            center = (y0 + y1) / 2
+            if header and center < header:
+                dropped["header"] += 1
+            elif footer and center > height - footer:
+                dropped["footer"] += 1
+    return dropped
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Lecture / écriture des fichiers intermédiaires du pipeline
+
+Le format est déduit de l'extension :
+    .json              JSON (indenté par défaut, compact avec compact=True / --compact)
+    .msgpack, .mpk     MessagePack (binaire compact, pip install msgpack)
+    .ndjson, .jsonl    NDJSON : en-tête metadata, un élément par ligne, résumé final
+                       (format de neutral_extractor.py --format ndjson)
+
+Compression transparente, ajoutée après l'extension du format :
+    .gz                gzip (bibliothèque standard)
+    .zst, .zstd        Zstandard (pip install zstandard)
+ex. neutral_typed_pass2.json.gz, neutral.ndjson.zst, pass1.msgpack.gz.
+L'écriture passe en flux par le compresseur : le document n'est jamais
+sérialisé en entier en mémoire avant compression.
+
+orjson est utilisé s'il est installé pour le JSON compact et la lecture
+(pip install orjson) ; sinon la bibliothèque standard.
+
+Les documents au schéma compact v2 (element_schema.py, metadata.schema = 2)
+sont ramenés au schéma v1 à la lecture : les passes lisent les deux.
+"""
+
+import gzip
+import io
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from element_schema import SCHEMA_VERSION, schema_version, to_v1
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+PathLike = Union[str, Path]
+
+FORMAT_EXTENSIONS = {
+    ".json": "json",
+    ".msgpack": "msgpack",
+    ".mpk": "msgpack",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def _split_suffixes(path: PathLike) -> Tuple[str, Optional[str]]:
+    """Extension du format et compression éventuelle (".json", "gzip")"""
+    path = Path(path)
+    compression = COMPRESSION_EXTENSIONS.get(path.suffix.lower())
+    if compression is not None:
+        path = path.with_suffix("")
+    return path.suffix.lower(), compression
+
+
+def detect_format(path: PathLike) -> str:
+    """
+    Format d'un fichier d'après son extension (compression ignorée)
+
+    Returns:
+        "json", "msgpack" ou "ndjson" (json par défaut pour une extension inconnue)
+    """
+    return FORMAT_EXTENSIONS.get(_split_suffixes(path)[0], "json")
+
+
+def detect_compression(path: PathLike) -> Optional[str]:
+    """
+    Compression d'un fichier d'après son extension
+
+    Returns:
+        "gzip", "zstd" ou None
+    """
+    return _split_suffixes(path)[1]
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise ImportError("msgpack requis pour les fichiers .msgpack : pip install msgpack")
+
+
+def _require_zstd():
+    if zstandard is None:
+        raise ImportError("zstandard requis pour les fichiers .zst : pip install zstandard")
+
+
+@contextmanager
+def open_stream(path: PathLike, mode: str = "rt") -> Iterator[Any]:
+    """
+    Ouvre un fichier en décompressant / compressant à la volée selon l'extension
+
+    Args:
+        path: Chemin du fichier (.gz / .zst : compression transparente)
+        mode: "rt", "wt" (texte UTF-8), "rb" ou "wb"
+
+    Yields:
+        Objet fichier (texte ou binaire)
+    """
+    if mode not in ("rt", "wt", "rb", "wb"):
+        raise ValueError(f"Mode non supporté : {mode}")
+
+    path = Path(path)
+    compression = detect_compression(path)
+    writing = mode[0] == "w"
+    text = mode[1] == "t"
+
+    if compression == "gzip":
+        stream = gzip.open(path, mode[0] + "b", compresslevel=GZIP_LEVEL)
+    elif compression == "zstd":
+        _require_zstd()
+        raw = path.open(mode[0] + "b")
+        try:
+            if writing:
+                stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw)
+            else:
+                stream = zstandard.ZstdDecompressor().stream_reader(raw)
+        except Exception:
+            raw.close()
+            raise
+    else:
+        stream = path.open(mode[0] + "b")
+
+    if text:
+        stream = io.TextIOWrapper(stream, encoding="utf-8", newline="" if writing else None)
+
+    try:
+        yield stream
+    finally:
+        stream.close()
+
+
+# === Lecture ===
+
+def load_data(path: PathLike, keep_schema: bool = False) -> Any:
+    """
+    Charge un fichier intermédiaire (format déduit de l'extension)
+
+    Args:
+        path: Chemin du fichier
+        keep_schema: Ne pas ramener un document v2 au schéma v1
+
+    Returns:
+        Données décodées (document {"metadata", "elements", ...} pour le NDJSON),
+        au schéma v1 même si le fichier est au schéma v2 (sauf keep_schema)
+    """
+    data = _decode(path)
+    if not keep_schema and schema_version(data) == SCHEMA_VERSION:
+        return to_v1(data)
+    return data
+
+
+def is_compact_json(path: PathLike) -> bool:
+    """
+    Fichier JSON écrit sans indentation (compact=True) ?
+
+    Returns:
+        True si le début du fichier ne contient aucun saut de ligne
+        (False pour les formats autres que JSON)
+    """
+    if detect_format(path) != "json":
+        return False
+    with open_stream(path, "rb") as f:
+        head = f.read(4096)
+    return b"\n" not in head.strip()
+
+
+def _decode(path: PathLike) -> Any:
+    """Décode un fichier selon son extension, sans conversion de schéma"""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Fichier introuvable : {path}")
+
+    fmt = detect_format(path)
+
+    if fmt == "msgpack":
+        _require_msgpack()
+        with open_stream(path, "rb") as f:
+            return msgpack.unpack(f, raw=False, strict_map_key=False)
+
+    if fmt == "ndjson":
+        with open_stream(path, "rt") as f:
+            return _read_ndjson(f)
+
+    if orjson is not None:
+        with open_stream(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open_stream(path, "rt") as f:
+        return json.load(f)
+
+
+def _read_ndjson(lines) -> Dict[str, Any]:
+    """
+    Reconstitue un document à partir d'un flux NDJSON
+
+    Les lignes {"record": ...} portent les métadonnées (en-tête) et les
+    champs du document (résumé final) ; les autres lignes sont les éléments.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    document: Dict[str, Any] = {}
+    elements = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = loads(line)
+        kind = record.pop("record", None) if isinstance(record, dict) else None
+        if kind is None:
+            elements.append(record)
+        else:
+            # Le résumé final complète / remplace les métadonnées de l'en-tête
+            document.update(record)
+
+    document["elements"] = elements
+    return document
+
+
+# === Écriture ===
+
+def save_data(path: PathLike, data: Any, compact: bool = False,
+              default: Optional[Callable[[Any], Any]] = None) -> None:
+    """
+    Écrit un fichier intermédiaire (format déduit de l'extension)
+
+    Args:
+        path: Chemin de sortie (dossier parent créé si nécessaire)
+        data: Données à écrire
+        compact: JSON sans indentation (plus petit, plus rapide à écrire et relire)
+        default: Hook de sérialisation des objets non standards (ex. json_default)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fmt = detect_format(path)
+    compressed = detect_compression(path) is not None
+
+    if fmt == "msgpack":
+        _require_msgpack()
+        with open_stream(path, "wb") as f:
+            _write_msgpack(f, data, default)
+        return
+
+    if fmt == "ndjson":
+        with open_stream(path, "wt") as f:
+            _write_ndjson(f, data, default)
+        return
+
+    if compact:
+        # orjson sérialise tout le document d'un bloc : réservé aux fichiers non compressés
+        if orjson is not None and not compressed:
+            with path.open("wb") as f:
+                f.write(orjson.dumps(data, default=default, option=orjson.OPT_NON_STR_KEYS))
+            return
+        with open_stream(path, "wt") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"), default=default)
+        return
+
+    # json.dump écrit par morceaux (iterencode) : flux direct vers le compresseur
+    with open_stream(path, "wt") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=default)
+
+
+def _write_msgpack(f, data: Any, default: Optional[Callable[[Any], Any]] = None) -> None:
+    """
+    Écrit en MessagePack par morceaux : racine et listes de premier niveau
+    (elements, abstracts...) sont émises élément par élément
+    """
+    packer = msgpack.Packer(default=default, use_bin_type=True)
+
+    if not isinstance(data, dict):
+        f.write(packer.pack(data))
+        return
+
+    f.write(packer.pack_map_header(len(data)))
+    for key, value in data.items():
+        f.write(packer.pack(key))
+        if isinstance(value, list):
+            f.write(packer.pack_array_header(len(value)))
+            for item in value:
+                f.write(packer.pack(item))
+        else:
+            f.write(packer.pack(value))
+
+
+def _write_ndjson(f, data: Dict[str, Any], default: Optional[Callable[[Any], Any]] = None) -> None:
+    """Écrit un document en NDJSON : en-tête metadata, éléments, résumé (autres champs)"""
+    if not isinstance(data, dict) or "elements" not in data:
+        raise ValueError("Le format NDJSON est réservé aux documents avec une clé 'elements'.")
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, default=default)
+
+    f.write(dumps({"record": "metadata", "metadata": data.get("metadata", {})}) + "\n")
+    for elem in data.get("elements", []):
+        f.write(dumps(elem) + "\n")
+
+    summary = {key: value for key, value in data.items() if key != "elements"}
+    f.write(dumps({"record": "summary", **summary}) + "\n")
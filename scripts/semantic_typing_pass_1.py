@@ -22,10 +22,13 @@ Cette passe 1 fait uniquement :
       On les traitera en passe 2 à partir du contexte (code_abstract, polices, lignes).
 """
 
-import json
 from pathlib import Path
 import argparse
-from typing import Optional
+from typing import Dict, FrozenSet, Optional
+
+from element_index import refresh_indexes
+from pipeline_io import load_data, save_data
+from signature_catalog import SignatureRegistry
 
 # --- Signatures "connues" -----------------------------------------------------
 
@@ -63,6 +66,27 @@ FOOTER_SIGNATURES = {
 }
 
 
+
+def resolve_known_signatures(registry: SignatureRegistry) -> Dict[str, FrozenSet[int]]:
+    """
+    Résout les signatures connues en sig_id du document (une fois par fichier) :
+    les règles comparent ensuite des entiers.
+    """
+    known = {
+        "sections": registry.ids_of({STIX_BOLD_8_5_20}),
+        "disclosure": registry.ids_of({DISCLOSURE_SIGNATURE}),
+        "code_abstract": registry.ids_of({STIX_BOLD_8_5_20, TIMES_CODE_ABSTRACT_SIGNATURE}),
+        "session": registry.ids_of({SESSION_SIGNATURE}),
+        "header": registry.ids_of({HEADER_SIGNATURE}),
+        "footer": registry.ids_of(FOOTER_SIGNATURES),
+        "symbol_text": registry.ids_of(SYMBOL_TEXT_SIGNATURES),
+        "indice": registry.ids_of(INDICE_SIGNATURES),
+    }
+    # Toutes les règles portent sur une signature connue : filtre commun
+    known["any"] = frozenset().union(*known.values())
+    return known
+
+
 # --- Helpers ------------------------------------------------------------------
 
 
@@ -138,10 +162,12 @@ def looks_like_abstract_code(text: str) -> bool:
 # --- Règle principale de typage ----------------------------------------------
 
 
-def infer_element_type(elem: dict) -> Optional[str]:
+def infer_element_type(elem: dict, known: Dict[str, FrozenSet[int]]) -> Optional[str]:
     """
     Applique les règles de première passe à un élément.
 
+    `known` : signatures connues résolues en sig_id (resolve_known_signatures).
+
     Renvoie :
         - une string (element_type)
         - ou None si aucune règle ne s'applique.
@@ -149,16 +175,16 @@ def infer_element_type(elem: dict) -> Optional[str]:
     if elem.get("type") != "text":
         return None
 
-    signature = elem.get("signature", "")
+    sig_id = elem.get("sig_id")
     text = elem.get("text", "")
-    if not text:
+    if not text or sig_id not in known["any"]:
         return None
 
     text_norm = text.strip()
     section_norm = normalize_section_label(text)
 
     # 1. Sections structurantes (STIX-Bold_8.5_20 + mots-clés)
-    if signature == STIX_BOLD_8_5_20:
+    if sig_id in known["sections"]:
         # Background and aims
         if "background and aims" in section_norm:
             return "section_background_and_aims"
@@ -173,32 +199,32 @@ def infer_element_type(elem: dict) -> Optional[str]:
             return "section_conclusion"
 
     # 2. Disclosure (exact)
-    if signature == DISCLOSURE_SIGNATURE and section_norm == "disclosure":
+    if sig_id in known["disclosure"] and section_norm == "disclosure":
         return "section_disclosure"
 
     # 3. Code abstract (STIX ou Times), via looks_like_abstract_code
-    if signature in {STIX_BOLD_8_5_20, TIMES_CODE_ABSTRACT_SIGNATURE}:
+    if sig_id in known["code_abstract"]:
         if looks_like_abstract_code(text_norm):
             return "code_abstract"
 
     # 4. Session
-    if signature == SESSION_SIGNATURE:
+    if sig_id in known["session"]:
         return "session"
 
     # 5. Header (en-tête revue/page)
-    if signature == HEADER_SIGNATURE:
+    if sig_id in known["header"]:
         return "header"
 
     # 6. Footer
-    if signature in FOOTER_SIGNATURES:
+    if sig_id in known["footer"]:
         return "footer"
 
     # 7. Texte symbolique / math
-    if signature in SYMBOL_TEXT_SIGNATURES:
+    if sig_id in known["symbol_text"]:
         return "symbol_text"
 
     # 8. Indice (notes, indices, symboles minuscules)
-    if signature in INDICE_SIGNATURES:
+    if sig_id in known["indice"]:
         return "indice"
 
     # ⚠️ IMPORTANT :
@@ -212,22 +238,25 @@ def infer_element_type(elem: dict) -> Optional[str]:
 # --- Traitement principal -----------------------------------------------------
 
 
-def process_file(input_path: Path, output_path: Path) -> None:
+def process_file(input_path: Path, output_path: Path, compact: bool = False) -> None:
     """
     Charge le JSON d'entrée, applique le typage de première passe,
     et écrit un nouveau JSON avec "element_type" ajouté.
+
+    Formats (JSON, MessagePack, NDJSON) déduits des extensions (voir pipeline_io).
     """
     if not input_path.exists():
         raise FileNotFoundError(f"Fichier JSON d'entrée introuvable: {input_path}")
 
-    with input_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_data(input_path)
 
     elements = data.get("elements", [])
     typed_count = 0
+    # sig_id ajoutés aux éléments d'un fichier antérieur à la table des signatures
+    known = resolve_known_signatures(SignatureRegistry.for_document(data))
 
     for elem in elements:
-        element_type = infer_element_type(elem)
+        element_type = infer_element_type(elem, known)
         if element_type is not None:
             elem["element_type"] = element_type
             typed_count += 1
@@ -238,6 +267,8 @@ def process_file(input_path: Path, output_path: Path) -> None:
 
     # On garde le reste de la structure identique
     data["elements"] = elements
+    # Offsets des code_abstract (nouvellement typés) et des pages
+    refresh_indexes(data)
 
     # Métadonnée pour tracer la passe
     meta = data.get("metadata", {})
@@ -247,9 +278,7 @@ def process_file(input_path: Path, output_path: Path) -> None:
     data["metadata"] = meta
 
     # Sauvegarde
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    save_data(output_path, data, compact=compact)
 
     print(f"✓ Typage 1ère passe terminé.")
     print(f"  Fichier entrée : {input_path}")
@@ -277,12 +306,17 @@ def main():
         required=True,
         help="Fichier JSON de sortie avec element_type ajouté."
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="JSON de sortie sans indentation (plus petit, plus rapide)."
+    )
 
     args = parser.parse_args()
     input_path = Path(args.input)
     output_path = Path(args.output)
 
-    process_file(input_path, output_path)
+    process_file(input_path, output_path, compact=args.compact)
 
 
 if __name__ == "__main__":
@@ -2,9 +2,13 @@
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from element_index import refresh_indexes
+from line_table import load_lines
+from pipeline_io import load_data, save_data
+from signature_catalog import SignatureRegistry
 
 # --- Constantes de polices / types --- #
 
@@ -39,11 +43,71 @@ SECTION_TYPES = {
 }
 
 
+
+def resolve_fonts(registry: SignatureRegistry) -> Dict[str, FrozenSet[int]]:
+    """Polices ci-dessus résolues en sig_id du document (comparaisons entières)."""
+    return {
+        "title": registry.ids_of(TITLE_SIGNATURES),
+        "author": registry.ids_of({AUTHOR_FONT}),
+        "abstract_text": registry.ids_of(ABSTRACT_TEXT_SIGNATURES),
+        "image_text": registry.ids_of(IMAGE_TEXT_SIGNATURES),
+    }
+
+
 # --- Utilitaires --- #
 
-def group_by_line(elements: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    """Regroupe les éléments par line_id."""
+def load_document_lines(data: Dict[str, Any],
+                        elements: List[Dict[str, Any]]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Lignes du document lues dans la table des lignes (line_table.load_lines).
+
+    Les éléments de chaque ligne sont remis dans l'ordre de `elements` (tri
+    global de la passe). None si la table est absente ou ne correspond plus
+    exactement aux éléments (élément sans entrée, line_id ou numéro de ligne
+    modifié) : les lignes sont alors regroupées par line_id.
+    """
+    if data.get("line_table") is None:
+        return None
+
+    lines = load_lines(data)
+    position = {id(e): idx for idx, e in enumerate(elements)}
+    expected = sum(1 for e in elements if isinstance(e, dict) and e.get("line_id") is not None)
+    members_seen = {id(m) for members in lines.values() for m in members}
+    if len(members_seen) != expected or sum(len(m) for m in lines.values()) != expected:
+        return None
+
+    for lid, members in lines.items():
+        first = members[0]
+        for m in members:
+            if (m.get("line_id") != lid or m.get("page") != first.get("page")
+                    or m.get("line_num") != first.get("line_num")):
+                return None
+        members.sort(key=lambda m: position[id(m)])
+    return lines
+
+
+def group_by_line(
+    elements: List[Dict[str, Any]],
+    doc_lines: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Regroupe les éléments par line_id.
+
+    `doc_lines` : lignes du document (load_document_lines) ; chaque ligne y est
+    reprise, restreinte aux éléments fournis, au lieu d'être reconstituée.
+    """
     lines: Dict[str, List[Dict[str, Any]]] = {}
+    if doc_lines is not None:
+        wanted = {id(e) for e in elements}
+        for e in elements:
+            if not isinstance(e, dict):
+                continue
+            lid = e.get("line_id")
+            if lid is None or lid in lines:
+                continue
+            lines[lid] = [m for m in doc_lines[lid] if id(m) in wanted]
+        return lines
+
     for e in elements:
         if not isinstance(e, dict):
             continue
@@ -54,10 +118,17 @@ def group_by_line(elements: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, An
     return lines
 
 
-def sort_line_ids(lines: Dict[str, List[Dict[str, Any]]]) -> List[str]:
-    """Trie les line_id par (page, line_num) croissants."""
+def sort_line_ids(lines: Dict[str, List[Dict[str, Any]]], from_table: bool = False) -> List[str]:
+    """
+    Trie les line_id par (page, line_num) croissants.
+
+    `from_table` : lignes issues de la table des lignes, dont tous les éléments
+    partagent page et line_num (contrôlé par load_document_lines).
+    """
     def line_key(lid: str) -> Tuple[int, int]:
         elems = lines[lid]
+        if from_table:
+            return (elems[0].get("page", 0), elems[0].get("line_num", 0))
         page = min(e.get("page", 0) for e in elems)
         line_num = min(e.get("line_num", 0) for e in elems)
         return (page, line_num)
@@ -141,10 +212,16 @@ def process_single_abstract(
     span_start: int,
     span_end: int,
     abstract_id: str,
+    fonts: Dict[str, FrozenSet[int]],
+    doc_lines: Optional[Dict[str, List[Dict[str, Any]]]] = None,
 ) -> None:
     """
     Typage sémantique des éléments appartenant à un abstract donné.
+
+    `fonts` : polices de référence résolues en sig_id (resolve_fonts).
+    `doc_lines` : lignes issues de la table des lignes (load_document_lines).
     """
+    from_table = doc_lines is not None
 
     # 1) Marquage de l'abstract_id pour les éléments du span
     for i in range(span_start, span_end + 1):
@@ -157,8 +234,8 @@ def process_single_abstract(
         return
 
     # Groupement par lignes (les deux colonnes)
-    all_lines = group_by_line(span_elems)
-    all_ordered_line_ids = sort_line_ids(all_lines)
+    all_lines = group_by_line(span_elems, doc_lines)
+    all_ordered_line_ids = sort_line_ids(all_lines, from_table)
     all_line_index_map = {lid: idx for idx, lid in enumerate(all_ordered_line_ids)}
 
     # Colonne du code abstract
@@ -180,10 +257,10 @@ def process_single_abstract(
     if not column_elems_after_code:
         return
 
-    lines = group_by_line(column_elems_after_code)
+    lines = group_by_line(column_elems_after_code, doc_lines)
     if not lines:
         return
-    ordered_line_ids = sort_line_ids(lines)
+    ordered_line_ids = sort_line_ids(lines, from_table)
     line_index_map = {lid: idx for idx, lid in enumerate(ordered_line_ids)}
 
     # 2) En-tête (header) dans la colonne du code : jusqu'à la première section
@@ -200,9 +277,9 @@ def process_single_abstract(
     for lid in header_line_ids:
         line_elems = lines[lid]
         text_elems = [e for e in line_elems if e.get("type") == "text"]
-        signatures = {e.get("signature") for e in text_elems}
-        has_title_font = any(sig in TITLE_SIGNATURES for sig in signatures)
-        has_author_font = any(sig == AUTHOR_FONT for sig in signatures)
+        signatures = {e.get("sig_id") for e in text_elems}
+        has_title_font = not signatures.isdisjoint(fonts["title"])
+        has_author_font = not signatures.isdisjoint(fonts["author"])
         line_start_flag = any(e.get("line_start") for e in line_elems)
 
         header_infos.append(
@@ -233,7 +310,7 @@ def process_single_abstract(
         for e in info["text_elems"]:
             if (
                 e.get("element_type") is None
-                and e.get("signature") in TITLE_SIGNATURES
+                and e.get("sig_id") in fonts["title"]
             ):
                 title_candidates_by_lid.setdefault(lid, []).append(e)
 
@@ -260,7 +337,7 @@ def process_single_abstract(
                 for e in info["text_elems"]:
                     if (
                         e.get("element_type") is None
-                        and e.get("signature") in TITLE_SIGNATURES
+                        and e.get("sig_id") in fonts["title"]
                     ):
                         title_candidates_by_lid.setdefault(lid, []).append(e)
                 if info["has_author_font"]:
@@ -280,7 +357,7 @@ def process_single_abstract(
             if (
                 e.get("type") == "text"
                 and e.get("element_type") is None
-                and e.get("signature") in TITLE_SIGNATURES
+                and e.get("sig_id") in fonts["title"]
             ):
                 e["element_type"] = "author_title"
 
@@ -316,7 +393,7 @@ def process_single_abstract(
                     if (
                         e.get("type") == "text"
                         and e.get("element_type") is None
-                        and e.get("signature") == AUTHOR_FONT
+                        and e.get("sig_id") in fonts["author"]
                     ):
                         e["element_type"] = "author"
 
@@ -346,7 +423,7 @@ def process_single_abstract(
                 for te in text_sorted:
                     if (
                         te.get("element_type") is None
-                        and te.get("signature") == AUTHOR_FONT
+                        and te.get("sig_id") in fonts["author"]
                     ):
                         first_inst_global_idx = id_to_index.get(te["id"])
                         break
@@ -383,7 +460,7 @@ def process_single_abstract(
                         continue
                     if e.get("element_type") is not None:
                         continue
-                    if e.get("signature") != AUTHOR_FONT:
+                    if e.get("sig_id") not in fonts["author"]:
                         continue
                     e["element_type"] = "institution"
 
@@ -392,7 +469,7 @@ def process_single_abstract(
         if (
             e.get("type") == "text"
             and e.get("element_type") is None
-            and e.get("signature") in IMAGE_TEXT_SIGNATURES
+            and e.get("sig_id") in fonts["image_text"]
         ):
             txt = (e.get("text") or "").strip()
             low = txt.lower().replace("\u00a0", " ")
@@ -486,7 +563,7 @@ def process_single_abstract(
                     continue
                 if e.get("element_type") is not None:
                     continue
-                if e.get("signature") == AUTHOR_FONT:
+                if e.get("sig_id") in fonts["author"]:
                     section_text_indices.append(idx)
 
             target_type = f"{label_type}_text"
@@ -504,7 +581,7 @@ def process_single_abstract(
                     continue
                 if e.get("element_type") is not None:
                     continue
-                if e.get("signature") not in ABSTRACT_TEXT_SIGNATURES:
+                if e.get("sig_id") not in fonts["abstract_text"]:
                     continue
                 e["element_type"] = "abstract_text"
 
@@ -537,7 +614,7 @@ def process_single_abstract(
                 continue
             if e.get("element_type") is not None:
                 continue
-            if e.get("signature") not in IMAGE_TEXT_SIGNATURES:
+            if e.get("sig_id") not in fonts["image_text"]:
                 continue
             if e.get("page", 0) != page:
                 continue
@@ -556,12 +633,11 @@ def process_single_abstract(
 
 # --- Entrée / sortie fichier --- #
 
-def process_file(input_path: Path, output_path: Path) -> None:
+def process_file(input_path: Path, output_path: Path, compact: bool = False) -> None:
     if not input_path.exists():
         raise FileNotFoundError(f"Input JSON not found: {input_path}")
 
-    with input_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_data(input_path)
 
     if not isinstance(data, dict) or "elements" not in data:
         raise ValueError("Input JSON must be an object with 'elements'.")
@@ -572,8 +648,7 @@ def process_file(input_path: Path, output_path: Path) -> None:
 
     if not elements:
         data["elements"] = []
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        save_data(output_path, data, compact=compact)
         return
 
     # Tri global des éléments pour garantir un ordre stable
@@ -583,27 +658,32 @@ def process_file(input_path: Path, output_path: Path) -> None:
 
     # Spans d'abstracts
     spans = compute_abstract_spans(elements)
+    fonts = resolve_fonts(SignatureRegistry.for_document(data))
+    # Lignes lues dans la table des lignes de l'extracteur (sinon regroupement par line_id)
+    doc_lines = load_document_lines(data, elements)
 
     # Traitement de chaque abstract
     for abs_idx, (code_elem, span_start, span_end) in enumerate(spans, start=1):
         if not isinstance(code_elem, dict):
             continue
         abstract_id = f"abs_{abs_idx:04d}"
-        process_single_abstract(elements, code_elem, span_start, span_end, abstract_id)
+        process_single_abstract(elements, code_elem, span_start, span_end, abstract_id, fonts, doc_lines)
 
     data["elements"] = elements
+    # Tri global : offsets des pages et des code_abstract recalculés
+    refresh_indexes(data)
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    save_data(output_path, data, compact=compact)
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Semantic typing pass 2.")
     parser.add_argument("-i", "--input", required=True, help="Input JSON (pass1).")
     parser.add_argument("-o", "--output", required=True, help="Output JSON (pass2).")
+    parser.add_argument("--compact", action="store_true", help="Write non-indented JSON.")
     args = parser.parse_args()
 
-    process_file(Path(args.input), Path(args.output))
+    process_file(Path(args.input), Path(args.output), compact=args.compact)
 
 
 if __name__ == "__main__":
@@ -48,11 +48,12 @@ Sortie :
 from __future__ import annotations
 
 import argparse
-import json
 import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from pipeline_io import load_data, save_data
+
 
 # ---------------------------------------------------------------------------
 # Utilitaires d'ordre / tri
@@ -363,12 +364,11 @@ def build_abstract_object(abstract_id: str, elements: List[Dict[str, Any]]) -> D
 # Pipeline fichier complet
 # ---------------------------------------------------------------------------
 
-def process_file(input_path: Path, output_path: Path) -> None:
+def process_file(input_path: Path, output_path: Path, compact: bool = False) -> None:
     if not input_path.exists():
         raise FileNotFoundError(f"Fichier JSON d'entrée introuvable : {input_path}")
 
-    with input_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_data(input_path)
 
     # Racine = dict avec "elements"
     if not isinstance(data, dict) or "elements" not in data:
@@ -400,8 +400,7 @@ def process_file(input_path: Path, output_path: Path) -> None:
         "abstracts": abstracts
     }
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    save_data(output_path, output_data, compact=compact)
 
 
 # ---------------------------------------------------------------------------
@@ -422,12 +421,17 @@ def main() -> None:
         required=True,
         help="Fichier JSON de sortie avec les abstracts agrégés.",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="JSON de sortie sans indentation (plus petit, plus rapide).",
+    )
 
     args = parser.parse_args()
     input_path = Path(args.input)
     output_path = Path(args.output)
 
-    process_file(input_path, output_path)
+    process_file(input_path, output_path, compact=args.compact)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Accumulateur de statistiques par signature typographique
+
+Un seul passage sur les éléments collecte, pour chaque signature :
+comptage, premiers exemples (réservoir borné), pages, répartition
+gauche/droite et statistiques de hauteur.
+
+Utilisé par neutral_extractor.py (signature_catalog) et analyze_signatures.py.
+
+SignatureRegistry attribue à chaque signature d'un document un petit
+identifiant entier (sig_id, table "signature_table" de la sortie) : les
+passes comparent des entiers plutôt que des chaînes.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from element_schema import split_signature
+
+
+def parse_signature(signature: str) -> Dict[str, Any]:
+    """
+    Décompose une signature "Font_Size_Flags" (le nom de police peut contenir "_")
+
+    Returns:
+        {"font": str, "size": float, "flags": int} ; taille et flags à 0 si la
+        signature ne suit pas ce format
+    """
+    try:
+        font, size, flags = split_signature(signature)
+    except ValueError:
+        font, size, flags = signature or "Unknown", 0, 0
+    return {"font": font, "size": float(size), "flags": flags}
+
+
+class SignatureRegistry:
+    """
+    Signatures d'un document : identifiants entiers et formatage mémoïsé
+
+    Les identifiants suivent l'ordre de première apparition (sig_id = index
+    dans table()). Le formatage "Font_Size_Flags" n'est calculé qu'une fois
+    par triplet (police, taille, flags), le découpage inverse (parts) une
+    fois par signature.
+    """
+
+    def __init__(self, signatures: Optional[Iterable[str]] = None):
+        """
+        Args:
+            signatures: Table existante (signature_table d'un document), dans l'ordre des ids
+        """
+        self.signatures: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._formatted: Dict[Tuple[str, float, int], str] = {}
+        self._parts: Dict[str, Tuple[str, float, int]] = {}
+        for signature in signatures or ():
+            self.intern(signature)
+
+    @classmethod
+    def for_document(cls, data: Dict[str, Any]) -> "SignatureRegistry":
+        """
+        Registre d'un document relu ; les éléments sans sig_id en reçoivent un
+
+        Un document antérieur à la table (ou complété par une passe) est
+        ainsi mis à niveau ; data["signature_table"] est mis à jour.
+        """
+        registry = cls(data.get("signature_table") or ())
+        for elem in data.get("elements", []):
+            if isinstance(elem, dict) and "signature" in elem and "sig_id" not in elem:
+                elem["sig_id"] = registry.intern(elem["signature"])
+        if registry.signatures:
+            data["signature_table"] = registry.table()
+        return registry
+
+    def format(self, font: str, size: float, flags: int) -> str:
+        """Signature "Font_Size_Flags" (taille arrondie à 1 décimale)"""
+        key = (font, size, flags)
+        signature = self._formatted.get(key)
+        if signature is None:
+            size = round(size, 1)
+            signature = self._formatted[key] = f"{font}_{size}_{flags}"
+            self._parts.setdefault(signature, (font, size, flags))
+        return signature
+
+    def parts(self, signature: str) -> Tuple[str, float, int]:
+        """
+        (police, taille, flags) d'une signature, découpée une seule fois
+
+        Triplet passé à format() s'il y est connu, sinon split_signature ;
+        le stockage colonnaire et l'encodeur v2 reçoivent cette méthode pour
+        partager le même découpage.
+        """
+        parts = self._parts.get(signature)
+        if parts is None:
+            parts = self._parts[signature] = split_signature(signature)
+        return parts
+
+    def intern(self, signature: str) -> int:
+        """Identifiant d'une signature (attribué à la première rencontre)"""
+        sig_id = self._ids.get(signature)
+        if sig_id is None:
+            sig_id = self._ids[signature] = len(self.signatures)
+            self.signatures.append(signature)
+        return sig_id
+
+    def id_of(self, signature: str) -> Optional[int]:
+        """Identifiant d'une signature (None si absente du document)"""
+        return self._ids.get(signature)
+
+    def ids_of(self, signatures: Iterable[str]) -> FrozenSet[int]:
+        """Identifiants des signatures présentes dans le document"""
+        return frozenset(self._ids[s] for s in signatures if s in self._ids)
+
+    def assign(self, elem: Dict[str, Any]):
+        """Ajoute sig_id à un élément portant une signature"""
+        if "signature" in elem:
+            elem["sig_id"] = self.intern(elem["signature"])
+
+    def table(self) -> List[str]:
+        """Table des signatures (index = sig_id)"""
+        return list(self.signatures)
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+
+class SignatureAccumulator:
+    """Statistiques par signature, construites en une seule passe"""
+
+    def __init__(self, max_examples: int = 3, example_length: int = 50):
+        """
+        Args:
+            max_examples: Nombre d'exemples conservés par signature
+            example_length: Longueur maximale d'un exemple
+        """
+        self.max_examples = max_examples
+        self.example_length = example_length
+        # signature → stats (ordre d'insertion = ordre de première apparition)
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, elem: Dict[str, Any]):
+        """Comptabilise un élément portant une signature"""
+        signature = elem["signature"]
+        stats = self.stats.get(signature)
+        if stats is None:
+            stats = {
+                "count": 0,
+                "examples": [],
+                "pages": set(),
+                "left_count": 0,
+                "right_count": 0,
+                "h_min": None,
+                "h_max": None,
+                "h_sum": 0.0
+            }
+            self.stats[signature] = stats
+
+        stats["count"] += 1
+
+        if len(stats["examples"]) < self.max_examples:
+            stats["examples"].append(elem.get("text", "")[:self.example_length])
+
+        stats["pages"].add(elem["page"])
+
+        column = elem.get("line_position")
+        if column == "left":
+            stats["left_count"] += 1
+        elif column == "right":
+            stats["right_count"] += 1
+
+        h = elem["position"]["h"]
+        stats["h_sum"] += h
+        if stats["h_min"] is None or h < stats["h_min"]:
+            stats["h_min"] = h
+        if stats["h_max"] is None or h > stats["h_max"]:
+            stats["h_max"] = h
+
+    def add_all(self, elements: Iterable[Dict[str, Any]]) -> "SignatureAccumulator":
+        """
+        Comptabilise tous les éléments portant une signature
+
+        Les éléments fusionnés (_create_merged_element) n'ont pas de clé "type" :
+        le filtre porte sur la signature seule, comme l'ancien filtre par signature
+        d'analyze_signatures.
+        """
+        for elem in elements:
+            if isinstance(elem, dict) and "signature" in elem:
+                self.add(elem)
+        return self
+
+    def get(self, signature: str) -> Optional[Dict[str, Any]]:
+        """Statistiques brutes d'une signature (None si absente)"""
+        return self.stats.get(signature)
+
+    def catalog(self) -> Dict[str, Any]:
+        """
+        Catalogue au format neutral.json (signature → font, size, flags, count, examples)
+
+        Returns:
+            Catalogue trié par fréquence décroissante
+        """
+        catalog = {}
+        for signature, stats in self.stats.items():
+            catalog[signature] = {
+                **parse_signature(signature),
+                "count": stats["count"],
+                "examples": stats["examples"]
+            }
+
+        # Tri par fréquence décroissante
+        return dict(sorted(catalog.items(), key=lambda x: x[1]["count"], reverse=True))
+
+    def position_stats(self, signature: str) -> Dict[str, Any]:
+        """
+        Statistiques de position d'une signature (pages, colonnes, hauteurs)
+
+        Returns:
+            {"pages", "left_count", "right_count", "h_min", "h_max", "h_mean"}
+        """
+        stats = self.stats.get(signature)
+        if stats is None:
+            return {"pages": [], "left_count": 0, "right_count": 0,
+                    "h_min": None, "h_max": None, "h_mean": None}
+
+        return {
+            "pages": sorted(stats["pages"]),
+            "left_count": stats["left_count"],
+            "right_count": stats["right_count"],
+            "h_min": stats["h_min"],
+            "h_max": stats["h_max"],
+            "h_mean": round(stats["h_sum"] / stats["count"], 2)
+        }
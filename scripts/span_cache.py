@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Cache des spans bruts par page (avant fusion / lignes)
+
+page.get_text("dict") est l'étape coûteuse de l'extraction ; la fusion,
+le rattachement des scripts et les métadonnées de ligne ne travaillent
+que sur les spans. Ce cache conserve, pour chaque page, les éléments
+bruts (textes, images, tables) : relancer avec un autre --y-tolerance
+ou --no-merge rejoue les pages depuis le cache sans analyser le PDF.
+
+Organisation :
+    <cache_dir>/<clé>/info.json     source et paramètres
+    <cache_dir>/<clé>/p00012.bin    page d'index 12 (pickle compressé zlib)
+
+Format compact d'une page :
+    (signatures, textes, autres éléments, statistiques de page)
+    signatures = ["Font_Size_Flags", ...]     (table locale à la page)
+    textes     = [(texte, code signature, x, y, w, h), ...]
+
+Le contenu est désérialisé avec pickle : le dossier de cache doit être
+un dossier de confiance (local à l'utilisateur).
+"""
+
+import json
+import logging
+import os
+import pickle
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Incrémenté à chaque changement du format des pages
+SPAN_CACHE_FORMAT = 1
+
+
+class SpanCache:
+    """Spans bruts des pages d'un PDF, un fichier compressé par page"""
+
+    def __init__(self, cache_dir: str, compress_level: int = 6):
+        """
+        Args:
+            cache_dir: Dossier du cache (créé si nécessaire)
+            compress_level: Niveau de compression zlib (1 = rapide, 9 = compact)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.compress_level = compress_level
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def page_dir(self, key: str) -> Path:
+        """Dossier des pages d'une clé (PDF + paramètres bruts)"""
+        return self.cache_dir / key
+
+    def register(self, key: str, info: Dict[str, Any]):
+        """Crée le dossier d'une clé et y décrit la source (inspection)"""
+        page_dir = self.page_dir(key)
+        page_dir.mkdir(parents=True, exist_ok=True)
+        info_path = page_dir / "info.json"
+        if not info_path.exists():
+            with open(info_path, "w", encoding="utf-8") as f:
+                json.dump({"format": SPAN_CACHE_FORMAT, **info}, f, ensure_ascii=False, indent=2)
+
+    def _page_path(self, key: str, page_index: int) -> Path:
+        return self.page_dir(key) / f"p{page_index:05d}.bin"
+
+    def load(self, key: str, page_index: int) -> Optional[Dict[str, Any]]:
+        """
+        Relit les éléments bruts d'une page
+
+        Returns:
+            {"elements": [...], "page_stats": {...}} ou None si absente / illisible
+        """
+        path = self._page_path(key, page_index)
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            signatures, texts, others, page_stats = pickle.loads(zlib.decompress(payload))
+        except Exception as e:
+            logger.warning(f"Page {page_index + 1} illisible dans le cache de spans : {e}")
+            return None
+
+        page_num = page_index + 1
+        elements = [
+            {
+                "id": None,
+                "type": "text",
+                "page": page_num,
+                "text": text,
+                "signature": signatures[sig],
+                "position": {"x": x, "y": y, "w": w, "h": h}
+            }
+            for text, sig, x, y, w, h in texts
+        ]
+        elements.extend(others)
+        return {"elements": elements, "page_stats": page_stats}
+
+    def store(self, key: str, page_index: int, elements: List[Dict[str, Any]],
+              page_stats: Dict[str, Any]):
+        """
+        Enregistre les éléments bruts d'une page (avant attribution des ids)
+
+        Args:
+            key: Clé du PDF
+            page_index: Index de la page (0-indexed)
+            elements: Éléments bruts, textes puis images et tables
+            page_stats: Statistiques de la page à restituer lors du rejeu
+        """
+        signatures: List[str] = []
+        codes: Dict[str, int] = {}
+        texts = []
+        others = []
+        for elem in elements:
+            if elem.get("type") != "text":
+                others.append(elem)
+                continue
+            signature = elem["signature"]
+            code = codes.get(signature)
+            if code is None:
+                code = codes[signature] = len(signatures)
+                signatures.append(signature)
+            pos = elem["position"]
+            texts.append((elem["text"], code, pos["x"], pos["y"], pos["w"], pos["h"]))
+
+        payload = zlib.compress(
+            pickle.dumps((signatures, texts, others, page_stats), protocol=pickle.HIGHEST_PROTOCOL),
+            self.compress_level
+        )
+
+        path = self._page_path(key, page_index)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
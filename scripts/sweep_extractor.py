@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Balayage des seuils de neutral_extractor.py sur les mêmes spans
+
+Le PDF n'est analysé qu'une fois (ou relu depuis le cache des spans) ;
+chaque combinaison de paramètres rejoue ensuite la fusion, le rattachement
+des scripts et le groupement en lignes, en parallèle sur plusieurs processus.
+
+Paramètres balayés :
+    --y-tolerance       tolérance Y de la fusion des consécutifs
+    --merge-gap         saut horizontal maximal entre spans fusionnés
+    --line-y-tolerance  tolérance Y du groupement en lignes
+    --x-threshold       seuil colonne gauche / droite
+    --merge             fusion activée / désactivée (on, off)
+
+Usage :
+    python sweep_extractor.py -i document.pdf --y-tolerance 2,3,4 --merge-gap 30,50,80
+    python sweep_extractor.py -i document.pdf --x-threshold 295,305,315 -o sweep.json
+"""
+
+import json
+import logging
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from neutral_extractor import (NeutralExtractor, LINE_Y_TOLERANCE, MERGE_X_GAP, X_THRESHOLD,
+                               logger as extractor_logger)
+
+logger = logging.getLogger(__name__)
+
+# Ordre des colonnes du rapport
+SWEEP_PARAMS = ("merge_consecutive", "y_tolerance", "merge_gap", "line_y_tolerance", "x_threshold")
+
+
+def build_grid(values: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Produit cartésien des valeurs de chaque paramètre
+
+    Args:
+        values: paramètre → liste de valeurs
+
+    Returns:
+        Liste de combinaisons {paramètre: valeur}
+    """
+    names = [name for name in SWEEP_PARAMS if name in values]
+    combos = []
+    for combo in product(*(values[name] for name in names)):
+        params = dict(zip(names, combo))
+        # Sans fusion, y_tolerance et merge_gap sont sans effet : une seule combinaison
+        if not params.get("merge_consecutive", True):
+            params["y_tolerance"] = values["y_tolerance"][0]
+            params["merge_gap"] = values["merge_gap"][0]
+            if params in combos:
+                continue
+        combos.append(params)
+    return combos
+
+
+def evaluate(raw_pages: List[List[Dict[str, Any]]], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rejoue le post-traitement de toutes les pages avec une combinaison de paramètres
+
+    Args:
+        raw_pages: Éléments bruts par page (modifiés sur place : passer une copie)
+        params: Paramètres de NeutralExtractor
+
+    Returns:
+        Paramètres + comptages (éléments, lignes, scripts) + durée
+    """
+    extractor = NeutralExtractor(**params)
+
+    start = perf_counter()
+    elements = 0
+    texts = 0
+    lines = 0
+    left_lines = 0
+    superscripts = 0
+    subscripts = 0
+
+    for raw_elements in raw_pages:
+        _, page_elements = extractor.process_raw_page(raw_elements)
+        line_columns = {}
+        for elem in page_elements:
+            elements += 1
+            if elem.get("type") not in ("image", "table"):
+                texts += 1
+                superscripts += 1 if elem.get("_superscript_adjusted") else 0
+                subscripts += 1 if elem.get("_subscript_adjusted") else 0
+            line_columns[elem["line_id"]] = elem["line_position"]
+        lines += len(line_columns)
+        left_lines += sum(1 for column in line_columns.values() if column == "left")
+
+    return {
+        **params,
+        "elements": elements,
+        "texts": texts,
+        "lines": lines,
+        "left_lines": left_lines,
+        "right_lines": lines - left_lines,
+        "superscripts": superscripts,
+        "subscripts": subscripts,
+        "seconds": round(perf_counter() - start, 3)
+    }
+
+
+# === Workers ===
+
+_sweep_state: Dict[str, Any] = {}
+
+
+def _init_sweep_worker(raw_blob: bytes):
+    """Initialise un worker : reçoit une fois les spans sérialisés"""
+    extractor_logger.setLevel(logging.WARNING)
+    _sweep_state["raw_blob"] = raw_blob
+
+
+def _evaluate_in_worker(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Évalue une combinaison sur une copie fraîche des spans"""
+    return evaluate(pickle.loads(_sweep_state["raw_blob"]), params)
+
+
+def run_sweep(pdf_path: str, grid: List[Dict[str, Any]], start_page: int = 1,
+              end_page: Optional[int] = None, workers: int = 1, tables: str = "always",
+              span_cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyse le PDF une fois puis évalue chaque combinaison de la grille
+
+    Args:
+        pdf_path: Chemin du PDF
+        grid: Combinaisons de paramètres (voir build_grid)
+        start_page: Page de début (1-indexed)
+        end_page: Page de fin (1-indexed, None = jusqu'à la fin)
+        workers: Nombre de processus d'évaluation
+        tables: Mode de détection des tables de l'extraction brute
+        span_cache_dir: Cache des spans bruts (None = analyse du PDF)
+
+    Returns:
+        {"source", "pages", "parse_seconds", "results": [...]}
+    """
+    parser = NeutralExtractor(tables=tables, span_cache_dir=span_cache_dir)
+
+    start = perf_counter()
+    raw_pages = [raw for _, raw in parser.iter_raw_pages(pdf_path, start_page, end_page)]
+    parse_seconds = perf_counter() - start
+    logger.info(f"✓ {len(raw_pages)} pages analysées en {parse_seconds:.2f}s")
+
+    # Chaque évaluation modifie les éléments : elle repart de cette copie sérialisée
+    raw_blob = pickle.dumps(raw_pages, protocol=pickle.HIGHEST_PROTOCOL)
+
+    extractor_logger.setLevel(logging.WARNING)
+    try:
+        if workers <= 1 or len(grid) <= 1:
+            results = [evaluate(pickle.loads(raw_blob), params) for params in grid]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                     initargs=(raw_blob,)) as pool:
+                results = list(pool.map(_evaluate_in_worker, grid))
+    finally:
+        extractor_logger.setLevel(logging.INFO)
+
+    return {
+        "source": pdf_path,
+        "pages": f"{start_page}-{end_page if end_page else start_page + len(raw_pages) - 1}",
+        "parse_seconds": round(parse_seconds, 3),
+        "results": results
+    }
+
+
+def print_report(sweep: Dict[str, Any]):
+    """Affiche le tableau des résultats du balayage"""
+    results = sweep["results"]
+
+    print("\n" + "=" * 100)
+    print("🎛️  BALAYAGE DES PARAMÈTRES D'EXTRACTION")
+    print("=" * 100)
+    print(f"\n📄 Source : {sweep['source']} (pages {sweep['pages']})")
+    print(f"⏱️  Analyse du PDF : {sweep['parse_seconds']:.2f}s, {len(results)} combinaisons")
+
+    print(f"\n{'Fusion':<7} {'TolY':>5} {'Écart':>6} {'TolLig':>7} {'SeuilX':>7} │ "
+          f"{'Éléments':>9} {'Textes':>7} {'Lignes':>7} {'G/D':>11} {'Sup':>5} {'Sub':>5} │ {'Durée':>7}")
+    print("-" * 100)
+    for r in results:
+        fusion = "oui" if r["merge_consecutive"] else "non"
+        columns = f"{r['left_lines']}/{r['right_lines']}"
+        print(f"{fusion:<7} {r['y_tolerance']:>5g} {r['merge_gap']:>6g} {r['line_y_tolerance']:>7g} "
+              f"{r['x_threshold']:>7g} │ {r['elements']:>9} {r['texts']:>7} {r['lines']:>7} {columns:>11} "
+              f"{r['superscripts']:>5} {r['subscripts']:>5} │ {r['seconds']:>6.2f}s")
+    print("=" * 100 + "\n")
+
+
+def _float_list(text: str) -> List[float]:
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+def _merge_list(text: str) -> List[bool]:
+    values = []
+    for v in text.split(","):
+        v = v.strip().lower()
+        if v not in ("on", "off"):
+            raise ValueError(f"Valeur de --merge inconnue : {v} (on, off)")
+        values.append(v == "on")
+    return values
+
+
+def main():
+    """Point d'entrée CLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Balayage des seuils de l'extracteur neutre")
+    parser.add_argument('-i', '--input', required=True, help='Fichier PDF d\'entrée')
+    parser.add_argument('-o', '--output', help='Export JSON des résultats (optionnel)')
+    parser.add_argument('-s', '--start-page', type=int, default=1, help='Page de début (défaut: 1)')
+    parser.add_argument('-e', '--end-page', type=int, help='Page de fin (défaut: toutes)')
+    parser.add_argument('--merge', default='on', help='Fusion des consécutifs : on, off ou on,off (défaut: on)')
+    parser.add_argument('--y-tolerance', default='3.0', help='Valeurs de tolérance Y, séparées par des virgules')
+    parser.add_argument('--merge-gap', default=f'{MERGE_X_GAP:g}', help='Valeurs d\'écart de fusion')
+    parser.add_argument('--line-y-tolerance', default=f'{LINE_Y_TOLERANCE:g}',
+                        help='Valeurs de tolérance Y des lignes')
+    parser.add_argument('--x-threshold', default=f'{X_THRESHOLD:g}', help='Valeurs du seuil gauche/droite')
+    parser.add_argument('--workers', type=int, default=1, help='Processus d\'évaluation (défaut: 1)')
+    parser.add_argument('--tables', choices=['auto', 'always', 'never'], default='always',
+                        help='Détection des tables lors de l\'analyse (défaut: always)')
+    parser.add_argument('--span-cache-dir', help='Cache des spans bruts (réutilisé entre balayages)')
+
+    args = parser.parse_args()
+
+    try:
+        grid = build_grid({
+            "merge_consecutive": _merge_list(args.merge),
+            "y_tolerance": _float_list(args.y_tolerance),
+            "merge_gap": _float_list(args.merge_gap),
+            "line_y_tolerance": _float_list(args.line_y_tolerance),
+            "x_threshold": _float_list(args.x_threshold)
+        })
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    try:
+        sweep = run_sweep(args.input, grid, args.start_page, args.end_page,
+                          workers=args.workers, tables=args.tables, span_cache_dir=args.span_cache_dir)
+    except Exception as e:
+        logger.error(f"Erreur : {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    print_report(sweep)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(sweep, f, ensure_ascii=False, indent=2)
+        print(f"✓ Résultats exportés : {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
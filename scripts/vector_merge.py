@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Fusion vectorisée des éléments texte consécutifs (moteur "numpy")
+
+Mêmes règles que NeutralExtractor._should_merge, évaluées d'un bloc sur
+toute la séquence : un nouveau groupe commence à l'élément i si
+
+    signature[i] != signature[i-1]  ou  page[i] != page[i-1]
+    ou |y[i] - y[i-1]| > y_tolerance
+    ou x[i] - (x[i-1] + w[i-1]) > merge_gap
+
+Les débuts de groupe sont les indices vrais de ce masque : plus d'appel
+de _should_merge par paire d'éléments. Ce module ne renvoie que les bornes
+des groupes ; chaque élément fusionné est construit par
+NeutralExtractor._create_merged_element, comme avec le moteur "python".
+"""
+
+from operator import itemgetter, ne
+from typing import Any, Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MERGE_ENGINES = ("python", "numpy")
+
+
+def require_numpy():
+    """Lève ImportError si NumPy est absent (moteur de fusion "numpy")"""
+    if np is None:
+        raise ImportError("NumPy requis pour le moteur de fusion numpy : pip install numpy")
+
+
+def group_starts(elements: List[Dict[str, Any]], y_tolerance: float, merge_gap: float) -> List[int]:
+    """
+    Indices de début des groupes de fusion
+
+    Args:
+        elements: Éléments texte (ordre d'extraction)
+        y_tolerance: Écart Y maximal entre deux éléments consécutifs
+        merge_gap: Saut horizontal maximal entre la fin d'un élément et le suivant
+
+    Returns:
+        Indices croissants, le premier vaut 0 (liste vide si aucun élément)
+    """
+    n = len(elements)
+    if n == 0:
+        return []
+
+    # Colonnes extraites des dicts (coût dominant : les comparaisons sont vectorisées)
+    positions = list(map(itemgetter("position"), elements))
+    x, y, w = (np.fromiter(map(itemgetter(key), positions), dtype=np.float64, count=n)
+               for key in ("x", "y", "w"))
+    page = np.fromiter(map(itemgetter("page"), elements), dtype=np.int64, count=n)
+    signatures = list(map(itemgetter("signature"), elements))
+    sig_changed = np.fromiter(map(ne, signatures[1:], signatures[:-1]), dtype=bool, count=n - 1)
+
+    # Rupture entre i-1 et i (écrit comme _should_merge : NaN ne provoque pas de rupture)
+    breaks = sig_changed | (page[1:] != page[:-1])
+    breaks |= np.abs(y[1:] - y[:-1]) > y_tolerance
+    breaks |= (x[1:] - (x[:-1] + w[:-1])) > merge_gap
+
+    return [0] + (np.flatnonzero(breaks) + 1).tolist()
+
+
+def merge_runs(elements: List[Dict[str, Any]], y_tolerance: float, merge_gap: float) -> List[Tuple[int, int]]:
+    """
+    Bornes des groupes de fusion (les dicts sont construits par l'extracteur)
+
+    Args:
+        elements: Éléments texte bruts d'une page
+        y_tolerance: Tolérance Y de fusion
+        merge_gap: Écart horizontal maximal de fusion
+
+    Returns:
+        Couples (début, fin exclue) couvrant toute la séquence, dans l'ordre
+    """
+    require_numpy()
+    starts = group_starts(elements, y_tolerance, merge_gap)
+    return list(zip(starts, starts[1:] + [len(elements)]))
@@ -0,0 +1,65 @@
+"""
+Configuration pytest : les scripts du pipeline s'importent comme modules
+de premier niveau (python scripts/neutral_extractor.py ...)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+@pytest.fixture
+def image_pdf(tmp_path):
+    """PDF d'une page : une ligne de texte et une image 16 x 16"""
+    fitz = pytest.importorskip("fitz")
+    path = tmp_path / "doc.pdf"
+    doc = fitz.open()
+    page = doc.new_page(width=595, height=842)
+    page.insert_text((60, 80), "Figure 1 Study design", fontname="helv", fontsize=10)
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 16, 16), False)
+    pixmap.clear_with(200)
+    page.insert_image(fitz.Rect(60, 100, 160, 200), pixmap=pixmap)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+TEXT_WORDS = ["insulin", "glucose", "cohort", "trial", "beta", "cells", "renal", "retinal",
+              "outcome", "risk", "therapy", "patients", "adipose", "hepatic", "markers", "dose"]
+
+
+@pytest.fixture(scope="session")
+def text_pdf(tmp_path_factory):
+    """
+    PDF de 4 pages en deux colonnes : lignes écrites mot à mot (spans fusionnés
+    à l'extraction), lignes d'un seul mot et appels de note en exposant
+    """
+    fitz = pytest.importorskip("fitz")
+    path = tmp_path_factory.mktemp("pdf") / "text.pdf"
+    doc = fitz.open()
+    for n in range(4):
+        page = doc.new_page(width=595, height=842)
+        for column, x0 in enumerate((60, 330)):
+            for i in range(18):
+                y = 100 + 22 * i
+                if (i + n) % 5 == 4:
+                    page.insert_text((x0, y), TEXT_WORDS[(i + n) % 16].upper(), fontname="hebo", fontsize=10)
+                    continue
+                x = x0
+                for k in range(4):
+                    word = TEXT_WORDS[(n * 3 + i * 5 + k + column) % 16]
+                    page.insert_text((x, y), word, fontname="helv", fontsize=9)
+                    x += len(word) * 5 + 6
+                    # Exposant après le 1er mot, indice après le 2e (rattachés à la ligne)
+                    if k == 0 and (i + column) % 3 == 0:
+                        page.insert_text((x - 5, y - 5), str(i % 9 + 1), fontname="helv", fontsize=5)
+                    if k == 1 and (i + column + n) % 4 == 1:
+                        page.insert_text((x - 5, y), "2", fontname="helv", fontsize=5)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
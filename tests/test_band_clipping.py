@@ -0,0 +1,60 @@
+"""
+Découpage des bandes d'en-tête / pied de page à l'extraction (clip_bands="auto")
+"""
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from neutral_extractor import NeutralExtractor
+from page_bands import pick_sample_pages
+
+WORDS = ["insulin", "glucose", "cohort", "trial", "beta", "cells", "renal", "retinal",
+         "outcome", "risk", "therapy", "patients", "adipose", "hepatic", "markers", "dose"]
+
+
+def _sentence(page, line):
+    """Texte de contenu propre à chaque page et ligne (sans chiffres)"""
+    return " ".join(WORDS[(page * 5 + line * 3 + k) % len(WORDS)] for k in range(4)) + f" {WORDS[page % 16]}"
+
+
+def _numbered_pdf(path, pages, low_line_page=None):
+    """Pages de 10 lignes avec le numéro de page seul en pied ; une page peut
+    porter une ligne de contenu supplémentaire juste au-dessus du pied"""
+    doc = fitz.open()
+    for n in range(1, pages + 1):
+        page = doc.new_page(width=595, height=842)
+        for i in range(10):
+            page.insert_text((60, 120 + 20 * i), _sentence(n, i), fontname="helv", fontsize=10)
+        if n == low_line_page:
+            page.insert_text((60, 790), "Conclusion continued near the bottom", fontname="helv", fontsize=10)
+        page.insert_text((290, 815), str(n), fontname="tiro", fontsize=9)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_extraction_clips_page_number_footer(tmp_path):
+    path = _numbered_pdf(tmp_path / "numbered.pdf", 6)
+
+    data = NeutralExtractor(clip_bands="auto").extract_from_pdf(path)
+
+    assert data["metadata"]["clip_bands"]["footer"] > 0
+    texts = [e["text"] for e in data["elements"]]
+    assert not [t for t in texts if t.isdigit()]
+    assert len(texts) == 60
+
+
+def test_content_near_footer_on_unsampled_page_is_kept(tmp_path):
+    pages = 14
+    unsampled = sorted(set(range(pages)) - set(pick_sample_pages(0, pages, 12)))
+    low_line_page = unsampled[0] + 1
+    path = _numbered_pdf(tmp_path / "low.pdf", pages, low_line_page)
+
+    data = NeutralExtractor(clip_bands="auto").extract_from_pdf(path)
+
+    assert low_line_page not in data["metadata"]["clip_bands"]["sample_pages"]
+    assert data["metadata"]["clip_bands"]["footer"] > 0
+    texts = [e["text"] for e in data["elements"] if e["page"] == low_line_page]
+    assert "Conclusion continued near the bottom" in texts
+    assert not [t for t in texts if t.isdigit()]
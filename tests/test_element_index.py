@@ -0,0 +1,41 @@
+"""
+page_index / code_abstract_index et découpage des pages
+"""
+
+from element_index import build_page_index, pages_slice, refresh_indexes
+
+
+def _elements():
+    return [{"page": 1, "text": "a"}, {"page": 1, "text": "b"},
+            {"page": 2, "text": "c"},
+            {"page": 4, "text": "d"}, {"page": 4, "text": "e"}]
+
+
+def test_build_page_index_offsets():
+    assert build_page_index(_elements()) == {"1": [0, 2], "2": [2, 3], "4": [3, 5]}
+
+
+def test_build_page_index_rejects_split_page():
+    elements = _elements() + [{"page": 1, "text": "f"}]
+    assert build_page_index(elements) is None
+
+
+def test_pages_slice_uses_index_and_falls_back():
+    data = {"elements": _elements()}
+    refresh_indexes(data)
+    assert [e["text"] for e in pages_slice(data, [4, 1])] == ["a", "b", "d", "e"]
+    assert pages_slice(data, [3]) == []
+
+    # Index périmé (éléments modifiés depuis) : parcours complet
+    data["elements"].insert(0, {"page": 2, "text": "z"})
+    data["elements"].append({"page": 9, "text": "y"})
+    assert [e["text"] for e in pages_slice(data, [2])] == ["z", "c"]
+
+
+def test_code_abstract_index_after_typing():
+    data = {"elements": [{"page": 1, "text": "x", "element_type": "body"},
+                         {"page": 1, "text": " 1181 ", "element_type": "code_abstract"},
+                         {"page": 2, "text": "1182", "element_type": "code_abstract"}]}
+    refresh_indexes(data)
+    assert data["code_abstract_index"] == [{"code": "1181", "offset": 1, "page": 1},
+                                           {"code": "1182", "offset": 2, "page": 2}]
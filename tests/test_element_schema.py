@@ -0,0 +1,114 @@
+"""
+Schéma v2 : la conversion v1 → v2 → v1 restitue le document à l'identique
+"""
+
+import copy
+
+import pytest
+
+from element_schema import V2Encoder, split_signature, to_v1, to_v2
+from element_store import ColumnarElementStore
+from pipeline_io import load_data, save_data
+from signature_catalog import SignatureRegistry, parse_signature
+
+
+def _document():
+    return {
+        "metadata": {"source": "test.pdf", "total_pages": 2},
+        "elements": [
+            {"id": 0, "type": "text", "page": 1, "text": "OP 01", "signature": "MyriadPro-Bold_12.0_20",
+             "position": {"x": 51.0, "y": 54.0, "w": 29.5, "h": 12.0},
+             "line_id": "p1_L0", "line_num": 0, "sig_id": 0},
+            {"id": 1, "type": "text", "page": 1, "text": "x", "signature": "Font_0_0",
+             "position": {"x": 90.0, "y": 54.0, "w": 4.0, "h": 0.0},
+             "line_id": "p1_L0", "line_num": 0, "sig_id": 1},
+            {"id": 2, "type": "text", "page": 2, "text": "a_b", "signature": "Some_Font_8.5_4",
+             "position": {"x": 51.0, "y": 80.0, "w": 10.0, "h": 8.5},
+             "line_id": "merged_7", "line_num": 3, "sig_id": 2},
+            {"id": 3, "type": "image", "page": 2, "file": "img.png",
+             "placements": [{"x": 1.0, "y": 2.0, "w": 3.0, "h": 4.0}]},
+            {"id": 4, "type": "table", "page": 2, "rows": 1, "cols": 2,
+             "cells": [[{"text": "a", "bbox": {"x": 0.0, "y": 0.0, "w": 5.0, "h": 5.0}},
+                        {"text": "", "bbox": None}]],
+             "line_id": "p2_L4", "line_num": 4}
+        ],
+        "line_table": [{"line_id": "p1_L0", "page": 1, "line_num": 0},
+                       {"line_id": "merged_7", "page": 2, "line_num": 3}],
+        "signature_table": ["MyriadPro-Bold_12.0_20", "Font_0_0", "Some_Font_8.5_4"]
+    }
+
+
+def test_split_signature_keeps_integer_size():
+    assert split_signature("Font_0_0") == ("Font", 0, 0)
+    assert isinstance(split_signature("Font_0_0")[1], int)
+    assert split_signature("Font_12.0_4") == ("Font", 12.0, 4)
+    assert isinstance(split_signature("Font_12.0_4")[1], float)
+    assert split_signature("Some_Font_8.5_4") == ("Some_Font", 8.5, 4)
+
+
+def test_round_trip_in_memory():
+    original = _document()
+    converted = to_v2(copy.deepcopy(original))
+
+    assert converted["metadata"]["schema"] == 2
+    assert "signature" not in converted["elements"][0]
+    assert converted["elements"][1]["size"] == 0
+    assert to_v1(converted) == original
+
+
+def test_round_trip_through_json(tmp_path):
+    original = _document()
+    path = tmp_path / "neutral_v2.json"
+    save_data(path, to_v2(copy.deepcopy(original)), compact=True)
+
+    # load_data ramène le document en v1
+    assert load_data(path) == original
+
+
+def test_registry_parts_matches_format():
+    registry = SignatureRegistry()
+    signature = registry.format("MyriadPro-Bold", 12.04, 20)
+
+    assert signature == "MyriadPro-Bold_12.0_20"
+    assert registry.parts(signature) == ("MyriadPro-Bold", 12.0, 20)
+    assert registry.parts("Font_0_0") == ("Font", 0, 0)
+
+
+def test_underscore_font_parsed_alike():
+    signature = "ABCDEF+My_Font_8.5_4"
+
+    assert parse_signature(signature) == {"font": "ABCDEF+My_Font", "size": 8.5, "flags": 4}
+    assert parse_signature("Unknown") == {"font": "Unknown", "size": 0.0, "flags": 0}
+
+    element = _document()["elements"][0]
+    element["signature"] = signature
+    converted = to_v2({"elements": [element]})
+    assert converted["fonts"] == ["ABCDEF+My_Font"]
+    assert (converted["elements"][0]["size"], converted["elements"][0]["flags"]) == (8.5, 4)
+
+    pytest.importorskip("numpy")
+    store = ColumnarElementStore()
+    store.append(element)
+    assert (store.size[0], store.flags[0]) == (8.5, 4)
+
+
+def test_store_and_v2_share_registry_parts():
+    registry = SignatureRegistry()
+    signatures = [registry.format("ABCDEF+My_Font", 8.54, 4), registry.format("Unknown", 0, 0),
+                  registry.format("MyriadPro-Bold", 12.0, 20)]
+    elements = [{"id": i, "type": "text", "page": 1, "text": "x", "signature": signature,
+                 "position": {"x": 0.0, "y": 10.0 * i, "w": 1.0, "h": 1.0}}
+                for i, signature in enumerate(signatures)]
+
+    encoder = V2Encoder(registry.parts)
+    encoded = [encoder.element(dict(elem)) for elem in elements]
+    for signature, elem in zip(signatures, encoded):
+        font, size, flags = registry.parts(signature)
+        assert (encoder.fonts[elem["font_id"]], elem["size"], elem["flags"]) == (font, size, flags)
+        assert split_signature(signature) == (font, size, flags)
+
+    pytest.importorskip("numpy")
+    store = ColumnarElementStore(signature_parts=registry.parts)
+    store.extend(elements)
+    assert [(size, flags) for _, size, flags in map(registry.parts, signatures)] == \
+        list(zip(store.size.tolist()[:3], store.flags.tolist()[:3]))
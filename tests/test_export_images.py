@@ -0,0 +1,50 @@
+"""
+export_images.py : le fichier mis à jour garde le schéma et la forme de l'entrée
+"""
+
+import json
+import sys
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+import export_images
+from neutral_extractor import NeutralExtractor
+
+
+def _manifest(pdf_path, output, schema, compact):
+    extractor = NeutralExtractor(images="manifest")
+    data = extractor.extract_from_pdf(pdf_path)
+    extractor.save_to_json(data, str(output), compact=compact, schema=schema)
+
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["export_images.py", *argv])
+    return export_images.main()
+
+
+@pytest.mark.parametrize("schema, compact", [(1, False), (2, True), (2, False)])
+def test_update_in_place_keeps_schema_and_layout(image_pdf, tmp_path, monkeypatch, schema, compact):
+    path = tmp_path / "neutral.json"
+    _manifest(image_pdf, path, schema, compact)
+
+    assert _run(monkeypatch, "-i", str(path)) == 0
+
+    raw = path.read_text(encoding="utf-8")
+    assert ("\n" not in raw.strip()) == compact
+    data = json.loads(raw)
+    assert data["metadata"].get("schema", 1) == schema
+    images = [e for e in data["elements"] if e.get("type") == "image"]
+    assert images and all(e["image_file"] for e in images)
+    assert "images" not in data["metadata"]
+
+
+def test_compact_option_forces_compact_output(image_pdf, tmp_path, monkeypatch):
+    path = tmp_path / "neutral.json"
+    output = tmp_path / "exported.json"
+    _manifest(image_pdf, path, 1, False)
+
+    assert _run(monkeypatch, "-i", str(path), "-o", str(output), "--compact") == 0
+
+    assert "\n" not in output.read_text(encoding="utf-8").strip()
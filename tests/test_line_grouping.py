@@ -0,0 +1,128 @@
+"""
+Groupement par lignes : le balayage trié de _group_by_line reproduit l'ancien
+parcours linéaire, et la passe 2 obtient les mêmes lignes avec ou sans
+table des lignes
+"""
+
+import copy
+import random
+
+import pytest
+
+pytest.importorskip("fitz")
+
+from neutral_extractor import LINE_Y_TOLERANCE, NeutralExtractor
+from pipeline_io import load_data, save_data
+from semantic_typing_pass_2 import (group_by_line, load_document_lines, process_file,
+                                    sort_line_ids)
+
+
+def _linear_group_by_line(elements, y_tolerance):
+    """Ancien algorithme : chaque élément comparé à toutes les lignes ouvertes"""
+    lines = []
+    for elem in elements:
+        y = elem["position"]["y"]
+        for line in lines:
+            if abs(y - line[0]["position"]["y"]) <= y_tolerance:
+                line.append(elem)
+                break
+        else:
+            lines.append([elem])
+    lines.sort(key=lambda line: line[0]["position"]["y"])
+    return lines
+
+
+def _ids(lines):
+    return [[id(elem) for elem in line] for line in lines]
+
+
+@pytest.mark.parametrize("tolerance", [LINE_Y_TOLERANCE, 1.0, 3.0])
+def test_group_by_line_matches_linear_scan(tolerance):
+    rng = random.Random(4)
+    extractor = NeutralExtractor()
+    for _ in range(50):
+        # Y proches des limites de tolérance, doublons et désordre
+        elements = [{"position": {"y": round(rng.choice(range(0, 60, 2)) + rng.uniform(-1, 1) * tolerance, 2)}}
+                    for _ in range(rng.randint(1, 80))]
+        assert _ids(extractor._group_by_line(elements, tolerance)) == _ids(_linear_group_by_line(elements, tolerance))
+
+
+def test_group_by_line_matches_linear_scan_on_pdf(text_pdf, monkeypatch):
+    extractor = NeutralExtractor()
+    calls = []
+
+    def checked(elements, y_tolerance):
+        lines = sweep(elements, y_tolerance)
+        calls.append(_ids(lines) == _ids(_linear_group_by_line(elements, y_tolerance)))
+        return lines
+
+    sweep = extractor._group_by_line
+    monkeypatch.setattr(extractor, "_group_by_line", checked)
+    extractor.extract_from_pdf(text_pdf)
+
+    assert calls and all(calls)
+
+
+# Polices du PDF de test → polices du supplément attendues par la passe 2
+PASS2_SIGNATURES = {"Helvetica_9.0_0": "STIX-Regular_8.5_4", "Helvetica_5.0_0": "STIX-Regular_5.0_4"}
+
+
+@pytest.fixture
+def typed_document(text_pdf):
+    """
+    Extraction du PDF de test mise en forme de sortie de passe 1 : lignes en
+    gras = code_abstract, quelques sections et titres (polices du supplément)
+    """
+    data = NeutralExtractor().extract_from_pdf(text_pdf)
+    del data["signature_table"]
+    for elem in data["elements"]:
+        del elem["sig_id"]
+        if elem["signature"].startswith("Helvetica-Bold"):
+            elem["element_type"] = "code_abstract"
+            continue
+        elem["signature"] = PASS2_SIGNATURES[elem["signature"]]
+        if elem["text"].startswith(("risk", "beta")):
+            elem["element_type"] = "section_results"
+        elif elem["text"].startswith(("cohort", "trial")) and elem["signature"] == "STIX-Regular_8.5_4":
+            elem["signature"] = "STIX-Bold_8.5_20"
+    return data
+
+
+def test_table_lines_match_line_id_grouping(typed_document):
+    elements = typed_document["elements"]
+    doc_lines = load_document_lines(typed_document, elements)
+    assert doc_lines is not None
+
+    for start in range(0, len(elements), 17):
+        for column in ("left", "right"):
+            subset = [e for e in elements[start:start + 60] if e.get("line_position") == column]
+            from_table = group_by_line(subset, doc_lines)
+            scanned = group_by_line(subset)
+            assert list(from_table) == list(scanned)
+            assert _ids(from_table.values()) == _ids(scanned.values())
+            assert sort_line_ids(from_table, True) == sort_line_ids(scanned)
+
+
+def test_stale_table_falls_back(typed_document):
+    elements = typed_document["elements"]
+    elements[3]["line_id"] = "p9_L99"
+
+    assert load_document_lines(typed_document, elements) is None
+
+
+def test_pass2_output_unchanged_by_line_table(typed_document, tmp_path):
+    with_table = tmp_path / "with_table.json"
+    without_table = tmp_path / "without_table.json"
+    save_data(with_table, typed_document)
+    stripped = copy.deepcopy(typed_document)
+    del stripped["line_table"]
+    save_data(without_table, stripped)
+
+    process_file(with_table, tmp_path / "out_table.json")
+    process_file(without_table, tmp_path / "out_scan.json")
+
+    out_table = load_data(tmp_path / "out_table.json")
+    out_scan = load_data(tmp_path / "out_scan.json")
+    typed = {e.get("element_type") for e in out_table["elements"]}
+    assert {"abstract_title", "section_results_text"} <= typed
+    assert out_table["elements"] == out_scan["elements"]
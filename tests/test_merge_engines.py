@@ -0,0 +1,49 @@
+"""
+Fusion des spans consécutifs : le moteur "numpy" (bornes vectorisées) produit
+les mêmes éléments que le moteur "python"
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("numpy")
+
+from neutral_extractor import NeutralExtractor
+
+
+def _spans(rng, count):
+    """Spans d'une page : mots d'une même ligne, sauts de ligne, de signature et d'espacement"""
+    spans = []
+    x, y = 60.0, 100.0
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.15:
+            x, y = 60.0, y + rng.choice([1.5, 2.0, 2.5, 14.0])
+        elif roll < 0.25:
+            x += rng.choice([49.0, 50.0, 51.0, 120.0])
+        w = round(rng.uniform(5, 40), 2)
+        spans.append({"id": i, "type": "text", "page": 1 + (i >= count // 2), "text": f"w{i}",
+                      "signature": rng.choice(["Helvetica_9.0_0", "Helvetica_9.0_0", "Helvetica-Bold_9.0_16"]),
+                      "position": {"x": round(x, 2), "y": round(y + rng.uniform(-0.3, 0.3), 2),
+                                   "w": w, "h": 9.0}})
+        x += w + rng.uniform(1, 4)
+    return spans
+
+
+def test_engines_merge_spans_identically():
+    python, numpy = NeutralExtractor(), NeutralExtractor(merge_engine="numpy")
+    rng = random.Random(23)
+    for count in (0, 1, 2, 40, 300):
+        spans = _spans(rng, count)
+        assert numpy._merge_consecutive_elements(spans) == python._merge_consecutive_elements(spans)
+
+
+def test_engines_extract_identically(text_pdf):
+    by_python = NeutralExtractor().extract_from_pdf(text_pdf)
+    by_numpy = NeutralExtractor(merge_engine="numpy").extract_from_pdf(text_pdf)
+
+    assert any("_merged_count" in e for e in by_python["elements"])
+    assert by_numpy["elements"] == by_python["elements"]
+    assert by_numpy["signature_catalog"] == by_python["signature_catalog"]
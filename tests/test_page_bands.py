@@ -0,0 +1,58 @@
+"""
+Bandes d'en-tête / pied de page apprises sur un échantillon de pages
+"""
+
+from page_bands import BAND_MARGIN, count_band_spans, learn_bands
+
+HEIGHT = 800.0
+BODY = "Body_10.0_0"
+FOOTER = "Footer_9.0_0"
+
+WORDS = ["insulin", "glucose", "cohort", "trial", "beta", "cells", "renal", "retinal",
+         "outcome", "risk", "therapy", "patients", "adipose", "hepatic", "markers", "dose"]
+
+
+def _sentence(page, line):
+    """Texte de contenu propre à chaque page et ligne (sans chiffres)"""
+    return " ".join(WORDS[(page * 5 + line * 3 + k) % len(WORDS)] for k in range(4)) + f" {WORDS[page % 16]}"
+
+
+def _page(number, footer_text=None, body_lines=20):
+    """Page d'échantillon : des lignes de contenu, puis un pied de page"""
+    spans = [(BODY, _sentence(number, i), 100.0 + 25 * i, 110.0 + 25 * i)
+             for i in range(body_lines)]
+    spans.append((FOOTER, footer_text if footer_text is not None else str(number), 770.0, 780.0))
+    return HEIGHT, spans
+
+
+def test_page_number_only_footer_is_learned():
+    samples = [_page(n) for n in range(1, 9)]
+
+    bands = learn_bands(samples)
+
+    assert bands["header"] == 0.0
+    # Limite juste après la bande (haut du pied de page à 30 du bas), loin du contenu
+    assert bands["footer"] == 30.0 + BAND_MARGIN
+    assert count_band_spans(samples, bands["header"], bands["footer"]) == {"header": 0, "footer": 8}
+
+
+def test_repeated_number_inside_content_is_kept():
+    # Contenu propre à chaque page sous le numéro répété : le numéro reste du contenu
+    samples = []
+    for n in range(1, 9):
+        height, spans = _page(n)
+        spans.append((BODY, _sentence(n, 40), 790.0, 798.0))
+        samples.append((height, spans))
+
+    assert learn_bands(samples)["footer"] == 0.0
+
+
+def test_limit_stops_at_midpoint_when_content_is_close():
+    # Contenu à 1 pt du pied de page : la marge est ramenée à la mi-distance
+    samples = []
+    for n in range(1, 9):
+        height, spans = _page(n)
+        spans.append((BODY, _sentence(n, 40), 758.0, 769.0))
+        samples.append((height, spans))
+
+    assert learn_bands(samples)["footer"] == 30.5
@@ -0,0 +1,25 @@
+"""
+Rapport console de l'extraction (_print_report)
+"""
+
+import pytest
+
+pytest.importorskip("fitz")
+
+from neutral_extractor import NeutralExtractor
+
+
+def test_write_rate_unavailable_prints_na(image_pdf, capsys):
+    extractor = NeutralExtractor()
+    data = extractor.extract_from_pdf(image_pdf)
+    writes = data["metadata"]["image_writes"]
+    assert writes["files"] == 1
+
+    # Durée d'écriture arrondie à 0 : pas de débit
+    writes["write_seconds"] = 0.0
+    writes["mb_per_s"] = None
+    extractor._print_report(data)
+
+    out = capsys.readouterr().out
+    assert "n/a Mo/s" in out
+    assert "None" not in out
@@ -0,0 +1,80 @@
+"""
+Rattachement des exposants / indices : la recherche par bisect dans l'index Y
+donne les mêmes rattachements que l'ancien parcours de tous les textes
+"""
+
+import copy
+import random
+
+import pytest
+
+pytest.importorskip("fitz")
+
+import neutral_extractor
+from neutral_extractor import NeutralExtractor
+
+# Écarts Y script → texte autour des bornes des règles et de la fenêtre bisect
+Y_OFFSETS = [0.3, 0.29, 1.0, 2.0, 2.01, -2.0, -1.99, -4.0, -6.0, -6.01, 7.99, -7.99, 8.0, 8.5, -8.5, 8.51]
+
+
+def _linear_attach(attach, elements):
+    """Ancien parcours : fenêtre de candidats élargie à tous les textes de la page"""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(neutral_extractor, "bisect_left", lambda values, _: 0)
+        patch.setattr(neutral_extractor, "bisect_right", lambda values, _: len(values))
+        return attach(elements)
+
+
+def _page_elements(rng, page, count):
+    """Lignes de texte (y parfois répétés) et scripts placés à un écart connu d'une ligne"""
+    lines = [round(100 + 12 * rng.randint(0, 20) + rng.choice([0, 0.5, 1.5]), 2) for _ in range(count)]
+    elements = []
+    for y in lines:
+        elements.append({"type": "text", "page": page, "text": "outcome", "signature": "Helvetica_9.0_0",
+                         "position": {"x": rng.choice([60.0, 120.0, 330.0]), "y": y, "w": 40.0, "h": 10.0}})
+        for _ in range(rng.randint(0, 2)):
+            unicode = rng.random() < 0.2
+            elements.append({"type": "text", "page": page, "text": "₂" if unicode else "1",
+                             "signature": "Helvetica_9.0_0" if unicode else "Helvetica_5.0_0",
+                             "position": {"x": rng.choice([60.0, 150.0, 200.0, 330.0]),
+                                          "y": round(y - rng.choice(Y_OFFSETS), 2),
+                                          "w": 3.0, "h": 10.0 if unicode else 5.0}})
+    elements.append({"type": "image", "page": page, "position": {"x": 0, "y": 0, "w": 1, "h": 1}})
+    rng.shuffle(elements)
+    return elements
+
+
+def test_bisect_matches_linear_scan():
+    rng = random.Random(3)
+    extractor = NeutralExtractor()
+    adjusted = 0
+    for _ in range(30):
+        elements = [elem for page in (1, 2) for elem in _page_elements(rng, page, rng.randint(1, 40))]
+        for i, elem in enumerate(elements):
+            elem["id"] = i
+        reference = copy.deepcopy(elements)
+
+        attached = extractor._attach_scripts_to_lines(elements)
+        assert attached == _linear_attach(extractor._attach_scripts_to_lines, reference)
+        adjusted += sum("_original_y" in elem for elem in attached)
+
+    assert adjusted
+
+
+def test_bisect_matches_linear_scan_on_pdf(text_pdf):
+    extractor = NeutralExtractor()
+    calls = []
+
+    def checked(elements):
+        reference = copy.deepcopy(elements)
+        attached = bisected(elements)
+        calls.append(attached == _linear_attach(bisected, reference))
+        return attached
+
+    bisected = extractor._attach_scripts_to_lines
+    extractor._attach_scripts_to_lines = checked
+    data = extractor.extract_from_pdf(text_pdf)
+
+    assert any(elem.get("_superscript_adjusted") for elem in data["elements"])
+    assert any(elem.get("_subscript_adjusted") for elem in data["elements"])
+    assert calls and all(calls)
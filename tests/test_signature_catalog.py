@@ -0,0 +1,35 @@
+"""
+Statistiques par signature : l'accumulateur (une passe) reproduit l'ancien
+filtrage par signature d'analyze_signatures
+"""
+
+import pytest
+
+pytest.importorskip("fitz")
+
+from analyze_signatures import analyze_signatures
+from neutral_extractor import NeutralExtractor
+
+
+def _filtered_stats(elements, signature):
+    """Ancien calcul : un parcours de tous les éléments par signature"""
+    sig_elements = [e for e in elements if e.get("signature") == signature]
+    return {
+        "pages": sorted(set(e["page"] for e in sig_elements)),
+        "left_count": sum(1 for e in sig_elements if e.get("line_position") == "left"),
+        "right_count": sum(1 for e in sig_elements if e.get("line_position") == "right")
+    }
+
+
+def test_accumulator_matches_per_signature_filter(text_pdf):
+    data = NeutralExtractor().extract_from_pdf(text_pdf)
+    elements = data["elements"]
+    # Le document contient des éléments fusionnés (sans clé "type")
+    assert any("_merged_count" in e and "type" not in e for e in elements)
+
+    enriched = analyze_signatures(data)
+
+    assert set(enriched) == set(data["signature_catalog"])
+    for signature, details in enriched.items():
+        expected = _filtered_stats(elements, signature)
+        assert {key: details[key] for key in expected} == expected, signature
@@ -0,0 +1,73 @@
+"""
+Extraction des tables : une table tracée (traits + texte) doit produire un
+élément "table" avec le texte de chaque cellule
+"""
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from neutral_extractor import NeutralExtractor
+
+CELLS = [["Group", "n", "HbA1c"],
+         ["Control", "120", "7.9"],
+         ["Treated", "118", "7.1"]]
+
+X0, Y0 = 60, 200
+COL_W, ROW_H = 80, 20
+
+
+def _make_table_pdf(path):
+    """PDF d'une page : un titre puis une table 3 x 3 entièrement tracée"""
+    doc = fitz.open()
+    page = doc.new_page(width=595, height=842)
+    page.insert_text((X0, 150), "Table 1 Baseline characteristics", fontname="helv", fontsize=10)
+
+    rows, cols = len(CELLS), len(CELLS[0])
+    for i in range(rows + 1):
+        page.draw_line((X0, Y0 + i * ROW_H), (X0 + cols * COL_W, Y0 + i * ROW_H))
+    for j in range(cols + 1):
+        page.draw_line((X0 + j * COL_W, Y0), (X0 + j * COL_W, Y0 + rows * ROW_H))
+    for i, row in enumerate(CELLS):
+        for j, text in enumerate(row):
+            page.insert_text((X0 + j * COL_W + 4, Y0 + i * ROW_H + 14), text, fontname="helv", fontsize=9)
+
+    doc.save(str(path))
+    doc.close()
+
+
+@pytest.fixture
+def table_pdf(tmp_path):
+    path = tmp_path / "table.pdf"
+    _make_table_pdf(path)
+    return str(path)
+
+
+def test_table_element_with_cell_text(table_pdf):
+    data = NeutralExtractor(tables="always").extract_from_pdf(table_pdf)
+
+    tables = [e for e in data["elements"] if e.get("type") == "table"]
+    assert len(tables) == 1
+    table = tables[0]
+    assert (table["rows"], table["cols"]) == (3, 3)
+    assert [[cell["text"] for cell in row] for row in table["cells"]] == CELLS
+    assert all(cell["bbox"] is not None for row in table["cells"] for cell in row)
+    assert data["metadata"]["total_tables"] == 1
+
+
+def test_table_keeps_text_spans_and_line_metadata(table_pdf):
+    data = NeutralExtractor(tables="always").extract_from_pdf(table_pdf)
+
+    texts = [e["text"] for e in data["elements"] if e.get("type") == "text"]
+    # Les spans des cellules restent des éléments texte
+    assert "Control" in texts and "7.1" in texts
+
+    table = next(e for e in data["elements"] if e.get("type") == "table")
+    assert table["line_id"].startswith("p1_L")
+    assert data["page_index"] == {"1": [0, len(data["elements"])]}
+
+
+def test_tables_never_skips_detection(table_pdf):
+    data = NeutralExtractor(tables="never").extract_from_pdf(table_pdf)
+
+    assert not [e for e in data["elements"] if e.get("type") == "table"]
@@ -0,0 +1,28 @@
+"""
+Extraction multi-processus (--workers N) : même document que l'extraction
+séquentielle, aux mesures de temps et à la date près
+"""
+
+import pytest
+
+pytest.importorskip("fitz")
+
+from neutral_extractor import NeutralExtractor
+
+# Métadonnées propres à chaque exécution
+VOLATILE_METADATA = ("extraction_date", "timings")
+
+
+def _stable(data):
+    metadata = {key: value for key, value in data["metadata"].items() if key not in VOLATILE_METADATA}
+    return {**data, "metadata": metadata}
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_workers_match_sequential_extraction(text_pdf, workers):
+    sequential = NeutralExtractor().extract_from_pdf(text_pdf)
+    parallel = NeutralExtractor(workers=workers).extract_from_pdf(text_pdf)
+
+    assert len({e["page"] for e in sequential["elements"]}) > workers
+    assert any("_merged_count" in e for e in sequential["elements"])
+    assert _stable(parallel) == _stable(sequential)